@@ -0,0 +1,15 @@
+"""
+AI Agent Orchestration System - tools package
+
+Lets the tools be imported and run from the project root
+(`import tools.project_memory`, `python -m tools validate`). The modules
+import each other by bare name, as they do when run as scripts, so the package
+directory is added to sys.path; nothing else is imported here.
+"""
+
+import sys
+from pathlib import Path
+
+_TOOLS_DIR = str(Path(__file__).resolve().parent)
+if _TOOLS_DIR not in sys.path:
+    sys.path.insert(0, _TOOLS_DIR)
@@ -0,0 +1,7 @@
+"""
+AI Agent Orchestration System - `python -m tools` runs agentctl
+"""
+
+from agentctl import main
+
+main()
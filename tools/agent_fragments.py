@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Shared Prompt Fragments
+
+Agent definitions can include named shared fragments instead of repeating the
+same boilerplate (the communication protocol, memory-bank rules, ...). A
+fragment is a text file in agents/fragments/, referenced from any string field
+of a customModes entry with
+
+    {{> communication-protocol}}
+
+The include is replaced by the fragment text (one trailing newline dropped).
+Fragments may include other fragments; unknown names and include cycles raise
+FragmentError. AgentRegistry expands includes when it hands out documents, so
+merge-agents.py writes the expanded text and the validator and the delegation
+graph see exactly what the model will see.
+
+The analyze command finds large duplicated passages across customInstructions
+and estimates the bytes and tokens that moving each into a fragment would
+remove from the agent sources.
+
+Usage:
+    python tools/agent_fragments.py list
+    python tools/agent_fragments.py expand agents/uber-orchestrator.yaml
+    python tools/agent_fragments.py analyze --min-length 200 --top 10
+"""
+
+import os
+import re
+import sys
+import json
+import heapq
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+FRAGMENT_SUFFIXES = ('.md', '.txt')
+INCLUDE_PATTERN = re.compile(r'\{\{>\s*([a-z0-9][a-z0-9-]*)\s*\}\}')
+INCLUDE_MARKER = '{{>'
+
+# Rough size of one token in English prompt text, for savings estimates
+BYTES_PER_TOKEN = 4
+
+class FragmentError(ValueError):
+    """An include names an unknown fragment or fragments include each other in a cycle."""
+
+def default_fragments_dir(agents_dir: Path) -> Path:
+    return agents_dir / 'fragments'
+
+class FragmentLibrary:
+    """
+    The fragments of one directory, re-read only when a file's stat changes.
+
+    A missing directory is an empty library, so includes are optional.
+    """
+
+    def __init__(self, fragments_dir: Path):
+        self.fragments_dir = fragments_dir
+        self.fragments: Dict[str, str] = {}
+        self._stats: Dict[str, Tuple[int, int]] = {}
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Pick up added, edited and removed fragments; return True if anything changed."""
+        stats: Dict[str, Tuple[str, Tuple[int, int]]] = {}
+        try:
+            with os.scandir(self.fragments_dir) as entries:
+                for entry in entries:
+                    name, suffix = os.path.splitext(entry.name)
+                    if suffix in FRAGMENT_SUFFIXES and entry.is_file():
+                        st = entry.stat()
+                        stats[name] = (entry.path, (st.st_mtime_ns, st.st_size))
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+        changed = set(self.fragments) != set(stats)
+        fragments = {}
+        for name, (path, stat) in stats.items():
+            if self._stats.get(name) == stat and name in self.fragments:
+                fragments[name] = self.fragments[name]
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            fragments[name] = text[:-1] if text.endswith('\n') else text
+            changed = True
+        self.fragments = fragments
+        self._stats = {name: stat for name, (_, stat) in stats.items()}
+        return changed
+
+    def stat_key(self) -> Tuple:
+        """Cheap fingerprint of the fragment files (names, mtimes and sizes)."""
+        return tuple(sorted((name, *stat) for name, stat in self._stats.items()))
+
+    def digest(self) -> str:
+        """SHA-256 over every fragment's name and text."""
+        sha = hashlib.sha256()
+        for name in sorted(self.fragments):
+            sha.update(name.encode('utf-8') + b'\0' + self.fragments[name].encode('utf-8') + b'\0')
+        return sha.hexdigest()
+
+    def expand(self, text: str, _active: Tuple[str, ...] = ()) -> str:
+        """Replace every include in text with its (recursively expanded) fragment."""
+        if INCLUDE_MARKER not in text:
+            return text
+
+        def replace(match: 're.Match') -> str:
+            name = match.group(1)
+            if name in _active:
+                raise FragmentError(f"Fragment include cycle: {' -> '.join(_active + (name,))}")
+            if name not in self.fragments:
+                available = ', '.join(sorted(self.fragments)) or 'none'
+                raise FragmentError(f"Unknown fragment '{name}' (available: {available})")
+            return self.expand(self.fragments[name], _active + (name,))
+        return INCLUDE_PATTERN.sub(replace, text)
+
+    def expand_document(self, document: Any) -> Any:
+        """
+        Expand includes in every string field of every customModes entry.
+
+        Returns document itself when nothing is included, otherwise a copy,
+        so cached parsed documents are never modified.
+        """
+        if not isinstance(document, dict) or not isinstance(document.get('customModes'), list):
+            return document
+        modes = []
+        changed = False
+        for mode in document['customModes']:
+            if isinstance(mode, dict) and any(
+                isinstance(value, str) and INCLUDE_MARKER in value for value in mode.values()
+            ):
+                slug = mode.get('slug', '?')
+                expanded = {}
+                for key, value in mode.items():
+                    try:
+                        expanded[key] = self.expand(value) if isinstance(value, str) else value
+                    except FragmentError as e:
+                        raise FragmentError(f"{slug}.{key}: {e}")
+                modes.append(expanded)
+                changed = True
+            else:
+                modes.append(mode)
+        if not changed:
+            return document
+        return {**document, 'customModes': modes}
+
+    def includes(self, text: str) -> Set[str]:
+        """Fragment names included directly by text."""
+        return set(INCLUDE_PATTERN.findall(text))
+
+_LIBRARIES: Dict[str, FragmentLibrary] = {}
+
+def library_for(agents_dir: Path) -> FragmentLibrary:
+    """The shared, refreshed fragment library for an agents directory."""
+    key = os.path.abspath(default_fragments_dir(agents_dir))
+    library = _LIBRARIES.get(key)
+    if library is None:
+        library = _LIBRARIES[key] = FragmentLibrary(Path(key))
+    else:
+        library.refresh()
+    return library
+
+# -- Duplicate analysis -------------------------------------------------------
+
+_WORD = re.compile(r'\S+')
+
+# Each occurrence that becomes an include keeps a '{{> name}}' of roughly this size
+INCLUDE_BYTES = 30
+
+# Longest run of adjacent shared segments combined into one candidate
+MAX_SEGMENTS = 12
+
+# (start, end, texts sharing it) for one stretch of a text
+Segment = Tuple[int, int, frozenset]
+
+def _shared_segments(texts: Dict[str, str], shingle_words: int) -> Dict[str, List[List[Segment]]]:
+    """
+    Per text, its maximal runs of word shingles that also occur in another
+    text, each run split into segments wherever the set of sharing texts changes.
+    """
+    owners: Dict[str, Set[str]] = {}
+    words_of: Dict[str, List[Tuple[int, int]]] = {}
+    for name, text in texts.items():
+        words = [(match.start(), match.end()) for match in _WORD.finditer(text)]
+        words_of[name] = words
+        for index in range(len(words) - shingle_words + 1):
+            owners.setdefault(text[words[index][0]:words[index + shingle_words - 1][1]], set()).add(name)
+    frozen: Dict[str, frozenset] = {}
+
+    runs: Dict[str, List[List[Segment]]] = {}
+    for name, text in texts.items():
+        words = words_of[name]
+        text_runs: List[List[Segment]] = []
+        segments: List[Segment] = []
+        for index in range(len(words) - shingle_words + 1):
+            start, end = words[index][0], words[index + shingle_words - 1][1]
+            key = text[start:end]
+            if len(owners[key]) < 2:
+                if segments:
+                    text_runs.append(segments)
+                segments = []
+                continue
+            shared = frozen.get(key)
+            if shared is None:
+                shared = frozen[key] = frozenset(owners[key])
+            if segments and segments[-1][2] == shared:
+                segments[-1] = (segments[-1][0], end, shared)
+            else:
+                segments.append((start, end, shared))
+        if segments:
+            text_runs.append(segments)
+        runs[name] = text_runs
+    return runs
+
+def find_duplicates(
+    texts: Dict[str, str],
+    min_length: int = 200,
+    shingle_words: int = 8,
+    top: Optional[int] = 20
+) -> List[Dict]:
+    """
+    Find passages of at least min_length characters repeated across texts.
+
+    Runs of word shingles shared with another text are the raw material. A
+    span of up to MAX_SEGMENTS adjacent segments (split where the sharing
+    texts change) is a candidate when it is maximal for the texts that can
+    contain it: one segment more on either side would lose some of them.
+    Candidates are picked greedily by the bytes saved if every occurrence
+    after the first became an include. A picked passage is masked out, so
+    overlapping candidates are re-scored on what is left and savings are
+    never counted twice.
+    """
+    candidates: Dict[str, frozenset] = {}
+    for name, text_runs in _shared_segments(texts, shingle_words).items():
+        text = texts[name]
+        for segments in text_runs:
+            for first in range(len(segments)):
+                shared = segments[first][2]
+                # Starting one segment earlier keeps the same texts, so that span dominates
+                if first > 0 and shared <= segments[first - 1][2]:
+                    continue
+                for last in range(first, min(len(segments), first + MAX_SEGMENTS)):
+                    if last > first:
+                        shared = shared & segments[last][2]
+                    if len(shared) < 2:
+                        break
+                    following = segments[last + 1][2] if last + 1 < len(segments) else frozenset()
+                    if shared <= following:
+                        continue
+                    passage = text[segments[first][0]:segments[last][1]]
+                    if len(passage) >= min_length:
+                        candidates[passage] = candidates.get(passage, frozenset()) | shared
+
+    masked = dict(texts)
+
+    def score(passage: str) -> Tuple[int, int, List[str]]:
+        names = [name for name in candidates[passage] if passage in masked[name]]
+        occurrences = sum(masked[name].count(passage) for name in names)
+        saved = (occurrences - 1) * len(passage.encode('utf-8')) - occurrences * INCLUDE_BYTES
+        return saved, occurrences, names
+
+    # Lazy greedy: masking only ever lowers a score, so a re-scored head is final
+    heap = []
+    for passage in candidates:
+        saved = score(passage)[0]
+        if saved > 0:
+            heap.append((-saved, passage))
+    heapq.heapify(heap)
+
+    selected: List[Dict] = []
+    while heap and (top is None or len(selected) < top):
+        bound, passage = heapq.heappop(heap)
+        saved, occurrences, names = score(passage)
+        if saved <= 0:
+            continue
+        if saved < -bound:
+            heapq.heappush(heap, (-saved, passage))
+            continue
+        for name in names:
+            masked[name] = masked[name].replace(passage, '\0')
+        size = len(passage.encode('utf-8'))
+        selected.append({
+            'bytes': size,
+            'occurrences': occurrences,
+            'agents': sorted(names),
+            'saved_bytes': saved,
+            'saved_tokens': saved // BYTES_PER_TOKEN,
+            'text': passage
+        })
+    return selected
+
+def instruction_texts(agents_dir: Path, expand: bool = False) -> Dict[str, str]:
+    """customInstructions per slug as written in the agent files (or expanded)."""
+    from agent_registry import load_registry
+
+    registry = load_registry(agents_dir)
+    texts = {}
+    for path in registry.files:
+        try:
+            document = registry.document(path, expand=expand)
+        except (FileNotFoundError, ValueError):
+            continue
+        if isinstance(document, dict) and isinstance(document.get('customModes'), list):
+            for mode in document['customModes']:
+                if isinstance(mode, dict) and isinstance(mode.get('customInstructions'), str):
+                    texts[mode.get('slug') or path.stem] = mode['customInstructions']
+    return texts
+
+def print_analysis(duplicates: List[Dict], texts: Dict[str, str], out=sys.stdout) -> None:
+    total = sum(len(text.encode('utf-8')) for text in texts.values())
+    saved = sum(entry['saved_bytes'] for entry in duplicates)
+    print(f"Analyzed {len(texts)} agents, {total:,} bytes of customInstructions\n", file=out)
+    for rank, entry in enumerate(duplicates, 1):
+        preview = ' '.join(entry['text'].split())[:90]
+        print(
+            f"{rank:3}. {entry['bytes']:,} bytes x {entry['occurrences']} agents -> "
+            f"saves {entry['saved_bytes']:,} bytes (~{entry['saved_tokens']:,} tokens)",
+            file=out
+        )
+        print(f"     \"{preview}...\"", file=out)
+        print(f"     {', '.join(entry['agents'][:6])}{', ...' if len(entry['agents']) > 6 else ''}", file=out)
+    share = saved / total * 100 if total else 0.0
+    print(
+        f"\nTotal: {saved:,} bytes (~{saved // BYTES_PER_TOKEN:,} tokens, {share:.1f}% of the instructions) "
+        f"in {len(duplicates)} candidate fragment(s)",
+        file=out
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description='Shared prompt fragments for agent definitions')
+    parser.add_argument(
+        '--agents-dir',
+        type=str,
+        default='agents',
+        help='Directory containing agent YAML files (default: agents)'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('list', help='List fragments and the agents that include them')
+
+    expand_parser = subparsers.add_parser('expand', help='Print an agent file with its includes expanded')
+    expand_parser.add_argument('agent', help='Agent YAML file')
+
+    analyze_parser = subparsers.add_parser('analyze', help='Find duplicated passages worth turning into fragments')
+    analyze_parser.add_argument('--min-length', type=int, default=200, help='Shortest passage in characters (default: 200)')
+    analyze_parser.add_argument('--shingle', type=int, default=8, help='Words per matching window (default: 8)')
+    analyze_parser.add_argument('--top', type=int, default=20, help='Candidates to report (default: 20)')
+    analyze_parser.add_argument('--expanded', action='store_true', help='Analyze the expanded text instead of the sources')
+    analyze_parser.add_argument('--json', action='store_true', help='Print the candidates as JSON')
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    agents_dir = Path(args.agents_dir)
+    if not agents_dir.is_absolute():
+        agents_dir = project_root / agents_dir
+
+    if args.command == 'list':
+        library = library_for(agents_dir)
+        users: Dict[str, List[str]] = {name: [] for name in library.fragments}
+        for slug, text in instruction_texts(agents_dir).items():
+            for name in library.includes(text):
+                users.setdefault(name, []).append(slug)
+        if not users:
+            print(f"No fragments in {library.fragments_dir}")
+        for name, slugs in sorted(users.items()):
+            size = len(library.fragments[name].encode('utf-8')) if name in library.fragments else 0
+            status = '' if name in library.fragments else '  (missing)'
+            print(f"{name:<32} {size:>7,} bytes  {len(slugs):>3} agents{status}")
+        return
+
+    if args.command == 'expand':
+        import yaml
+        from agent_registry import parse_yaml_file
+
+        path = Path(args.agent)
+        try:
+            document = library_for(path.parent).expand_document(parse_yaml_file(path))
+        except (FileNotFoundError, ValueError) as e:
+            print(f"✗ {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.stdout.write(yaml.dump(document, default_flow_style=False, allow_unicode=True, width=120, sort_keys=False))
+        return
+
+    texts = instruction_texts(agents_dir, expand=args.expanded)
+    duplicates = find_duplicates(texts, args.min_length, args.shingle, args.top)
+    if args.json:
+        print(json.dumps({
+            'agents': len(texts),
+            'instruction_bytes': sum(len(text.encode('utf-8')) for text in texts.values()),
+            'saved_bytes': sum(entry['saved_bytes'] for entry in duplicates),
+            'saved_tokens': sum(entry['saved_bytes'] for entry in duplicates) // BYTES_PER_TOKEN,
+            'candidates': duplicates
+        }, indent=2, ensure_ascii=False))
+    else:
+        print_analysis(duplicates, texts)
+
+if __name__ == '__main__':
+    main()
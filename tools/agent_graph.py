@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Agent Dependency Graph Model
+
+Builds the agent delegation graph shared by the dependency graph generator
+and the analysis tools: the AgentGraph model with its indexed adjacency,
+the single-pass DelegationMatcher, and analyze_agents() which loads every
+agent through the shared registry.
+
+Usage:
+    from agent_graph import analyze_agents
+
+    graph = analyze_agents(Path('agents'), verbose=False)
+    print(len(graph.nodes), len(graph.edges))
+"""
+
+import sys
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from collections import defaultdict
+
+import profiling
+from agent_registry import load_registry
+
+# Color codes for terminal output
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[94m'
+    BOLD = '\033[1m'
+    END = '\033[0m'
+
+class AgentGraph:
+    """
+    Represents the agent dependency graph.
+    
+    Besides the node table and the flat edge list used by the renderers, the
+    graph keeps adjacency and reverse-adjacency indexes over interned integer
+    node IDs, which graph_analytics uses for traversals.
+    """
+    
+    def __init__(self):
+        self.nodes: Dict[str, Dict] = {}  # slug -> {name, role, groups}
+        self.edges: List[Tuple[str, str, str]] = []  # (from, to, delegation_type)
+        self.categories: Dict[str, List[str]] = defaultdict(list)
+        self.node_ids: Dict[str, int] = {}  # slug -> interned node ID
+        self.slugs: List[str] = []  # node ID -> slug
+        self.successors: List[Set[int]] = []  # node ID -> delegation targets
+        self.predecessors: List[Set[int]] = []  # node ID -> delegating agents
+    
+    def intern(self, slug: str) -> int:
+        """Return the integer node ID for slug, assigning one if needed."""
+        node_id = self.node_ids.get(slug)
+        if node_id is None:
+            node_id = len(self.slugs)
+            self.node_ids[slug] = node_id
+            self.slugs.append(slug)
+            self.successors.append(set())
+            self.predecessors.append(set())
+        return node_id
+        
+    def add_agent(self, slug: str, name: str, role: str, groups: List[str]):
+        """Add an agent node to the graph."""
+        self.nodes[slug] = {
+            'name': name,
+            'role': role,
+            'groups': groups
+        }
+        self.intern(slug)
+        
+        # Categorize by type
+        if 'orchestrator' in slug:
+            self.categories['orchestrator'].append(slug)
+        elif any(x in slug for x in ['validator', 'auditor', 'guardian']):
+            self.categories['validator'].append(slug)
+        elif any(x in slug for x in ['coder', 'tester', 'writer', 'architect']):
+            self.categories['worker'].append(slug)
+        elif 'bmo' in slug or 'ruler' in slug or 'devil' in slug:
+            self.categories['quality'].append(slug)
+        else:
+            self.categories['other'].append(slug)
+    
+    def add_delegation(self, from_slug: str, to_slug: str, delegation_type: str = "delegates"):
+        """Add a delegation edge between agents."""
+        self.edges.append((from_slug, to_slug, delegation_type))
+        from_id = self.intern(from_slug)
+        to_id = self.intern(to_slug)
+        self.successors[from_id].add(to_id)
+        self.predecessors[to_id].add(from_id)
+    
+    def subgraph(self, slugs: Iterable[str], drop_edges: Iterable[Tuple[str, str]] = ()) -> 'AgentGraph':
+        """
+        A new graph holding only slugs and the delegations among them, minus
+        drop_edges (from, to) pairs; node and edge order is preserved.
+        """
+        keep = set(slugs)
+        dropped = set(map(tuple, drop_edges))
+        view = AgentGraph()
+        for slug, data in self.nodes.items():
+            if slug in keep:
+                view.add_agent(slug, data['name'], data['role'], data['groups'])
+        for from_slug, to_slug, delegation_type in self.edges:
+            if from_slug in keep and to_slug in keep and (from_slug, to_slug) not in dropped:
+                view.add_delegation(from_slug, to_slug, delegation_type)
+        return view
+
+    def get_node_color(self, slug: str) -> str:
+        """Get color for node based on category."""
+        if slug in self.categories['orchestrator']:
+            return '#4A90E2'  # Blue
+        elif slug in self.categories['worker']:
+            return '#7ED321'  # Green
+        elif slug in self.categories['validator']:
+            return '#F5A623'  # Orange
+        elif slug in self.categories['quality']:
+            return '#BD10E0'  # Purple
+        else:
+            return '#9B9B9B'  # Gray
+
+# Slug fragments that mark a bare hyphenated mention as an agent reference
+AGENT_KEYWORDS = ['orchestrator', 'writer', 'coder', 'tester', 'architect',
+                  'validator', 'auditor', 'guardian', 'planner', 'researcher',
+                  'debugger', 'optimizer', 'advocate', 'ruler', 'bmo']
+
+class DelegationMatcher:
+    """
+    Delegation extractor built once from the set of known slugs.
+    
+    Three compiled regexes scan the text: "delegate(s) to X", "task X" /
+    "new_task to X", and bare lowercase hyphenated tokens. Each runs as its own
+    findall pass, exactly like the extractor it replaced, so a verb inside a
+    hyphenated token ("pre-delegate to X", "spec-writer-task to X") or inside
+    another verb's target is still found. Verbs may start inside a word, so
+    "redelegates to X" and "subtask X" are delegations. Targets are kept when
+    they are known slugs; bare mentions are kept when they are known slugs
+    containing one of AGENT_KEYWORDS. Both checks are set lookups, so the cost
+    is linear in the text length regardless of how many agents exist.
+    
+    With slugs=None every target and every keyword-bearing mention is
+    returned, which matches the unfiltered candidates extract_delegations()
+    has always produced.
+    """
+    
+    # Case-insensitive like the original patterns (so "K", the Kelvin sign,
+    # matches "k"), but each verb starts with a plain character class so sre
+    # rejects most positions without entering the pattern. "new_task X" needs
+    # no alternative of its own: it ends where "task X" does and yields the
+    # same target. No possessive quantifiers: they need Python 3.11 and the
+    # tools support 3.7.
+    DELEGATE_PATTERN = re.compile(r'[dD](?i:elegates?\s+to\s+([a-z0-9]+(?:-[a-z0-9]+)*))')
+    TASK_PATTERN = re.compile(r'[tT](?i:ask\s+(?:to\s+)?([a-z0-9]+(?:-[a-z0-9]+)*))')
+    # The literal hyphen after the first word rejects plain words early
+    MENTION_PATTERN = re.compile(r'\b([a-z]+-[a-z]+(?:-[a-z]+)*)\b')
+    
+    def __init__(self, slugs: Optional[Iterable[str]] = None):
+        self.slugs: Optional[Set[str]] = set(slugs) if slugs is not None else None
+        # Bare mentions are only agents when they contain a role keyword
+        self.mentionable: Dict[str, bool] = {}
+        if self.slugs is not None:
+            self.mentionable = {slug: self._has_keyword(slug) for slug in self.slugs}
+    
+    @staticmethod
+    def _has_keyword(token: str) -> bool:
+        return any(keyword in token for keyword in AGENT_KEYWORDS)
+    
+    def extract(self, text: str) -> Set[str]:
+        """Return the slugs delegated to or mentioned in text."""
+        slugs = self.slugs
+        mentionable = self.mentionable
+        targets = set(self.DELEGATE_PATTERN.findall(text))
+        targets.update(self.TASK_PATTERN.findall(text))
+        found = targets if slugs is None else targets & slugs
+        for mention in set(self.MENTION_PATTERN.findall(text)):
+            if slugs is None:
+                if mentionable.setdefault(mention, self._has_keyword(mention)):
+                    found.add(mention)
+            elif mentionable.get(mention):
+                found.add(mention)
+        return found
+
+def extract_delegations(custom_instructions: str, known_slugs: Optional[Iterable[str]] = None) -> Set[str]:
+    """
+    Extract agent slugs that are delegated to from customInstructions.
+    Looks for patterns like: "delegate to agent-slug" or "new_task to agent-slug",
+    plus direct mentions of agent-like slugs in workflow sequences.
+    
+    Pass known_slugs to restrict results to real agents; when extracting from
+    many texts, build one DelegationMatcher and reuse it instead.
+    """
+    return DelegationMatcher(known_slugs).extract(custom_instructions)
+
+def analyze_agents(agents_dir: Path, verbose: bool = True) -> AgentGraph:
+    """
+    Analyze all agent YAML files and build dependency graph.
+    
+    With verbose=False progress lines are suppressed and parse warnings go to
+    stderr, so callers can print machine-readable output on stdout.
+    """
+    graph = AgentGraph()
+    
+    with profiling.phase('registry_load'):
+        registry = load_registry(agents_dir)
+    if verbose:
+        print(f"\n{Colors.BLUE}Analyzing {len(registry.files)} agent files...{Colors.END}\n")
+    
+    # First pass: collect all agents
+    all_agent_data = {}
+    for yaml_file, data, error in registry.iter_documents():
+        try:
+            if error is not None:
+                raise error
+            
+            if 'customModes' in data:
+                for mode in data['customModes']:
+                    slug = mode.get('slug', '')
+                    name = mode.get('name', '')
+                    role = mode.get('roleDefinition', '')[:100] + '...'
+                    groups = mode.get('groups', [])
+                    custom_inst = mode.get('customInstructions', '')
+                    
+                    all_agent_data[slug] = {
+                        'name': name,
+                        'role': role,
+                        'groups': groups,
+                        'instructions': custom_inst
+                    }
+                    
+                    graph.add_agent(slug, name, role, groups)
+                    
+        except Exception as e:
+            print(
+                f"{Colors.YELLOW}Warning: Could not parse {yaml_file}: {e}{Colors.END}",
+                file=sys.stdout if verbose else sys.stderr
+            )
+    
+    # Second pass: extract delegations with one matcher built from all slugs,
+    # which only returns actual agents in our system
+    with profiling.phase('build_matcher'):
+        matcher = DelegationMatcher(all_agent_data.keys())
+    for slug, data in all_agent_data.items():
+        with profiling.phase('extract_delegations', slug):
+            valid_delegations = matcher.extract(data['instructions'])
+        
+        for target in valid_delegations:
+            graph.add_delegation(slug, target)
+            
+        if valid_delegations and verbose:
+            print(f"{Colors.GREEN}✓{Colors.END} {slug} → {', '.join(sorted(valid_delegations))}")
+    
+    return graph
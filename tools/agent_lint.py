@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Agent Lint Rules
+
+Content checks over each agent's customInstructions, run by
+validate-agents.py after schema validation. Every rule declares the literal
+keywords and regexes it needs. The engine compiles those of all enabled
+rules into one Scanner, which runs once per text and gives each rule the set
+of what it found. Adding a rule adds entries to that scanner, not another
+pass over the text. schemas/lint-rules.json turns rules on or off, sets each
+rule's severity (an error fails the file, a warning is only reported) and
+lists extra modules whose rules should be loaded.
+
+Rules are plain functions registered with the @rule decorator:
+
+    @rule('no_todo_markers', keywords=['TODO', 'FIXME'])
+    def no_todo_markers(mode, text, found):
+        \"\"\"customInstructions should not ship with TODO or FIXME markers.\"\"\"
+        if found & {'TODO', 'FIXME'}:
+            return f"Agent '{mode.get('slug')}' has unfinished TODO/FIXME markers"
+
+Usage:
+    from agent_lint import load_engine
+
+    errors, warnings = load_engine().check_document(document, 'agents/uber-orchestrator.yaml')
+
+    python tools/agent_lint.py --list
+    python tools/agent_lint.py agents/uber-orchestrator.yaml agents/orchestrator-state-scribe.yaml
+"""
+
+import re
+import sys
+import json
+import argparse
+import importlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_CONFIG_PATH = PROJECT_ROOT / 'schemas' / 'lint-rules.json'
+
+# Severity -> message prefix, as validate-agents.py prints errors and warnings
+SEVERITIES = {
+    'error': '  ✗ ',
+    'warning': '  ⚠️  '
+}
+
+# (mode, customInstructions, keywords and patterns found) -> message or None
+RuleCheck = Callable[[Dict, str, Set[str]], Optional[str]]
+
+class LintRule:
+    """A registered check with the keywords and patterns its scan needs."""
+
+    def __init__(
+        self,
+        name: str,
+        check: RuleCheck,
+        keywords: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        applies: Optional[Callable[[str], bool]] = None,
+        severity: str = 'warning'
+    ):
+        if severity not in SEVERITIES:
+            raise ValueError(f"Rule '{name}': unknown severity '{severity}'")
+        self.name = name
+        self.check = check
+        self.keywords = list(keywords)
+        self.patterns = list(patterns)
+        self.applies = applies  # agent file -> whether the rule runs, None for every file
+        self.severity = severity
+        self.description = ' '.join((check.__doc__ or '').split())
+
+# Every known rule in registration order, which is also reporting order
+RULES: Dict[str, LintRule] = {}
+
+def rule(
+    name: str,
+    keywords: Iterable[str] = (),
+    patterns: Iterable[str] = (),
+    applies: Optional[Callable[[str], bool]] = None,
+    severity: str = 'warning'
+) -> Callable[[RuleCheck], RuleCheck]:
+    """Register the decorated check function as lint rule name."""
+    def register(check: RuleCheck) -> RuleCheck:
+        if name in RULES:
+            raise ValueError(f"Lint rule '{name}' is already registered")
+        RULES[name] = LintRule(name, check, keywords, patterns, applies, severity)
+        return check
+    return register
+
+# -- Scanner ------------------------------------------------------------------
+
+# Characters roughly from most to least frequent in customInstructions prose.
+# Large keyword sets are matched at each keyword's rarest character, and
+# characters not listed (capitals, digits, most punctuation) count as rarest.
+COMMON_CHARS = ' etaoinshrdl\ncu-m.,wfgypbvkjxqz'
+
+def _pivot(keyword: str) -> int:
+    """Offset of the keyword's rarest character, the first one on ties."""
+    ranks = [COMMON_CHARS.index(char) if char in COMMON_CHARS else len(COMMON_CHARS) for char in keyword]
+    return ranks.index(max(ranks))
+
+def _aligned(keyword: str, pivot: int, other: str, other_pivot: int) -> bool:
+    """Whether both keywords can occur with their pivots at the same offset."""
+    before = min(pivot, other_pivot)
+    after = min(len(keyword) - pivot, len(other) - other_pivot)
+    return keyword[pivot - before:pivot + after] == other[other_pivot - before:other_pivot + after]
+
+class Scanner:
+    """
+    Reports which keywords and regexes occur in a text.
+
+    Keywords are found wherever they occur, overlapping ones included. Up to
+    PROBE_LIMIT keywords are checked with `in`, because CPython's substring
+    search makes a few dozen C-speed probes cheaper than any regex pass, and
+    single characters always are. Larger sets share one regex pass. Each
+    keyword is anchored at its rarest character, with its text before and
+    after checked by lookbehind and lookahead. The regex engine then skips
+    every position that holds none of those characters, and a match consumes
+    one character, so keywords that overlap are still found. Keywords that
+    could share that character at the same offset are checked when the
+    first one matches, since an alternation only reports one. Regexes always
+    share a single alternation. A hit is checked against the other regexes
+    at the same offset, so no regex can hide another.
+    """
+
+    PROBE_LIMIT = 32
+
+    def __init__(self, keywords: Iterable[str] = (), patterns: Iterable[str] = ()):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.patterns = list(dict.fromkeys(patterns))
+        # Keywords checked with `in`
+        self._probes = self.keywords
+        self._keyword_regex = None
+        if len(self.keywords) > self.PROBE_LIMIT:
+            self._probes = [keyword for keyword in self.keywords if len(keyword) == 1]
+            groups: Dict[str, List[Tuple[str, int]]] = {}
+            for keyword in self.keywords:
+                if len(keyword) > 1:
+                    pivot = _pivot(keyword)
+                    groups.setdefault(keyword[pivot], []).append((keyword, pivot))
+            # (keyword, pivot, later keywords in its group that can match at the same offset), by group number
+            self._anchored: List[Tuple[str, int, List[Tuple[str, int]]]] = []
+            branches = []
+            for char, members in groups.items():
+                alternatives = []
+                for index, (keyword, pivot) in enumerate(members):
+                    self._anchored.append((keyword, pivot, [
+                        (other, other_pivot) for other, other_pivot in members[index + 1:]
+                        if _aligned(keyword, pivot, other, other_pivot)
+                    ]))
+                    before = f"(?<={re.escape(keyword[:pivot + 1])})" if pivot else ''
+                    after = f"(?={re.escape(keyword[pivot + 1:])})" if pivot + 1 < len(keyword) else ''
+                    # The empty group numbers the alternative, for match.lastindex
+                    alternatives.append(before + after + '()')
+                branches.append(re.escape(char) + '(?:' + '|'.join(alternatives) + ')')
+            self._keyword_regex = re.compile('|'.join(branches))
+        self._pattern_regex = None
+        if self.patterns:
+            self._compiled = [re.compile(pattern) for pattern in self.patterns]
+            self._pattern_regex = re.compile(
+                '|'.join(f"(?:{pattern})" for pattern in self.patterns)
+            )
+
+    def scan(self, text: str) -> Set[str]:
+        """The keywords and pattern sources found in text."""
+        found = {keyword for keyword in self._probes if keyword in text}
+        if self._keyword_regex is not None:
+            anchored = self._anchored
+            for match in self._keyword_regex.finditer(text):
+                keyword, _, siblings = anchored[match.lastindex - 1]
+                found.add(keyword)
+                for other, other_pivot in siblings:
+                    start = match.start() - other_pivot
+                    if start >= 0 and other not in found and text.startswith(other, start):
+                        found.add(other)
+        if self._pattern_regex is not None:
+            missing = dict(zip(self.patterns, self._compiled))
+            search = self._pattern_regex.search
+            match = search(text)
+            while match is not None:
+                position = match.start()
+                for pattern, compiled in list(missing.items()):
+                    if compiled.match(text, position):
+                        found.add(pattern)
+                        del missing[pattern]
+                if not missing:
+                    break
+                match = search(text, position + 1)
+        return found
+
+# -- Engine -------------------------------------------------------------------
+
+def load_config(config_path: Path = DEFAULT_CONFIG_PATH) -> Dict:
+    """
+    Load the rule configuration, importing any extra rule modules it lists.
+
+    Raises ValueError for unknown rules or severities and for rule modules
+    that cannot be imported.
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    for module in config.get('modules', []):
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            raise ValueError(f"modules: cannot import '{module}': {e}")
+    for name, settings in config.get('rules', {}).items():
+        if name not in RULES:
+            raise ValueError(f"rules.{name}: unknown lint rule (known: {', '.join(RULES)})")
+        if settings.get('severity', RULES[name].severity) not in SEVERITIES:
+            raise ValueError(f"rules.{name}.severity must be one of {', '.join(SEVERITIES)}")
+    return config
+
+class LintEngine:
+    """Runs the enabled rules over agent documents with one scan per customInstructions."""
+
+    def __init__(self, config: Optional[Dict] = None, only: Optional[Iterable[str]] = None):
+        settings = (config or {}).get('rules', {})
+        names = list(only) if only is not None else [
+            name for name in RULES if settings.get(name, {}).get('enabled', True)
+        ]
+        self.rules: List[Tuple[LintRule, str]] = [
+            (RULES[name], settings.get(name, {}).get('severity', RULES[name].severity))
+            for name in names
+        ]
+        # (bit, predicate) for the distinct applies() predicates; the mask of
+        # those a file passes selects its plan
+        self._conditions = [(1 << index, applies) for index, applies in enumerate(dict.fromkeys(
+            lint_rule.applies for lint_rule, _ in self.rules if lint_rule.applies is not None
+        ))]
+        self._plans: Dict[int, Tuple[Scanner, List[Tuple[RuleCheck, str, bool]]]] = {}
+
+    def _plan(self, mask: int) -> Tuple[Scanner, List[Tuple[RuleCheck, str, bool]]]:
+        """
+        The shared scanner and the (check, message prefix, is error) list of
+        the rules whose conditions are in mask, built once per mask.
+        """
+        passed = {applies for bit, applies in self._conditions if mask & bit}
+        active = [
+            (lint_rule, severity) for lint_rule, severity in self.rules
+            if lint_rule.applies is None or lint_rule.applies in passed
+        ]
+        scanner = Scanner(
+            (keyword for lint_rule, _ in active for keyword in lint_rule.keywords),
+            (pattern for lint_rule, _ in active for pattern in lint_rule.patterns)
+        )
+        checks = [(lint_rule.check, SEVERITIES[severity], severity == 'error') for lint_rule, severity in active]
+        plan = self._plans[mask] = (scanner, checks)
+        return plan
+
+    def check_document(self, document: Dict, agent_file: str) -> Tuple[List[str], List[str]]:
+        """
+        Lint every mode of an agent document.
+
+        Returns (errors, warnings) as formatted lines, grouped by rule in
+        registration order.
+        """
+        if not isinstance(document, dict) or 'customModes' not in document:
+            return [], []
+        mask = 0
+        for bit, applies in self._conditions:
+            if applies(agent_file):
+                mask |= bit
+        scanner, checks = self._plans.get(mask) or self._plan(mask)
+        if not checks:
+            return [], []
+
+        errors: List[str] = []
+        warnings: List[str] = []
+        modes = document['customModes']
+        if len(modes) == 1:
+            # The usual single mode: messages come out in rule order without keeping the scan
+            mode = modes[0]
+            text = mode.get('customInstructions', '')
+            if not isinstance(text, str):
+                text = ''
+            found = scanner.scan(text)
+            for check, prefix, is_error in checks:
+                message = check(mode, text, found)
+                if message:
+                    (errors if is_error else warnings).append(prefix + message)
+            return errors, warnings
+
+        scanned = []
+        for mode in modes:
+            text = mode.get('customInstructions', '')
+            if not isinstance(text, str):
+                text = ''
+            scanned.append((mode, text, scanner.scan(text)))
+        for check, prefix, is_error in checks:
+            for mode, text, found in scanned:
+                message = check(mode, text, found)
+                if message:
+                    (errors if is_error else warnings).append(prefix + message)
+        return errors, warnings
+
+_engines: Dict[str, LintEngine] = {}
+
+def load_engine(config_path: Path = DEFAULT_CONFIG_PATH) -> LintEngine:
+    """The engine for a configuration file, built once per process."""
+    key = str(config_path)
+    if key not in _engines:
+        _engines[key] = LintEngine(load_config(config_path))
+    return _engines[key]
+
+# -- Built-in rules -----------------------------------------------------------
+
+PROTOCOL_KEYWORDS = [
+    'To: [recipient agent\'s slug], From: [your agent\'s slug]',
+    'mandatory routing header',
+    'communication protocol'
+]
+
+@rule('communication_protocol', keywords=PROTOCOL_KEYWORDS)
+def communication_protocol(mode: Dict, text: str, found: Set[str]) -> Optional[str]:
+    """customInstructions must state the mandatory routing header requirement."""
+    if found.isdisjoint(PROTOCOL_KEYWORDS):
+        return f"Agent '{mode.get('slug', 'unknown')}' may be missing communication protocol requirement"
+    return None
+
+SIGNAL_FRAMEWORK_COMPONENTS = [
+    'Signal Interpretation Framework',
+    'signalCategories',
+    'signalTypes',
+    'interpretationLogic',
+    'keywordsToSignalType'
+]
+
+@rule(
+    'signal_framework',
+    keywords=SIGNAL_FRAMEWORK_COMPONENTS,
+    applies=lambda agent_file: 'orchestrator-state-scribe' in agent_file
+)
+def signal_framework(mode: Dict, text: str, found: Set[str]) -> Optional[str]:
+    """The orchestrator-state-scribe must carry every Signal Interpretation Framework component."""
+    missing = [component for component in SIGNAL_FRAMEWORK_COMPONENTS if component not in found]
+    if missing:
+        return f"State Scribe may be missing Signal Framework components: {', '.join(missing)}"
+    return None
+
+# Longest customInstructions accepted on a single line
+MAX_SINGLE_LINE = 1000
+
+@rule('instruction_layout', keywords=['\n'])
+def instruction_layout(mode: Dict, text: str, found: Set[str]) -> Optional[str]:
+    """Long customInstructions should be YAML literal blocks, not one very long line."""
+    if len(text) > MAX_SINGLE_LINE and '\n' not in found:
+        return f"Agent '{mode.get('slug')}' has very long single-line customInstructions (>{MAX_SINGLE_LINE} chars)"
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description='Lint agent customInstructions with the configured rules')
+    parser.add_argument('files', nargs='*', type=Path, help='Agent YAML files to lint')
+    parser.add_argument('--config', type=Path, default=DEFAULT_CONFIG_PATH, help='Rule configuration (default: schemas/lint-rules.json)')
+    parser.add_argument('--list', action='store_true', help='List registered rules with their configuration')
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config)
+    except (OSError, ValueError) as e:
+        print(json.dumps({'error': str(e)}), file=sys.stderr)
+        sys.exit(2)
+    engine = LintEngine(config)
+
+    if args.list or not args.files:
+        enabled = {lint_rule.name: severity for lint_rule, severity in engine.rules}
+        print(json.dumps([
+            {
+                'rule': name,
+                'enabled': name in enabled,
+                'severity': enabled.get(name, lint_rule.severity),
+                'description': lint_rule.description,
+                'keywords': lint_rule.keywords,
+                'patterns': lint_rule.patterns
+            }
+            for name, lint_rule in RULES.items()
+        ], indent=2, ensure_ascii=False))
+        return
+
+    from agent_registry import parse_yaml_file
+    from agent_fragments import library_for
+
+    failed = False
+    for path in args.files:
+        try:
+            document = library_for(path.parent).expand_document(parse_yaml_file(path))
+            errors, warnings = engine.check_document(document, str(path))
+        except (OSError, ValueError) as e:
+            errors, warnings = [f"  ✗ {e}"], []
+        failed = failed or bool(errors)
+        print(json.dumps({
+            'file': str(path),
+            'errors': [line.strip() for line in errors],
+            'warnings': [line.strip() for line in warnings]
+        }, ensure_ascii=False))
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    # Rule modules listed in the config register through `import agent_lint`, which must be this module
+    sys.modules.setdefault('agent_lint', sys.modules[__name__])
+    main()
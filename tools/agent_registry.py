@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Shared Agent Registry
+
+Parses agent YAML files once and keeps a compact marshal snapshot of the parsed
+documents (every customModes entry with its slug, name, roleDefinition,
+customInstructions, groups and source), so the validator, the merger and the
+dependency graph generator can load the whole corpus with one fast read
+instead of re-parsing every file.
+
+YAML is parsed with the libyaml C loader when PyYAML was built with it, and
+falls back to the pure-Python SafeLoader otherwise. Snapshot entries are
+invalidated per file: an unchanged mtime and size reuses the entry as-is, and
+a changed stat with an unchanged SHA-256 content hash only refreshes the stat.
+marshal can only build plain data, so a snapshot dropped into .cache/ cannot
+run code the way an unpickled one could. The snapshot holds the documents as
+written; shared fragment includes
+({{> name}}, see agent_fragments) are expanded when documents are handed out.
+
+Usage:
+    from agent_registry import AgentRegistry
+
+    registry = AgentRegistry(agents_dir)
+    registry.refresh()
+    for mode in registry.modes():
+        print(mode['slug'])
+    registry.save()
+"""
+
+import os
+import marshal
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import profiling
+from agent_fragments import FragmentLibrary, library_for
+
+# (yaml module, safe loader class), imported on the first parse: a registry
+# served from its snapshot never needs PyYAML
+_YAML = None
+
+# Bump when the snapshot layout changes so old snapshots are ignored
+SNAPSHOT_VERSION = 2
+
+ENTRY_KEYS = {'mtime_ns', 'size', 'digest', 'blob', 'error'}
+
+def _yaml() -> Tuple[Any, Any]:
+    global _YAML
+    if _YAML is None:
+        import yaml
+        _YAML = (yaml, getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    return _YAML
+
+def parse_yaml_bytes(content: bytes, name: Optional[Any] = None) -> Any:
+    """
+    Parse YAML content with the fastest available safe loader. Error
+    positions name the file `name` (a path) instead of "<byte string>".
+    """
+    yaml, loader = _yaml()
+    try:
+        return yaml.load(content, Loader=loader)
+    except yaml.YAMLError as e:
+        if name is not None:
+            # libyaml marks are read-only, so swap in marks that name the file
+            for attr in ('context_mark', 'problem_mark'):
+                mark = getattr(e, attr, None)
+                if mark is not None:
+                    setattr(e, attr, yaml.Mark(str(name), mark.index, mark.line, mark.column, None, None))
+        raise ValueError(f"Invalid YAML: {e}")
+
+def parse_yaml_file(yaml_path: Path) -> Any:
+    """
+    Load and parse a YAML file with the fastest available safe loader.
+
+    Raises FileNotFoundError if the file is missing and ValueError if it is
+    not valid YAML.
+    """
+    try:
+        with open(yaml_path, 'rb') as f:
+            content = f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"YAML file not found: {yaml_path}")
+    return parse_yaml_bytes(content, yaml_path)
+
+def parse_snapshot_entry(content: bytes, name: Optional[Any] = None) -> Tuple[Any, Optional[bytes], Optional[str]]:
+    """
+    Parse the YAML content of file `name` for a snapshot entry: (document,
+    marshalled document, None), or (None, None, YAML error message) if it
+    does not parse. The blob is None for documents marshal cannot store
+    (timestamps); those are re-parsed from the file when needed.
+    """
+    try:
+        document = parse_yaml_bytes(content, name)
+    except ValueError as e:
+        return None, None, str(e)
+    try:
+        blob = marshal.dumps(document)
+    except ValueError:
+        blob = None
+    return document, blob, None
+
+def default_snapshot_path(agents_dir: Path) -> Path:
+    """Snapshot location used by the tools: <project>/.cache/agent-registry.marshal."""
+    return agents_dir.parent / '.cache' / 'agent-registry.marshal'
+
+class AgentRegistry:
+    """
+    Parsed agent definitions backed by a per-file invalidated snapshot.
+
+    Each snapshot entry holds the file's mtime, size, content digest and
+    either the marshalled document or the YAML error message. Documents are
+    unmarshalled lazily, so callers that only need digests (such as the
+    validation cache) never pay for decoding them.
+
+    refresh(parse=False) leaves changed files unparsed so callers can parse
+    them elsewhere (validate-agents.py does it in its worker pool) and hand
+    the results back with record(); document() parses any file that is
+    still unparsed on demand.
+    """
+
+    def __init__(self, agents_dir: Path, snapshot_path: Optional[Path] = None, use_snapshot: bool = True):
+        self.agents_dir = agents_dir
+        self.snapshot_path = snapshot_path or default_snapshot_path(agents_dir)
+        self.use_snapshot = use_snapshot
+        self.files: List[Path] = []
+        self.parsed = 0
+        self.reused = 0
+        self._entries: Dict[str, Dict] = {}
+        self._documents: Dict[str, Any] = {}
+        self._expanded: Dict[str, Any] = {}
+        # Changed files left unparsed by refresh(parse=False): key -> (mtime_ns, size, digest)
+        self._unparsed: Dict[str, Tuple[int, int, str]] = {}
+        self._dirty = False
+        self.fragments: FragmentLibrary = library_for(agents_dir)
+        self._fragments_key = self.fragments.stat_key()
+        if use_snapshot:
+            self._load_snapshot()
+
+    def _load_snapshot(self) -> None:
+        """Read the snapshot, ignoring it if missing, corrupt or from another version."""
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                data = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if not isinstance(data, dict) or data.get('version') != SNAPSHOT_VERSION:
+            return
+        entries = data.get('entries')
+        if isinstance(entries, dict) and all(
+            isinstance(entry, dict) and entry.keys() == ENTRY_KEYS for entry in entries.values()
+        ):
+            self._entries = entries
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return os.path.abspath(path)
+
+    def refresh(self, files: Optional[Iterable[Path]] = None, parse: bool = True) -> None:
+        """
+        Bring the registry up to date with the given files (default: every
+        *.yaml file in agents_dir), re-parsing only files whose content changed.
+
+        With parse=False, changed files are only hashed; needs_parse() reports
+        them until record() or document() fills in their entries.
+        """
+        full_scan = files is None
+        # The library is shared between registries, so compare fingerprints
+        self.fragments.refresh()
+        if self.fragments.stat_key() != self._fragments_key:
+            self._fragments_key = self.fragments.stat_key()
+            self._expanded.clear()
+        self.files = sorted(self.agents_dir.glob('*.yaml')) if full_scan else list(files)
+        self._unparsed.clear()
+        seen = set()
+
+        for path in self.files:
+            key = self._key(path)
+            seen.add(key)
+            try:
+                st = os.stat(path)
+            except OSError:
+                # Missing files are reported by document() with the usual error
+                if self._entries.pop(key, None) is not None:
+                    self._dirty = True
+                self._documents.pop(key, None)
+                self._expanded.pop(key, None)
+                continue
+
+            entry = self._entries.get(key)
+            if entry is not None and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                self.reused += 1
+                continue
+
+            with open(path, 'rb') as f:
+                content = f.read()
+            digest = hashlib.sha256(content).hexdigest()
+            if entry is not None and entry['digest'] == digest:
+                # Touched but unchanged: keep the parsed document
+                entry['mtime_ns'] = st.st_mtime_ns
+                entry['size'] = st.st_size
+                self.reused += 1
+                self._dirty = True
+                continue
+
+            self._documents.pop(key, None)
+            self._expanded.pop(key, None)
+            if not parse:
+                if self._entries.pop(key, None) is not None:
+                    self._dirty = True
+                self._unparsed[key] = (st.st_mtime_ns, st.st_size, digest)
+                continue
+            with profiling.phase('yaml_parse', path):
+                document, blob, error = parse_snapshot_entry(content, path)
+            if document is not None:
+                self._documents[key] = document
+            self._store(key, st.st_mtime_ns, st.st_size, digest, blob, error)
+
+        if full_scan:
+            stale = [key for key in self._entries if key not in seen]
+            for key in stale:
+                del self._entries[key]
+            self._dirty = self._dirty or bool(stale)
+
+    def _store(self, key: str, mtime_ns: int, size: int, digest: str, blob: Optional[bytes],
+               error: Optional[str]) -> None:
+        self._entries[key] = {
+            'mtime_ns': mtime_ns,
+            'size': size,
+            'digest': digest,
+            'blob': blob,
+            'error': error
+        }
+        self.parsed += 1
+        self._dirty = True
+
+    def needs_parse(self, path: Path) -> bool:
+        """True if refresh(parse=False) left this file unparsed."""
+        return self._key(path) in self._unparsed
+
+    def record(self, path: Path, digest: str, blob: Optional[bytes], error: Optional[str]) -> None:
+        """
+        Fill in the entry of a file left unparsed by refresh(parse=False)
+        from a parse done elsewhere: the digest of the content that was
+        parsed and parse_snapshot_entry()'s blob and error. Files that are
+        not awaiting a parse are ignored.
+        """
+        key = self._key(path)
+        pending = self._unparsed.pop(key, None)
+        if pending is not None:
+            # The digest of what was parsed wins if the file changed in between
+            self._store(key, pending[0], pending[1], digest, blob, error)
+
+    def parse_pending(self) -> None:
+        """Parse every file still left unparsed by refresh(parse=False)."""
+        for path in self.files:
+            if self.needs_parse(path):
+                try:
+                    self.document(path, expand=False)
+                except (FileNotFoundError, ValueError):
+                    pass
+
+    def digest(self, path: Path) -> Optional[str]:
+        """SHA-256 content digest of a refreshed file, or None if it is not tracked."""
+        key = self._key(path)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry['digest']
+        pending = self._unparsed.get(key)
+        return pending[2] if pending is not None else None
+
+    def document(self, path: Path, expand: bool = True) -> Any:
+        """
+        Return the parsed document for a refreshed file, with fragment
+        includes expanded unless expand is False.
+
+        Raises FileNotFoundError or ValueError exactly like parse_yaml_file(),
+        and FragmentError (a ValueError) for unknown or cyclic includes.
+        """
+        key = self._key(path)
+        if expand and key in self._expanded:
+            return self._expanded[key]
+        document = self._documents.get(key)
+        if document is None and key in self._unparsed:
+            try:
+                with open(path, 'rb') as f:
+                    content = f.read()
+            except OSError:
+                raise FileNotFoundError(f"YAML file not found: {path}")
+            with profiling.phase('yaml_parse', path):
+                document, blob, error = parse_snapshot_entry(content, path)
+            self.record(path, hashlib.sha256(content).hexdigest(), blob, error)
+            if document is not None:
+                self._documents[key] = document
+        if document is None:
+            entry = self._entries.get(key)
+            if entry is None:
+                raise FileNotFoundError(f"YAML file not found: {path}")
+            if entry['error'] is not None:
+                raise ValueError(entry['error'])
+            try:
+                document = marshal.loads(entry['blob'])
+            except (EOFError, ValueError, TypeError):
+                # No blob (see parse_snapshot_entry) or a damaged one
+                document = parse_yaml_file(path)
+            self._documents[key] = document
+        if not expand:
+            return document
+        expanded = self._expanded[key] = self.fragments.expand_document(document)
+        return expanded
+
+    def iter_documents(self) -> Iterator[Tuple[Path, Any, Optional[Exception]]]:
+        """Yield (path, document, error) for every refreshed file, in order."""
+        for path in self.files:
+            try:
+                yield path, self.document(path), None
+            except (FileNotFoundError, ValueError) as e:
+                yield path, None, e
+
+    def modes(self) -> List[Dict]:
+        """All customModes entries across the refreshed files, in file order."""
+        all_modes = []
+        for _, document, error in self.iter_documents():
+            if error is None and isinstance(document, dict) and isinstance(document.get('customModes'), list):
+                all_modes.extend(document['customModes'])
+        return all_modes
+
+    def save(self) -> None:
+        """Atomically write the snapshot back to disk if anything changed."""
+        if not self.use_snapshot or not self._dirty:
+            return
+        import tempfile
+
+        self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.snapshot_path.parent, prefix=self.snapshot_path.name, suffix='.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                marshal.dump({'version': SNAPSHOT_VERSION, 'entries': self._entries}, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError:
+            # A snapshot that cannot be written only costs speed on the next run
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        self._dirty = False
+
+def load_registry(agents_dir: Path, use_snapshot: bool = True) -> AgentRegistry:
+    """Refresh a registry over every agent in agents_dir and persist its snapshot."""
+    registry = AgentRegistry(agents_dir, use_snapshot=use_snapshot)
+    registry.refresh()
+    registry.save()
+    return registry
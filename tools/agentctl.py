@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - agentctl
+
+One command line entry point for the tools. Each subcommand runs an existing
+tool script as __main__ with the remaining arguments, so
+`agentctl validate -j 4` behaves exactly like
+`python tools/validate-agents.py -j 4`, and the scripts keep working on their
+own.
+
+Startup stays small: this module imports nothing beyond the standard library
+basics, a tool is only loaded when its subcommand runs, and the tools import
+their heavy dependencies (jsonschema, graphviz, PyYAML, the process pool) on
+first use, so `agentctl --help` or a validate answered from the cache never
+pays for them. tools/benchmarks/bench-startup.py guards the budget.
+
+Usage:
+    python tools/agentctl.py --help
+    python tools/agentctl.py validate -j 4
+    python tools/agentctl.py merge --output custom_modes.yaml
+    python tools/agentctl.py graph --format svg
+    python tools/agentctl.py query reached-by spec-writer-comprehensive
+    python -m tools validate                      # from the project root
+"""
+
+import sys
+import argparse
+from pathlib import Path
+from typing import List, Optional
+
+TOOLS_DIR = Path(__file__).resolve().parent
+
+# Subcommand -> (script in tools/, arguments inserted before the user's, help)
+COMMANDS = {
+    'validate': ('validate-agents.py', [], 'Validate agent YAML definitions against the schema'),
+    'merge': ('merge-agents.py', [], "Merge agent files into RooCode's custom_modes.yaml"),
+    'graph': ('generate-dependency-graph.py', [], 'Render the delegation graph (Mermaid, DOT, PNG, SVG)'),
+    'query': ('generate-dependency-graph.py', ['query'], 'Analyze the delegation graph and print JSON'),
+    'lint': ('agent_lint.py', [], 'List lint rules or lint customInstructions of agent files'),
+    'fragments': ('agent_fragments.py', [], 'List and expand shared prompt fragments, find duplicated passages'),
+    'memory': ('project_memory.py', [], 'Manage the project_memory table in memory.db'),
+    'changes': ('project_memory.py', ['changes'], 'project_memory change-log entries after a cursor'),
+    'maintain': ('memory_maintenance.py', [], 'Archive expired history, reindex and vacuum memory.db'),
+    'writer': ('memory_writer.py', [], 'Run or talk to the memory.db write queue service'),
+    'context': ('context_index.py', [], 'Full-text search over memory-bank/, docs/ and reports/'),
+    'signals': ('signal_framework.py', [], 'Classify summaries with the Signal Interpretation Framework'),
+    'simulate': ('workflow_simulator.py', [], 'Simulate SPARC workflow latency under scheduling policies'),
+    'traces': ('trace_analyzer.py', [], 'Delegation latency from routing headers in task transcripts'),
+    'corpus': ('generate-synthetic-corpus.py', [], 'Generate a synthetic agent corpus for benchmarks'),
+}
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='agentctl',
+        description='AI Agent Orchestration System tools',
+        epilog="Run 'agentctl COMMAND --help' for the options of a command."
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+    for name, (_, _, help_text) in COMMANDS.items():
+        subparsers.add_parser(name, help=help_text, add_help=False)
+    return parser
+
+def run(command: str, args: List[str]) -> None:
+    """Run a subcommand's script as __main__ with args."""
+    import runpy
+
+    script, prefix, _ = COMMANDS[command]
+    # Tools import their shared modules (profiling, agent_registry, ...) by bare name
+    if str(TOOLS_DIR) not in sys.path:
+        sys.path.insert(0, str(TOOLS_DIR))
+    # run_path puts the script path in argv[0], as running the script directly would
+    sys.argv = [sys.argv[0]] + prefix + args
+    runpy.run_path(str(TOOLS_DIR / script), run_name='__main__')
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    # Dispatch before argparse so every remaining argument reaches the tool untouched
+    if argv and argv[0] in COMMANDS:
+        run(argv[0], argv[1:])
+        return
+    build_parser().parse_args(argv)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass DelegationMatcher vs the legacy three-pass extractor
+
+Builds a synthetic corpus of long single-line customInstructions (similar to
+the state scribe's), then times extracting delegations for every agent with
+the legacy approach (three regex passes, a nested keyword any() per
+hyphenated word, then intersection with the known slugs) and with the
+DelegationMatcher used by generate-dependency-graph.py. Both must produce the
+same edges.
+
+The corpus only uses clean sentences, so --fuzz short texts are also built
+from adversarial pieces: verbs inside hyphenated tokens ("pre-delegate to X",
+"spec-writer-task to X"), verbs inside another verb's target, mixed case and
+Unicode case folds. Both extractors must agree on every one of them, with
+and without a slug filter. The benchmark exits 1 on any disagreement.
+
+Usage:
+    python tools/benchmarks/bench-delegation-extractor.py
+    python tools/benchmarks/bench-delegation-extractor.py --agents 5000 --length 8000 --fuzz 100000
+"""
+
+import re
+import sys
+import random
+import argparse
+from typing import Dict, List, Set
+
+from bench_common import best_of, load_tool
+
+ROLES = ['orchestrator', 'writer', 'coder', 'tester', 'architect', 'validator',
+         'auditor', 'guardian', 'planner', 'researcher', 'debugger', 'optimizer',
+         'synthesizer', 'converter', 'assistant', 'scribe']
+TOPICS = ['spec', 'api', 'module', 'security', 'performance', 'docs', 'state',
+          'data', 'edge-case', 'integration', 'acceptance', 'feature', 'test-plan']
+FILLER = ('You must adhere to the high-level plan and keep an end-to-end view of the '
+          'project state. Use read-only tools where possible, and write a well-structured '
+          'report with step-by-step reasoning and up-to-date context. ').split(' ')
+
+def legacy_extract_delegations(custom_instructions: str) -> Set[str]:
+    """The three-pass extractor generate-dependency-graph.py used before the matcher."""
+    delegations = set()
+    pattern1 = r'delegate[s]?\s+to\s+([a-z0-9]+(?:-[a-z0-9]+)*)'
+    delegations.update(re.findall(pattern1, custom_instructions, re.IGNORECASE))
+    pattern2 = r'(?:new_task|task)\s+(?:to\s+)?([a-z0-9]+(?:-[a-z0-9]+)*)'
+    delegations.update(re.findall(pattern2, custom_instructions, re.IGNORECASE))
+    pattern3 = r'\b([a-z]+-[a-z]+(?:-[a-z]+)*)\b'
+    agent_keywords = ['orchestrator', 'writer', 'coder', 'tester', 'architect',
+                      'validator', 'auditor', 'guardian', 'planner', 'researcher',
+                      'debugger', 'optimizer', 'advocate', 'ruler', 'bmo']
+    for agent in re.findall(pattern3, custom_instructions):
+        if any(keyword in agent for keyword in agent_keywords):
+            delegations.add(agent)
+    return delegations
+
+FUZZ_PIECES = ['delegate', 'delegates', 'Delegate', 'DELEGATES', 'to', 'To', 'task', 'Task', 'new_task',
+               'NEW_TASK', 'sub', 're', 'pre', 'tester', 'tdd', 'master', 'coder', 'spec', 'writer', 'x1',
+               '42', 'bmo', 'ruler', 'orchestrator', '\u212a', '\u017f', '\u0131', '\u0130']
+FUZZ_SEPARATORS = [' ', ' ', '-', '-', '', '\n', '  ', '_', '.', ',', '\t']
+FUZZ_SLUGS = {'tester-tdd', 'tester-tdd-master', 'master-coder', 'spec-writer', 'bmo-ruler',
+              'coder', 'x1', 'pre', 'new', 'task'}
+
+def fuzz_disagreements(matcher_class, cases: int, seed: int) -> int:
+    """Adversarial texts on which the matcher and the legacy extractor disagree."""
+    rng = random.Random(seed)
+    unfiltered = matcher_class()
+    filtered = matcher_class(FUZZ_SLUGS)
+    disagreements = 0
+    for _ in range(cases):
+        text = ''.join(rng.choice(FUZZ_PIECES) + rng.choice(FUZZ_SEPARATORS) for _ in range(rng.randint(1, 14)))
+        expected = legacy_extract_delegations(text)
+        if unfiltered.extract(text) != expected or filtered.extract(text) != expected & FUZZ_SLUGS:
+            disagreements += 1
+    return disagreements
+
+def build_corpus(agents: int, length: int, fanout: int, seed: int) -> Dict[str, str]:
+    """Return slug -> single-line customInstructions of roughly `length` chars."""
+    rng = random.Random(seed)
+    # Mix of plain and numbered slugs; numbered ones are only found via verbs
+    slugs = sorted({
+        f"{rng.choice(TOPICS)}-{rng.choice(ROLES)}" + (f"-{i}" if i % 2 else f"-{rng.choice(TOPICS)}")
+        for i in range(agents)
+    })
+
+    corpus = {}
+    for slug in slugs:
+        words: List[str] = []
+        size = 0
+        while size < length:
+            roll = rng.random()
+            if roll < 0.02 * fanout:
+                word = f"delegate to {rng.choice(slugs)}"
+            elif roll < 0.03 * fanout:
+                word = f"new_task {rng.choice(slugs)}"
+            elif roll < 0.05 * fanout:
+                word = rng.choice(slugs)
+            else:
+                word = rng.choice(FILLER)
+            words.append(word)
+            size += len(word) + 1
+        corpus[slug] = ' '.join(words)
+    return corpus
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark delegation extraction')
+    parser.add_argument('--agents', type=int, default=2000, help='Number of synthetic agents (default: 2000)')
+    parser.add_argument('--length', type=int, default=4000, help='Instruction length in chars (default: 4000)')
+    parser.add_argument('--fanout', type=int, default=1, help='Delegation density multiplier (default: 1)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions, best is reported (default: 3)')
+    parser.add_argument('--fuzz', type=int, default=20000, help='Adversarial texts to compare (default: 20000)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    graph_tool = load_tool('generate-dependency-graph.py')
+    corpus = build_corpus(args.agents, args.length, args.fanout, args.seed)
+    known = set(corpus)
+    total_bytes = sum(len(text) for text in corpus.values())
+
+    def run_legacy():
+        return {slug: legacy_extract_delegations(text).intersection(known) for slug, text in corpus.items()}
+
+    def run_matcher():
+        matcher = graph_tool.DelegationMatcher(known)
+        return {slug: matcher.extract(text) for slug, text in corpus.items()}
+
+    legacy_edges = run_legacy()
+    matcher_edges = run_matcher()
+    mismatches = sum(1 for slug in corpus if legacy_edges[slug] != matcher_edges[slug])
+    edge_count = sum(len(targets) for targets in matcher_edges.values())
+
+    legacy_time = best_of(run_legacy, args.repeat)
+    matcher_time = best_of(run_matcher, args.repeat)
+
+    print(f"Corpus:     {len(corpus)} agents, {total_bytes / 1e6:.1f} MB of instructions, {edge_count} edges")
+    print(f"Legacy:     {legacy_time * 1000:9.1f} ms  ({total_bytes / legacy_time / 1e6:6.1f} MB/s)")
+    print(f"Matcher:    {matcher_time * 1000:9.1f} ms  ({total_bytes / matcher_time / 1e6:6.1f} MB/s)")
+    print(f"Speedup:    {legacy_time / matcher_time:9.2f}x")
+    print(f"Agreement:  {len(corpus) - mismatches}/{len(corpus)} agents with identical edges")
+    fuzz_mismatches = fuzz_disagreements(graph_tool.DelegationMatcher, args.fuzz, args.seed)
+    print(f"Fuzz:       {args.fuzz - fuzz_mismatches}/{args.fuzz} adversarial texts with identical results")
+    sys.exit(1 if mismatches or fuzz_mismatches else 0)
+
+if __name__ == '__main__':
+    main()
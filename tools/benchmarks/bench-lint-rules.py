@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one shared lint scan vs a pass per rule
+
+Generates a synthetic corpus (2,000 agents by default), parses it once, and
+lints every document with the three built-in rules plus --extra synthetic
+rules of four keywords each (default: 0, 25, 100 and 200 extra rules):
+
+    per rule     every rule scans customInstructions for its own keywords,
+                 as validate-agents.py did before agent_lint
+    lint engine  agent_lint.LintEngine, one Scanner pass per text for all
+                 enabled rules
+
+Both variants must report the same warnings for every document; the benchmark
+exits 1 if they do not.
+
+Usage:
+    python tools/benchmarks/bench-lint-rules.py
+    python tools/benchmarks/bench-lint-rules.py --count 2000 --extra 0 50 200 --repeat 5
+"""
+
+import sys
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from bench_common import best_of, load_tool
+
+from agent_registry import parse_yaml_file
+import agent_lint
+
+WORDS = ['legacy', 'deprecated', 'handoff', 'escalate', 'rollback', 'quota', 'sandbox', 'webhook',
+         'fallback', 'throttle', 'tenant', 'archive', 'shard', 'replica', 'migration', 'snapshot']
+
+def register_extra_rules(count: int, rng: random.Random) -> List[str]:
+    """Register count synthetic rules that warn when any of their keywords occur."""
+    names = []
+    for index in range(count):
+        name = f"bench_extra_{index}"
+        if name not in agent_lint.RULES:
+            keywords = [f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{index}-{k}" for k in range(4)]
+
+            def check(mode: Dict, text: str, found: Set[str], keywords=keywords) -> Optional[str]:
+                if not found.isdisjoint(keywords):
+                    return f"Agent '{mode.get('slug')}' uses a flagged term"
+                return None
+
+            agent_lint.rule(name, keywords=keywords)(check)
+        names.append(name)
+    return names
+
+def per_rule_lint(document: Dict, agent_file: str, rules: List[agent_lint.LintRule]) -> List[str]:
+    """The pre-engine approach: each rule runs its own substring scans over each mode."""
+    warnings = []
+    for lint_rule in rules:
+        if lint_rule.applies is not None and not lint_rule.applies(agent_file):
+            continue
+        for mode in document['customModes']:
+            text = mode.get('customInstructions', '')
+            found = {keyword for keyword in lint_rule.keywords if keyword in text}
+            message = lint_rule.check(mode, text, found)
+            if message:
+                warnings.append(agent_lint.SEVERITIES['warning'] + message)
+    return warnings
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the shared lint scan against per-rule scans')
+    parser.add_argument('--count', type=int, default=2000, help='Agents in the corpus (default: 2000)')
+    parser.add_argument('--extra', type=int, nargs='+', default=[0, 25, 100, 200],
+                        help='Synthetic rules added to the built-in ones (default: 0 25 100 200)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per variant, best is reported (default: 3)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    generator = load_tool('generate-synthetic-corpus.py')
+    rng = random.Random(args.seed)
+    extra_names = register_extra_rules(max(args.extra), rng)
+    with tempfile.TemporaryDirectory(prefix='agent-bench-') as tmp:
+        files = generator.generate_corpus(Path(tmp) / 'agents', args.count, seed=args.seed)
+        documents: List[Any] = [(parse_yaml_file(path), str(path)) for path in files]
+
+    # Plant some extra-rule keywords so both variants have warnings to agree on
+    all_keywords = [keyword for name in extra_names for keyword in agent_lint.RULES[name].keywords]
+    for document, _ in documents:
+        if all_keywords and rng.random() < 0.2:
+            mode = document['customModes'][0]
+            mode['customInstructions'] += f"\nAvoid {rng.choice(all_keywords)} here."
+
+    builtin = ['communication_protocol', 'signal_framework', 'instruction_layout']
+    print(f"{len(documents)} documents, {sum(len(d['customModes'][0].get('customInstructions', '')) for d, _ in documents) // len(documents)} chars of customInstructions each on average\n")
+    print(f"{'rules':>5} {'keywords':>8} {'per rule':>11} {'lint engine':>12} {'speedup':>8}")
+    mismatches = 0
+    for extra in args.extra:
+        names = builtin + extra_names[:extra]
+        rules = [agent_lint.RULES[name] for name in names]
+        engine = agent_lint.LintEngine(only=names)
+
+        def run_per_rule() -> List[List[str]]:
+            return [per_rule_lint(document, agent_file, rules) for document, agent_file in documents]
+
+        def run_engine() -> List[List[str]]:
+            return [engine.check_document(document, agent_file)[1] for document, agent_file in documents]
+
+        mismatches += sum(1 for a, b in zip(run_per_rule(), run_engine()) if a != b)
+        per_rule = best_of(run_per_rule, args.repeat)
+        shared = best_of(run_engine, args.repeat)
+        keywords = sum(len(lint_rule.keywords) for lint_rule in rules)
+        print(f"{len(names):>5} {keywords:>8} {per_rule * 1000:>8.1f} ms {shared * 1000:>9.1f} ms {per_rule / shared:>7.1f}x")
+
+    print(f"\nDisagreements: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == '__main__':
+    main()
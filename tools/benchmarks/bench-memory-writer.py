@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent project_memory writers, direct per-row commits vs the write queue
+
+Starts --clients concurrent writers, each recording --writes upserts to paths
+drawn from a shared pool of --paths files, and waiting for each write to be
+committed before sending the next (as an agent recording its changes does):
+
+    direct   every writer commits each row itself with the scribe's
+             SELECT + UPDATE/INSERT and sqlite3's default 5 s busy timeout,
+             either on one long-lived connection or opening memory.db for
+             every write as a scribe invocation does; writes that still hit
+             SQLITE_BUSY, or whose INSERT loses the race after the SELECT
+             found no row, are counted as failed
+    queue    every writer sends its upserts to tools/memory_writer.py,
+             started as a separate process on a temporary unix socket
+
+and reports sustained writes/s, per-write latency percentiles and failures,
+plus the queue's group-commit and coalescing counters. Every database lives
+in a temporary directory.
+
+Usage:
+    python tools/benchmarks/bench-memory-writer.py
+    python tools/benchmarks/bench-memory-writer.py --clients 32 --writes 500 --paths 2000
+"""
+
+import sys
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from bench_common import TOOLS_DIR
+from project_memory import ProjectMemoryStore, utc_timestamp
+from memory_writer import MemoryWriterClient
+
+def make_record(rng: random.Random, paths: int, client: int, n: int) -> Dict:
+    return {
+        'file_path': f"src/module_{rng.randrange(paths) // 50}/file_{rng.randrange(paths)}.py",
+        'memory_type': 'code',
+        'signal_type': 'coding_complete',
+        'signal_category': 'state',
+        'brief_description': f"Write {n} from client {client}",
+        'elements_description': f"def handle_{n}()",
+        'rationale': 'Recorded by benchmark'
+    }
+
+def direct_write(conn: sqlite3.Connection, record: Dict) -> None:
+    """The scribe's pattern: SELECT, then UPDATE or INSERT, committed per row."""
+    timestamp = utc_timestamp()
+    row = conn.execute('SELECT version FROM project_memory WHERE file_path = ?', (record['file_path'],)).fetchone()
+    if row is None:
+        conn.execute(
+            'INSERT INTO project_memory (file_path, status, memory_type, signal_type, signal_category, '
+            'brief_description, elements_description, rationale, version, timestamp) '
+            "VALUES (?, 'active', ?, ?, ?, ?, ?, ?, 1, ?)",
+            (record['file_path'], record['memory_type'], record['signal_type'], record['signal_category'],
+             record['brief_description'], record['elements_description'], record['rationale'], timestamp)
+        )
+    else:
+        conn.execute(
+            "UPDATE project_memory SET status = 'active', signal_type = ?, signal_category = ?, "
+            'brief_description = ?, version = ?, timestamp = ? WHERE file_path = ?',
+            (record['signal_type'], record['signal_category'], record['brief_description'],
+             row[0] + 1, timestamp, record['file_path'])
+        )
+    conn.commit()
+
+def run_clients(args, make_writer: Callable[[], tuple]) -> Dict:
+    """Run args.clients writer threads; make_writer() returns (write, close) for one client."""
+    latencies: List[List[float]] = [[] for _ in range(args.clients)]
+    failures = [0] * args.clients
+    barrier = threading.Barrier(args.clients + 1)
+
+    def client(index: int) -> None:
+        rng = random.Random(args.seed * 1000 + index)
+        write, close = make_writer()
+        barrier.wait()
+        for n in range(args.writes):
+            record = make_record(rng, args.paths, index, n)
+            started = time.perf_counter()
+            ok = write(record)
+            latencies[index].append(time.perf_counter() - started)
+            if not ok:
+                failures[index] += 1
+        close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+
+    samples = sorted(latency for per_client in latencies for latency in per_client)
+    total = len(samples)
+    return {
+        'writes': total,
+        'failed': sum(failures),
+        'seconds': seconds,
+        'per_second': (total - sum(failures)) / seconds,
+        'p50_ms': samples[total // 2] * 1000,
+        'p99_ms': samples[min(total - 1, int(total * 0.99))] * 1000
+    }
+
+def direct_writer(db_path: Path) -> tuple:
+    conn = sqlite3.connect(str(db_path))
+
+    def write(record: Dict) -> bool:
+        try:
+            direct_write(conn, record)
+            return True
+        except sqlite3.Error:
+            conn.rollback()
+            return False
+    return write, conn.close
+
+def reconnecting_writer(db_path: Path) -> tuple:
+    def write(record: Dict) -> bool:
+        conn = sqlite3.connect(str(db_path))
+        try:
+            direct_write(conn, record)
+            return True
+        except sqlite3.Error:
+            return False
+        finally:
+            conn.close()
+    return write, lambda: None
+
+def queue_writer(socket_path: Path) -> tuple:
+    client = MemoryWriterClient(socket_path)
+    return (lambda record: client.upsert(record)['ok']), client.close
+
+def start_service(db_path: Path, socket_path: Path, args) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, str(TOOLS_DIR / 'memory_writer.py'), '--socket', str(socket_path), 'serve',
+         '--db', str(db_path), '--batch-size', str(args.batch_size), '--max-delay-ms', str(args.max_delay_ms)],
+        stdout=subprocess.PIPE, text=True
+    )
+    process.stdout.readline()  # {"listening": ...} once the socket accepts connections
+    return process
+
+def report(label: str, result: Dict) -> None:
+    print(f"{label:<24} {result['writes']:>7} writes  {result['seconds']:7.2f} s  "
+          f"{result['per_second']:>9,.0f} writes/s  p50 {result['p50_ms']:7.2f} ms  "
+          f"p99 {result['p99_ms']:8.2f} ms  failed {result['failed']}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent project_memory writers')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent writers (default: 16)')
+    parser.add_argument('--writes', type=int, default=300, help='Writes per client (default: 300)')
+    parser.add_argument('--paths', type=int, default=5000, help='Distinct file paths written (default: 5000)')
+    parser.add_argument('--batch-size', type=int, default=256, help='Queue group-commit size (default: 256)')
+    parser.add_argument('--max-delay-ms', type=float, default=0.0, help='Queue group-commit delay (default: 0)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        direct_db = Path(tmp) / 'direct.db'
+        ProjectMemoryStore(direct_db).close()
+        direct = run_clients(args, lambda: direct_writer(direct_db))
+        reconnect_db = Path(tmp) / 'reconnect.db'
+        ProjectMemoryStore(reconnect_db).close()
+        reconnect = run_clients(args, lambda: reconnecting_writer(reconnect_db))
+
+        queue_db = Path(tmp) / 'queue.db'
+        socket_path = Path(tmp) / 'memory-writer.sock'
+        service = start_service(queue_db, socket_path, args)
+        try:
+            queued = run_clients(args, lambda: queue_writer(socket_path))
+            with MemoryWriterClient(socket_path) as client:
+                stats = client.request({'op': 'stats'})
+        finally:
+            service.terminate()
+            service.wait()
+
+    print(f"{args.clients} clients x {args.writes} writes over {args.paths} paths\n")
+    report('Direct, one connection', direct)
+    report('Direct, open per write', reconnect)
+    report('Write queue', queued)
+    print(f"\nThroughput vs one connection:   {queued['per_second'] / direct['per_second']:6.1f}x")
+    print(f"Throughput vs open per write:   {queued['per_second'] / reconnect['per_second']:6.1f}x")
+    print(f"Group commits:                  {stats['batches']} batches, "
+          f"{stats['paths_committed'] / max(1, stats['batches']):.1f} paths per commit, "
+          f"{stats['coalesced']} writes coalesced")
+
+if __name__ == '__main__':
+    main()
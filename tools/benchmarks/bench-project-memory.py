@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batched project_memory upserts vs the scribe's per-file SQL
+
+The state scribe records each changed file with its own SELECT followed by an
+UPDATE or INSERT, committed one file at a time. This benchmark times that
+pattern on a sample of records and compares it with
+ProjectMemoryStore.upsert_many() inserting and then re-upserting (version
+bump) the full record set, plus a batched soft delete, each in a single
+transaction. Every database lives in a temporary directory.
+
+Usage:
+    python tools/benchmarks/bench-project-memory.py
+    python tools/benchmarks/bench-project-memory.py --records 100000 --per-file-sample 5000
+"""
+
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from bench_common import TOOLS_DIR  # noqa: F401  (puts tools/ on sys.path)
+from project_memory import ProjectMemoryStore, utc_timestamp
+
+SIGNALS = [
+    ('state', 'coding_complete'),
+    ('state', 'test_plan_complete'),
+    ('need', 'coding_needed_for_feature'),
+    ('problem', 'critical_bug_in_feature'),
+    ('dependency', 'feature_ready_for_coding'),
+    ('state', 'state_update_generic')
+]
+
+def build_records(count: int, seed: int) -> List[Dict]:
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        category, signal_type = rng.choice(SIGNALS)
+        records.append({
+            'file_path': f"src/module_{i // 100}/file_{i}.py",
+            'memory_type': 'code',
+            'signal_type': signal_type,
+            'signal_category': category,
+            'brief_description': f"Implements component {i}",
+            'elements_description': f"class Component{i}, def handle_{i}()",
+            'rationale': 'Recorded by benchmark'
+        })
+    return records
+
+def per_file_upserts(db_path: Path, records: List[Dict]) -> None:
+    """The scribe's pattern: SELECT, then UPDATE or INSERT, one commit per file."""
+    conn = sqlite3.connect(str(db_path))
+    for record in records:
+        timestamp = utc_timestamp()
+        row = conn.execute(
+            'SELECT version FROM project_memory WHERE file_path = ?', (record['file_path'],)
+        ).fetchone()
+        if row is None:
+            conn.execute(
+                'INSERT INTO project_memory (file_path, status, memory_type, signal_type, signal_category, '
+                'brief_description, elements_description, rationale, version, timestamp) '
+                "VALUES (?, 'active', ?, ?, ?, ?, ?, ?, 1, ?)",
+                (record['file_path'], record['memory_type'], record['signal_type'], record['signal_category'],
+                 record['brief_description'], record['elements_description'], record['rationale'], timestamp)
+            )
+        else:
+            conn.execute(
+                "UPDATE project_memory SET status = 'active', signal_type = ?, signal_category = ?, "
+                'brief_description = ?, version = ?, timestamp = ? WHERE file_path = ?',
+                (record['signal_type'], record['signal_category'], record['brief_description'],
+                 row[0] + 1, timestamp, record['file_path'])
+            )
+        conn.commit()
+    conn.close()
+
+def timed(func) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+def report(label: str, count: int, seconds: float) -> None:
+    print(f"{label:<30} {count:>8} records  {seconds * 1000:9.1f} ms  ({count / seconds:>10,.0f} records/s)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark project_memory write throughput')
+    parser.add_argument('--records', type=int, default=100000, help='Records for batched runs (default: 100000)')
+    parser.add_argument('--per-file-sample', type=int, default=5000,
+                        help='Records for the per-file baseline, which is much slower (default: 5000)')
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    records = build_records(args.records, args.seed)
+    sample = records[:args.per_file_sample]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline_db = Path(tmp) / 'baseline.db'
+        ProjectMemoryStore(baseline_db).close()
+        baseline_insert = timed(lambda: per_file_upserts(baseline_db, sample))
+        baseline_update = timed(lambda: per_file_upserts(baseline_db, sample))
+
+        store = ProjectMemoryStore(Path(tmp) / 'memory.db')
+        counts: Dict[str, Dict[str, int]] = {}
+        batch_insert = timed(lambda: counts.update(insert=store.upsert_many(records)))
+        batch_update = timed(lambda: counts.update(update=store.upsert_many(records)))
+        deleted_paths = [record['file_path'] for record in records[::10]]
+        batch_delete = timed(lambda: counts.update(delete={'deleted': store.soft_delete_many(deleted_paths)}))
+        versions = store.conn.execute('SELECT MIN(version), MAX(version) FROM project_memory').fetchone()
+        stats = store.stats()
+        store.close()
+
+    report('Per-file insert (baseline)', len(sample), baseline_insert)
+    report('Per-file update (baseline)', len(sample), baseline_update)
+    report('upsert_many insert', len(records), batch_insert)
+    report('upsert_many update', len(records), batch_update)
+    report('soft_delete_many', len(deleted_paths), batch_delete)
+    print(f"\nInsert speedup:  {(len(records) / batch_insert) / (len(sample) / baseline_insert):8.1f}x")
+    print(f"Update speedup:  {(len(records) / batch_update) / (len(sample) / baseline_update):8.1f}x")
+    print(f"Counts:          {counts}")
+    print(f"Versions:        {versions[0]}..{versions[1]}, by status {stats['by_status']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: generated fast-path schema validation vs jsonschema
+
+Generates a synthetic corpus (10,000 agents by default), parses it once, and
+times schema validation of every document as validate-agents.py does it:
+
+    jsonschema   best_match(Draft7Validator.iter_errors(document))
+    fast path    the validator generated by schema_codegen, falling back to
+                 jsonschema for the documents it rejects
+
+--invalid-rate breaks that share of documents (bad slug, duplicate group,
+short instructions, unknown key) so the fallback cost shows up too. Both
+paths must agree on every document; the benchmark exits 1 if they do not.
+Also reports generating and compiling the validator, which every run does
+once.
+
+Usage:
+    python tools/benchmarks/bench-schema-validator.py
+    python tools/benchmarks/bench-schema-validator.py --count 10000 --invalid-rate 0.05 --repeat 5
+"""
+
+import sys
+import copy
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Any, List
+
+from bench_common import PROJECT_ROOT, best_of, load_tool
+
+from agent_registry import parse_yaml_file
+import schema_codegen
+
+def break_document(document: dict, rng: random.Random) -> dict:
+    """A copy of document with one schema violation."""
+    broken = copy.deepcopy(document)
+    mode = broken['customModes'][0]
+    kind = rng.randrange(4)
+    if kind == 0:
+        mode['slug'] = mode['slug'].replace('-', '_').upper()
+    elif kind == 1:
+        mode['groups'] = mode['groups'] + mode['groups'][:1]
+    elif kind == 2:
+        mode['customInstructions'] = 'Too short.'
+    else:
+        mode['owner'] = 'unknown'
+    return broken
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the generated fast-path schema validator')
+    parser.add_argument('--count', type=int, default=10000, help='Agents in the corpus (default: 10000)')
+    parser.add_argument('--invalid-rate', type=float, default=0.01, help='Share of invalid documents (default: 0.01)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per variant, best is reported (default: 3)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    generator = load_tool('generate-synthetic-corpus.py')
+    validator_tool = load_tool('validate-agents.py')
+    from jsonschema.exceptions import best_match
+
+    schema = validator_tool.load_schema(PROJECT_ROOT / 'schemas' / 'agent-mode-schema.json')
+    validator = validator_tool.compile_validator(schema)
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory(prefix='agent-bench-') as tmp:
+        files = generator.generate_corpus(Path(tmp) / 'agents', args.count, seed=args.seed)
+        documents: List[Any] = [parse_yaml_file(path) for path in files]
+        documents = [
+            break_document(document, rng) if rng.random() < args.invalid_rate else document
+            for document in documents
+        ]
+
+    started = time.perf_counter()
+    fast = schema_codegen.load_fast_validator(schema)
+    generate = time.perf_counter() - started
+
+    def jsonschema_errors() -> List[Any]:
+        return [best_match(validator.iter_errors(document)) for document in documents]
+
+    def fast_path_errors() -> List[Any]:
+        return [None if fast(document) else best_match(validator.iter_errors(document)) for document in documents]
+
+    expected = [error is None for error in jsonschema_errors()]
+    actual = [error is None for error in fast_path_errors()]
+    mismatches = sum(1 for a, b in zip(expected, actual) if a != b)
+    fallbacks = sum(1 for document in documents if not fast(document))
+
+    variants: List[tuple] = [('jsonschema', jsonschema_errors), ('fast path + fallback', fast_path_errors)]
+    timings = {label: best_of(func, args.repeat) for label, func in variants}
+
+    print(f"{len(documents)} documents, {expected.count(False)} invalid, {fallbacks} fell back to jsonschema\n")
+    for label, seconds in timings.items():
+        print(f"{label:<22} {seconds * 1000:9.1f} ms  {len(documents) / seconds:>11,.0f} docs/s")
+    print(f"\nSpeedup:               {timings['jsonschema'] / timings['fast path + fallback']:9.1f}x")
+    print(f"Generate + compile:    {generate * 1000:9.2f} ms (once per run)")
+    print(f"Disagreements:         {mismatches:9d}")
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: agentctl startup time against a fixed budget
+
+Runs each command below --repeat times in a fresh interpreter and compares the
+median wall time with its budget:
+
+    help       agentctl --help
+    validate   agentctl validate with every agent answered from the
+               validation cache (one warm-up run fills it first)
+
+Each command is also run once under -X importtime; importing any of the heavy
+dependencies the tools load lazily (jsonschema, graphviz, PyYAML, the process
+pool) fails the check regardless of timing. Exit code 1 when a command is over
+budget or imports a forbidden module, so the script can gate CI.
+
+Usage:
+    python tools/benchmarks/bench-startup.py
+    python tools/benchmarks/bench-startup.py --repeat 21 --help-budget-ms 80 --validate-budget-ms 120
+"""
+
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Set
+
+from bench_common import PROJECT_ROOT, TOOLS_DIR
+
+AGENTCTL = str(TOOLS_DIR / 'agentctl.py')
+
+COMMANDS = {
+    'help': ['--help'],
+    'validate': ['validate'],
+}
+
+# Budgets leave room for slower CI machines; a lazy import going eager costs more than the slack
+DEFAULT_BUDGETS_MS = {'help': 100.0, 'validate': 150.0}
+
+# Modules that must stay out of these commands' startup
+FORBIDDEN_MODULES = {'jsonschema', 'graphviz', 'yaml', 'concurrent.futures.process'}
+
+def run_once(args: List[str]) -> float:
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, AGENTCTL] + args,
+        cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return time.perf_counter() - started
+
+def imported_modules(args: List[str]) -> Set[str]:
+    """Module names a command imports, from -X importtime's stderr report."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', AGENTCTL] + args,
+        cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and line.count('|') == 2:
+            modules.add(line.rsplit('|', 1)[1].strip())
+    return modules
+
+def interpreter_startup() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'pass'])
+    return time.perf_counter() - started
+
+def check(name: str, args: List[str], budget_ms: float, repeat: int) -> Dict:
+    median_ms = statistics.median(run_once(args) for _ in range(repeat)) * 1000
+    modules = imported_modules(args)
+    forbidden = sorted(
+        module for module in modules
+        if any(module == banned or module.startswith(banned + '.') for banned in FORBIDDEN_MODULES)
+    )
+    return {
+        'command': name,
+        'median_ms': median_ms,
+        'budget_ms': budget_ms,
+        'forbidden': forbidden,
+        'ok': median_ms <= budget_ms and not forbidden
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Check agentctl startup time against a budget')
+    parser.add_argument('--repeat', type=int, default=11, help='Runs per command, median is compared (default: 11)')
+    parser.add_argument('--help-budget-ms', type=float, default=DEFAULT_BUDGETS_MS['help'],
+                        help=f"Budget for agentctl --help (default: {DEFAULT_BUDGETS_MS['help']:.0f})")
+    parser.add_argument('--validate-budget-ms', type=float, default=DEFAULT_BUDGETS_MS['validate'],
+                        help=f"Budget for a cached agentctl validate (default: {DEFAULT_BUDGETS_MS['validate']:.0f})")
+    args = parser.parse_args()
+    budgets = {'help': args.help_budget_ms, 'validate': args.validate_budget_ms}
+
+    # Fill the validation cache so the timed runs are no-ops
+    run_once(COMMANDS['validate'])
+
+    baseline_ms = statistics.median(interpreter_startup() for _ in range(args.repeat)) * 1000
+    print(f"Bare interpreter startup: {baseline_ms:6.1f} ms\n")
+
+    failed = False
+    for name, command_args in COMMANDS.items():
+        result = check(name, command_args, budgets[name], args.repeat)
+        status = 'ok' if result['ok'] else 'FAIL'
+        print(f"agentctl {name:<10} {result['median_ms']:7.1f} ms  budget {result['budget_ms']:6.0f} ms  {status}")
+        if result['forbidden']:
+            print(f"    imports lazily loaded modules: {', '.join(result['forbidden'])}")
+        failed = failed or not result['ok']
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming routing-header trace analysis
+
+Writes synthetic JSONL transcripts of each --sizes record count, walking the
+real delegation graph from uber-orchestrator: every agent delegates to a few
+of the agents it declares, some delegations are retried, a share of records
+are dispatch records (always, when the target is already in the delegation
+chain) or tool output without a header, and several tasks are interleaved in one file. The generator keeps the true spans, so the benchmark
+checks that trace_analyzer rebuilds every span per edge and that its
+histogram percentiles stay within 1% of the exact ones (exit 1 otherwise).
+
+Each size reports records/s analyzed in-process and the peak RSS of a fresh
+`trace_analyzer.py --json` run on the file (from /proc, so Linux only), which
+should stay flat as the file grows.
+
+Usage:
+    python tools/benchmarks/bench-trace-analyzer.py
+    python tools/benchmarks/bench-trace-analyzer.py --sizes 100000,1000000 --concurrency 16
+"""
+
+import sys
+import json
+import math
+import heapq
+import random
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from bench_common import PROJECT_ROOT, TOOLS_DIR, best_of
+
+from agent_graph import analyze_agents
+import trace_analyzer
+
+MAX_DEPTH = 3
+FILLER = ('Completed the assigned work and recorded the outcome in the memory bank. '
+          'All tests pass and the summary lists the files that changed. ') * 3
+
+def generate_task(successors: Dict[str, List[str]], rng: random.Random, task_id: str, start: float,
+                  spans: Dict[Tuple[str, str], List[float]]) -> List[Tuple[float, int, str]]:
+    """Records (time, sequence, JSON line) of one task; true spans are appended to spans per edge."""
+    records: List[Tuple[float, int, str]] = []
+    active: List[str] = []  # the delegation chain holding control
+    clock = start
+
+    def emit(timestamp: float, text: str, kind: str) -> None:
+        record = {'task_id': task_id, 'timestamp': round(timestamp, 3), 'type': kind, 'text': text}
+        records.append((timestamp, len(records), json.dumps(record)))
+
+    def run(agent: str, depth: int) -> None:
+        nonlocal clock
+        targets = successors.get(agent, []) if depth < MAX_DEPTH else []
+        active.append(agent)
+        if not targets or rng.random() < 0.3:
+            clock += rng.lognormvariate(math.log(60), 0.8)  # the agent's own work
+            if rng.random() < 0.5:
+                emit(clock, f"Tool output for {agent}: 12 files read", 'tool')
+            active.pop()
+            return
+        for target in rng.sample(targets, min(len(targets), rng.randint(1, 3))):
+            for _ in range(1 + (rng.random() < 0.15) + (rng.random() < 0.05)):
+                dispatched = round(clock, 3)
+                # Delegating to an agent already in the chain is only unambiguous with a dispatch record
+                if target in active or rng.random() < 0.3:
+                    emit(dispatched, f"To: {target}, From: {agent}\nPlease handle the next step.", 'new_task')
+                run(target, depth + 1)
+                clock = round(clock + rng.uniform(0.5, 5.0), 3)
+                emit(clock, f"To: {agent}, From: {target}\n{FILLER}", 'completion_result')
+                spans.setdefault((agent, target), []).append(clock - dispatched)
+        active.pop()
+
+    emit(clock, 'Build the SPARC plan for the project.', 'user')
+    run('uber-orchestrator', 0)
+    return records
+
+def write_transcript(path: Path, size: int, successors: Dict[str, List[str]], concurrency: int,
+                     seed: int) -> Tuple[int, Dict[Tuple[str, str], List[float]]]:
+    """Write about size records, concurrency tasks interleaved at a time; returns (records, true spans)."""
+    rng = random.Random(seed)
+    spans: Dict[Tuple[str, str], List[float]] = {}
+    written = 0
+    task_number = 0
+    start = 1_700_000_000.0
+    with open(path, 'w', encoding='utf-8') as f:
+        while written < size:
+            batch = []
+            for _ in range(concurrency):
+                batch.append(generate_task(successors, rng, f"task-{task_number}", start + rng.uniform(0, 60), spans))
+                task_number += 1
+            for _, _, line in heapq.merge(*batch):
+                f.write(line + '\n')
+                written += 1
+            start = max(record[0] for records in batch for record in records) + 1
+    return written, spans
+
+def exact_percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+# Runs the analyzer as __main__, then reports the process's own peak RSS. VmHWM
+# is reset by exec, unlike ru_maxrss, which would include this benchmark's
+# memory copied into the forked child.
+PEAK_RSS_WRAPPER = """
+import sys, runpy
+sys.argv = sys.argv[1:]
+try:
+    runpy.run_path(sys.argv[0], run_name='__main__')
+finally:
+    with open('/proc/self/status') as status:
+        print(next(line.split()[1] for line in status if line.startswith('VmHWM:')), file=sys.stderr)
+"""
+
+def peak_rss_mb(path: Path) -> float:
+    """Peak RSS of a fresh trace_analyzer.py run over path (Linux)."""
+    result = subprocess.run(
+        [sys.executable, '-c', PEAK_RSS_WRAPPER, str(TOOLS_DIR / 'trace_analyzer.py'), '--json', str(path)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    return int(result.stderr.split()[-1]) / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the streaming routing-header trace analyzer')
+    parser.add_argument('--sizes', type=lambda value: [int(size) for size in value.split(',')],
+                        default=[20000, 200000], help='Comma-separated transcript sizes in records (default: 20000,200000)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Tasks interleaved in the file (default: 8)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per size, best is reported (default: 3)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    graph = analyze_agents(PROJECT_ROOT / 'agents', verbose=False)
+    successors: Dict[str, List[str]] = {}
+    for from_slug, to_slug, _ in graph.edges:
+        successors.setdefault(from_slug, []).append(to_slug)
+    for targets in successors.values():
+        targets.sort()
+
+    failed = False
+    print(f"{'Records':>9} {'Spans':>8} {'Analyze':>10} {'Records/s':>11} {'Peak RSS':>9} {'Max p50/p99 error':>18}")
+    with tempfile.TemporaryDirectory(prefix='trace-bench-') as tmp:
+        for size in args.sizes:
+            path = Path(tmp) / f"transcript-{size}.jsonl"
+            written, spans = write_transcript(path, size, successors, args.concurrency, args.seed)
+
+            def analyze() -> trace_analyzer.TraceAnalyzer:
+                analyzer = trace_analyzer.TraceAnalyzer()
+                trace_analyzer.analyze_source(str(path), analyzer)
+                analyzer.finish()
+                return analyzer
+
+            seconds = best_of(analyze, args.repeat)
+            analyzer = analyze()
+            worst = 0.0
+            for edge, durations in spans.items():
+                histogram = analyzer.edges.get(edge)
+                if histogram is None or histogram.count != len(durations):
+                    print(f"    {edge[0]} -> {edge[1]}: {len(durations)} spans, "
+                          f"{histogram.count if histogram else 0} rebuilt")
+                    failed = True
+                    continue
+                for fraction, estimate in zip((0.5, 0.99), histogram.percentiles((0.5, 0.99))):
+                    exact = exact_percentile(durations, fraction)
+                    worst = max(worst, abs(estimate - exact) / exact)
+            failed = failed or worst > 0.01 or len(analyzer.edges) != len(spans)
+            total_spans = sum(len(durations) for durations in spans.values())
+            print(f"{written:>9} {total_spans:>8} {seconds * 1000:>7.0f} ms {written / seconds:>11,.0f} "
+                  f"{peak_rss_mb(path):>6.1f} MB {worst * 100:>17.2f}%")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
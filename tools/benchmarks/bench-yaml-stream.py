@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming customModes reader vs yaml.safe_load
+
+Generates a synthetic corpus (2,000 agents by default) and writes it as one
+merged custom_modes.yaml whose modes share anchored defaults through merge
+keys: single merges (<<: *a), sequence merges (<<: [*a, *b]), repeated merge
+keys and explicit keys that override merged ones. Times reading the modes:
+
+    load      parse_yaml_file() of the whole file, with the libyaml loader
+              when available, as validate-agents.py does without --stream
+    stream    yaml_stream.iter_sequence_items(), one mode at a time
+
+and reports the peak traced memory of each. Every streamed mode must equal
+what yaml.safe_load() gives for it, key order included; the benchmark exits 1
+if any differs.
+
+Usage:
+    python tools/benchmarks/bench-yaml-stream.py
+    python tools/benchmarks/bench-yaml-stream.py --count 10000 --repeat 5
+"""
+
+import sys
+import random
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, List
+
+import yaml
+
+from bench_common import best_of, load_tool
+
+from agent_registry import parse_yaml_file
+from yaml_stream import iter_sequence_items
+
+# Anchored defaults; several share keys so merge order decides the value
+DEFAULTS = {
+    'edit': {'groups': ['read', 'edit'], 'source': 'project'},
+    'command': {'groups': ['read', 'command'], 'source': 'global'},
+    'mcp': {'groups': ['read', 'mcp'], 'source': 'project'}
+}
+
+def merge_prefix(rng: random.Random) -> List[str]:
+    """Merge-key lines for one mode: a single, sequence or repeated merge."""
+    names = rng.sample(sorted(DEFAULTS), rng.randint(1, 3))
+    kind = rng.randrange(3)
+    if kind == 0 or len(names) == 1:
+        return [f"<<: *{names[0]}"]
+    if kind == 1:
+        return ['<<: [' + ', '.join(f"*{name}" for name in names) + ']']
+    return [f"<<: *{name}" for name in names]
+
+def write_merged_file(path: Path, modes: List[dict], rng: random.Random) -> None:
+    """Write modes as a custom_modes.yaml that takes groups and source from merges."""
+    lines = ['defaults:']
+    for name, values in DEFAULTS.items():
+        lines.append(f"  {name}: &{name}")
+        lines.extend('    ' + line for line in yaml.safe_dump(values, sort_keys=False).splitlines())
+    lines.append('customModes:')
+    for mode in modes:
+        explicit = {key: value for key, value in mode.items() if key not in ('groups', 'source')}
+        if rng.random() < 0.2:
+            explicit['source'] = mode.get('source', 'project')  # overrides the merged value
+        body = merge_prefix(rng) + yaml.safe_dump(explicit, sort_keys=False, allow_unicode=True,
+                                                   width=float('inf')).splitlines()
+        lines.append('  - ' + body[0])
+        lines.extend('    ' + line for line in body[1:])
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+def peak_mb(func: Callable[[], object]) -> float:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the streaming customModes reader against safe_load')
+    parser.add_argument('--count', type=int, default=2000, help='Agents in the merged file (default: 2000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per variant, best is reported (default: 3)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    generator = load_tool('generate-synthetic-corpus.py')
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory(prefix='stream-bench-') as tmp:
+        files = generator.generate_corpus(Path(tmp) / 'agents', args.count, seed=args.seed)
+        modes = [mode for path in files for mode in parse_yaml_file(path)['customModes']]
+        merged_path = Path(tmp) / 'custom_modes.yaml'
+        write_merged_file(merged_path, modes, rng)
+
+        def run_load() -> Any:
+            return parse_yaml_file(merged_path)['customModes']
+
+        def run_stream() -> None:
+            for _ in iter_sequence_items(merged_path, 'customModes'):
+                pass
+
+        with open(merged_path, 'rb') as f:
+            expected = yaml.safe_load(f)['customModes']
+        streamed = [mode for _, _, mode in iter_sequence_items(merged_path, 'customModes')]
+        mismatches = sum(1 for a, b in zip(expected, streamed) if list(a.items()) != list(b.items()))
+        mismatches += abs(len(expected) - len(streamed))
+
+        size_mb = merged_path.stat().st_size / (1024 * 1024)
+        print(f"{len(expected)} modes, {size_mb:.1f} MB merged file\n")
+        print(f"{'variant':>7} {'time':>10} {'peak memory':>12}")
+        for name, func in (('load', run_load), ('stream', run_stream)):
+            seconds = best_of(func, args.repeat)
+            print(f"{name:>7} {seconds * 1000:>7.0f} ms {peak_mb(func):>9.1f} MB")
+
+    print(f"\nDisagreements: {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Shared helpers for the tools/ benchmark scripts.
+
+The CLI tools are hyphenated scripts rather than importable modules, so
+benchmarks load them by file path with load_tool().
+"""
+
+import sys
+import time
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, List
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent
+PROJECT_ROOT = TOOLS_DIR.parent
+
+# Tools import their shared modules (agent_registry, ...) from tools/
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+_loaded: Dict[str, ModuleType] = {}
+
+def load_tool(script_name: str) -> ModuleType:
+    """Import a tools/ script such as 'generate-dependency-graph.py' as a module."""
+    if script_name not in _loaded:
+        path = TOOLS_DIR / script_name
+        module_name = path.stem.replace('-', '_')
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _loaded[script_name] = module
+    return _loaded[script_name]
+
+def best_of(func: Callable[[], object], repeat: int = 5) -> float:
+    """Run func repeat times and return the fastest wall time in seconds."""
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: how the tools/ scripts scale with corpus size
+
+For each scale, generates a synthetic corpus with generate-synthetic-corpus.py
+in a temporary directory and times every stage the tools run:
+
+    load              parse every agent file (libyaml when available)
+    load_snapshot     warm AgentRegistry refresh from its snapshot
+    schema            Draft-7 validation of every document
+    custom_checks     the lint rules of schemas/lint-rules.json (communication
+                      protocol, Signal Framework, long lines), as lint_agent()
+                      runs them in validate-agents.py
+    delegations       DelegationMatcher over every customInstructions
+    merge             full merge-agents.py run (--force)
+    merge_noop        incremental merge with nothing changed
+    mermaid           graph build plus Mermaid emission
+
+Each stage reports the best of --repeat runs. Results can be saved as a JSON
+baseline and compared against one from another commit; a stage that got slower
+than --threshold times its baseline is a regression and the exit code is 1.
+
+Usage:
+    python tools/benchmarks/run-benchmarks.py --scales 1000,10000
+    python tools/benchmarks/run-benchmarks.py --save .cache/benchmarks/baseline.json
+    python tools/benchmarks/run-benchmarks.py --compare .cache/benchmarks/baseline.json --threshold 1.25
+"""
+
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from pathlib import Path
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List
+
+from bench_common import PROJECT_ROOT, best_of, load_tool
+
+from agent_graph import DelegationMatcher, analyze_agents
+from agent_registry import AgentRegistry, parse_yaml_file
+
+# Bump when stages are added or change meaning; baselines from other versions are not compared
+SUITE_VERSION = 1
+
+STAGES = ['load', 'load_snapshot', 'schema', 'custom_checks', 'delegations', 'merge', 'merge_noop', 'mermaid']
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def quietly(func: Callable[[], object]) -> Callable[[], object]:
+    """Wrap func so the tools' progress output does not flood the report."""
+    def run():
+        with redirect_stdout(io.StringIO()):
+            return func()
+    return run
+
+def run_scale(count: int, args: argparse.Namespace) -> Dict:
+    """Generate a corpus of count agents and time every stage on it."""
+    generator = load_tool('generate-synthetic-corpus.py')
+    validator_tool = load_tool('validate-agents.py')
+    merge_tool = load_tool('merge-agents.py')
+    graph_tool = load_tool('generate-dependency-graph.py')
+
+    with tempfile.TemporaryDirectory(prefix='agent-bench-') as tmp:
+        root = Path(tmp)
+        agents_dir = root / 'agents'
+        started = time.perf_counter()
+        files = generator.generate_corpus(
+            agents_dir, count, args.length, args.density, args.block_ratio, seed=args.seed
+        )
+        generate_time = time.perf_counter() - started
+        corpus_bytes = sum(path.stat().st_size for path in files)
+
+        schema = validator_tool.load_schema(PROJECT_ROOT / 'schemas' / 'agent-mode-schema.json')
+        validator = validator_tool.compile_validator(schema)
+        documents = [(path, parse_yaml_file(path)) for path in files]
+        modes = [mode for _, document in documents for mode in document['customModes']]
+
+        def load():
+            return [parse_yaml_file(path) for path in files]
+
+        # Prime the snapshot so load_snapshot measures the warm path
+        warm = AgentRegistry(agents_dir)
+        warm.refresh()
+        warm.save()
+
+        def load_snapshot():
+            registry = AgentRegistry(agents_dir)
+            registry.refresh()
+            return registry.modes()
+
+        def schema_validation():
+            return sum(1 for _, document in documents for _ in validator.iter_errors(document))
+
+        def custom_checks():
+            warnings = []
+            for path, document in documents:
+                warnings.extend(validator_tool.lint_agent(document, str(path))[1])
+            return warnings
+
+        def delegations():
+            matcher = DelegationMatcher(mode['slug'] for mode in modes)
+            return [matcher.extract(mode['customInstructions']) for mode in modes]
+
+        output_file = root / 'custom_modes.yaml'
+        manifest_path = root / '.cache' / 'merge-manifest.marshal'
+
+        def merge():
+            return merge_tool.merge_agents(agents_dir, output_file, manifest_path, force=True)
+
+        def merge_noop():
+            return merge_tool.merge_agents(agents_dir, output_file, manifest_path)
+
+        def mermaid():
+            graph = analyze_agents(agents_dir, verbose=False)
+            graph_tool.generate_mermaid(graph, root / 'graph.md')
+
+        stages = {
+            'load': load,
+            'load_snapshot': load_snapshot,
+            'schema': schema_validation,
+            'custom_checks': custom_checks,
+            'delegations': delegations,
+            'merge': quietly(merge),
+            'merge_noop': quietly(merge_noop),
+            'mermaid': quietly(mermaid)
+        }
+        timings = {}
+        for name in STAGES:
+            if args.stages and name not in args.stages:
+                continue
+            timings[name] = best_of(stages[name], args.repeat)
+            print(f"  {name:<15} {timings[name] * 1000:10.1f} ms", file=sys.stderr)
+
+    return {
+        'agents': count,
+        'corpus_bytes': corpus_bytes,
+        'generate_seconds': generate_time,
+        'stages': timings
+    }
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print a comparison table and return the regressed 'scale/stage' names."""
+    regressions = []
+    if baseline.get('suite_version') != SUITE_VERSION:
+        print(f"Baseline suite version {baseline.get('suite_version')} != {SUITE_VERSION}; not comparing")
+        return regressions
+
+    print(f"\nComparison against {baseline.get('commit', 'unknown')} (threshold {threshold:.2f}x)")
+    print(f"{'scale':>8} {'stage':<15} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for scale, result in results['scales'].items():
+        previous = baseline['scales'].get(scale)
+        if previous is None:
+            continue
+        for stage, seconds in result['stages'].items():
+            before = previous['stages'].get(stage)
+            if not before:
+                continue
+            ratio = seconds / before
+            flag = ''
+            if ratio > threshold:
+                flag = '  REGRESSION'
+                regressions.append(f"{scale}/{stage}")
+            print(f"{scale:>8} {stage:<15} {before * 1000:12.1f} {seconds * 1000:12.1f} {ratio:6.2f}x{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the tools/ scripts on synthetic corpora')
+    parser.add_argument('--scales', default='1000,5000', help='Comma-separated agent counts (default: 1000,5000)')
+    parser.add_argument('--length', type=int, default=3000, help='Typical customInstructions length (default: 3000)')
+    parser.add_argument('--density', type=float, default=2.0, help='Delegations per 1000 chars (default: 2.0)')
+    parser.add_argument('--block-ratio', type=float, default=0.1, help='Share of literal-block instructions (default: 0.1)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions, best is reported (default: 3)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--stages', type=lambda value: value.split(','), help=f"Subset of: {','.join(STAGES)}")
+    parser.add_argument('--save', type=str, help='Write results as a JSON baseline to this path')
+    parser.add_argument('--compare', type=str, help='Compare against a saved JSON baseline')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Slowdown ratio that counts as a regression (default: 1.25)')
+    args = parser.parse_args()
+
+    scales = [int(value) for value in args.scales.split(',') if value]
+    results = {
+        'suite_version': SUITE_VERSION,
+        'commit': git_commit(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'options': {
+            'length': args.length, 'density': args.density,
+            'block_ratio': args.block_ratio, 'repeat': args.repeat, 'seed': args.seed
+        },
+        'scales': {}
+    }
+    for count in scales:
+        print(f"Scale {count} agents", file=sys.stderr)
+        results['scales'][str(count)] = run_scale(count, args)
+
+    print(f"\n{'scale':>8} {'MB':>7} " + ' '.join(f"{stage:>13}" for stage in STAGES))
+    for scale, result in results['scales'].items():
+        cells = ' '.join(
+            f"{result['stages'][stage] * 1000:11.1f}ms" if stage in result['stages'] else f"{'-':>13}"
+            for stage in STAGES
+        )
+        print(f"{scale:>8} {result['corpus_bytes'] / 1e6:7.1f} {cells}")
+
+    if args.save:
+        save_path = Path(args.save)
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        save_path.write_text(json.dumps(results, indent=2) + '\n', encoding='utf-8')
+        print(f"\n✓ Baseline written to {save_path}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✓ No regressions")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Context Search Index
+
+Full-text index over the project's Markdown context (memory-bank/*.md,
+docs/**/*.md and reports/*.md), so an orchestrator can pull the few sections
+relevant to its task instead of reading activeContext.md, decisionLog.md and
+progress.md in full every cycle.
+
+Files are split into sections at Markdown headings (headings inside fenced
+code blocks are ignored) and stored in an SQLite FTS5 table, with each
+section's heading trail, line number and byte range in its file. Re-indexing
+is incremental: only files whose mtime or size changed are re-read, and
+deleted files are dropped. Searches rank sections with BM25, weighting
+heading matches above body matches, and refresh the index first.
+
+The index lives in .cache/context-index.db (WAL mode) and can be rebuilt at
+any time from the Markdown files.
+
+Usage:
+    python tools/context_index.py index
+    python tools/context_index.py search "routing header validation" -k 5
+    python tools/context_index.py search "decision AND sqlite" --raw --json
+    python tools/context_index.py read memory-bank/decisionLog.md 1200 2450
+"""
+
+import sys
+import json
+import sqlite3
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Globs, relative to the project root, of the files that are indexed
+DEFAULT_SOURCES = ['memory-bank/*.md', 'docs/**/*.md', 'reports/*.md']
+
+# BM25 column weights for (heading, body)
+HEADING_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sections INTEGER NOT NULL,
+    indexed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    heading TEXT NOT NULL,
+    heading_path TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    byte_start INTEGER NOT NULL,
+    byte_end INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sections_path ON sections(path);
+CREATE VIRTUAL TABLE IF NOT EXISTS sections_fts USING fts5(heading, body, tokenize='porter unicode61');
+"""
+
+SEARCH_SQL = f"""
+SELECT s.id, s.path, s.heading, s.heading_path, s.level, s.line, s.byte_start, s.byte_end,
+       bm25(sections_fts, {HEADING_WEIGHT}, {BODY_WEIGHT}) AS score,
+       snippet(sections_fts, 1, '[', ']', ' ... ', ?) AS snippet
+FROM sections_fts
+JOIN sections s ON s.id = sections_fts.rowid
+WHERE sections_fts MATCH ?
+ORDER BY score
+LIMIT ?
+"""
+
+def utc_timestamp() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+def _heading(line: str) -> Optional[Tuple[int, str]]:
+    """(level, text) for an ATX heading line, else None."""
+    stripped = line.lstrip(' ')
+    if len(line) - len(stripped) > 3 or not stripped.startswith('#'):
+        return None
+    level = len(stripped) - len(stripped.lstrip('#'))
+    rest = stripped[level:]
+    if level > 6 or (rest and not rest[0] in ' \t'):
+        return None
+    text = rest.strip().rstrip('#').strip()
+    return level, text
+
+def split_sections(content: bytes, title: str) -> List[Dict[str, Any]]:
+    """
+    Split a Markdown file into sections at each heading.
+
+    Each section runs from its heading line to the next heading of any level
+    and records its heading, the trail of enclosing headings, its 1-based
+    line number and its byte range in content. Text before the first heading
+    becomes a section titled after the file.
+    """
+    sections: List[Dict[str, Any]] = []
+    trail: List[Tuple[int, str]] = []
+    fence: Optional[str] = None
+    current = {'heading': title, 'heading_path': title, 'level': 0, 'line': 1, 'byte_start': 0, 'lines': []}
+    offset = 0
+
+    for number, raw in enumerate(content.splitlines(keepends=True), 1):
+        line = raw.decode('utf-8', errors='replace').rstrip('\r\n')
+        marker = line.lstrip()[:3]
+        if marker in ('```', '~~~'):
+            fence = None if fence == marker else (fence or marker)
+        heading = None if fence else _heading(line)
+        if heading is not None:
+            current['byte_end'] = offset
+            sections.append(current)
+            level, text = heading
+            trail = [entry for entry in trail if entry[0] < level] + [(level, text)]
+            current = {
+                'heading': text,
+                'heading_path': ' > '.join(entry[1] for entry in trail),
+                'level': level,
+                'line': number,
+                'byte_start': offset,
+                'lines': []
+            }
+        else:
+            current['lines'].append(line)
+        offset += len(raw)
+    current['byte_end'] = offset
+    sections.append(current)
+
+    result = []
+    for section in sections:
+        body = '\n'.join(section.pop('lines')).strip()
+        # Drop an empty preamble, keep empty headed sections (their heading is searchable)
+        if section['level'] == 0 and not body:
+            continue
+        section['body'] = body
+        result.append(section)
+    return result
+
+def _match_query(text: str, all_terms: bool) -> str:
+    """Turn free text into an FTS5 query of quoted terms (OR, or AND with all_terms)."""
+    terms = [term.replace('"', '""') for term in text.split()]
+    return (' AND ' if all_terms else ' OR ').join(f'"{term}"' for term in terms)
+
+class ContextIndex:
+    """FTS5 index of Markdown sections under a project root."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        root: Path = PROJECT_ROOT,
+        sources: Optional[List[str]] = None,
+        timeout: float = 30.0
+    ):
+        self.db_path = db_path
+        self.root = root
+        self.sources = sources or DEFAULT_SOURCES
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: refresh() opens its own BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(str(db_path), timeout=timeout, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(f'PRAGMA busy_timeout={int(timeout * 1000)}')
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'ContextIndex':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def files(self) -> List[Path]:
+        """Every file matched by the source globs, sorted and de-duplicated."""
+        found = set()
+        for pattern in self.sources:
+            found.update(path for path in self.root.glob(pattern) if path.is_file())
+        return sorted(found)
+
+    def _relative(self, path: Path) -> str:
+        return path.relative_to(self.root).as_posix()
+
+    def _delete(self, path: str) -> None:
+        self.conn.execute(
+            'DELETE FROM sections_fts WHERE rowid IN (SELECT id FROM sections WHERE path = ?)', (path,)
+        )
+        self.conn.execute('DELETE FROM sections WHERE path = ?', (path,))
+        self.conn.execute('DELETE FROM documents WHERE path = ?', (path,))
+
+    def refresh(self, rebuild: bool = False) -> Dict[str, int]:
+        """
+        Bring the index up to date in one transaction: re-index files whose
+        mtime or size changed, drop files that no longer exist.
+
+        Returns counts of indexed, unchanged and removed files and the number
+        of sections written.
+        """
+        known = {
+            row['path']: (row['mtime_ns'], row['size'])
+            for row in self.conn.execute('SELECT path, mtime_ns, size FROM documents')
+        }
+        counts = {'indexed': 0, 'unchanged': 0, 'removed': 0, 'sections': 0}
+        timestamp = utc_timestamp()
+
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            if rebuild:
+                self.conn.execute('DELETE FROM sections_fts')
+                self.conn.execute('DELETE FROM sections')
+                self.conn.execute('DELETE FROM documents')
+                known = {}
+            seen = set()
+            for path in self.files():
+                relative = self._relative(path)
+                seen.add(relative)
+                st = path.stat()
+                if known.get(relative) == (st.st_mtime_ns, st.st_size):
+                    counts['unchanged'] += 1
+                    continue
+                if relative in known:
+                    self._delete(relative)
+                sections = split_sections(path.read_bytes(), path.stem)
+                for section in sections:
+                    cursor = self.conn.execute(
+                        'INSERT INTO sections (path, heading, heading_path, level, line, byte_start, byte_end) '
+                        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                        (relative, section['heading'], section['heading_path'], section['level'],
+                         section['line'], section['byte_start'], section['byte_end'])
+                    )
+                    self.conn.execute(
+                        'INSERT INTO sections_fts (rowid, heading, body) VALUES (?, ?, ?)',
+                        (cursor.lastrowid, section['heading_path'], section['body'])
+                    )
+                self.conn.execute(
+                    'INSERT INTO documents (path, mtime_ns, size, sections, indexed_at) VALUES (?, ?, ?, ?, ?)',
+                    (relative, st.st_mtime_ns, st.st_size, len(sections), timestamp)
+                )
+                counts['indexed'] += 1
+                counts['sections'] += len(sections)
+            for relative in set(known) - seen:
+                self._delete(relative)
+                counts['removed'] += 1
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return counts
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        raw: bool = False,
+        all_terms: bool = False,
+        path_prefix: Optional[str] = None,
+        snippet_tokens: int = 24
+    ) -> List[Dict[str, Any]]:
+        """
+        The k best-matching sections, best first.
+
+        query is free text (terms are ORed, or ANDed with all_terms) unless raw,
+        in which case it is passed to FTS5 as-is. Each hit has the file path,
+        heading, heading trail, line, byte_start/byte_end in the file, BM25
+        score (lower is better) and a snippet with matches in [brackets].
+        Raises ValueError for an invalid raw FTS5 query.
+        """
+        match = query if raw else _match_query(query, all_terms)
+        if not match:
+            return []
+        # Over-fetch when filtering by path so the filter cannot starve the top k
+        limit = k * 20 if path_prefix else k
+        try:
+            rows = self.conn.execute(SEARCH_SQL, (snippet_tokens, match, limit)).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query {match!r}: {e}")
+        hits = [dict(row) for row in rows if not path_prefix or row['path'].startswith(path_prefix)]
+        return hits[:k]
+
+    def read(self, path: str, byte_start: int, byte_end: int) -> str:
+        """The text of a byte range of an indexed file, as returned by search()."""
+        with open(self.root / path, 'rb') as f:
+            f.seek(byte_start)
+            return f.read(max(0, byte_end - byte_start)).decode('utf-8', errors='replace')
+
+    def iter_sections(self, path: str) -> Iterator[Dict[str, Any]]:
+        """The indexed sections of one file, in file order."""
+        for row in self.conn.execute('SELECT * FROM sections WHERE path = ? ORDER BY byte_start', (path,)):
+            yield dict(row)
+
+    def stats(self) -> Dict[str, Any]:
+        files, sections = self.conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(sections), 0) FROM documents'
+        ).fetchone()
+        return {
+            'database': str(self.db_path),
+            'files': files,
+            'sections': sections,
+            'bytes': self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM documents').fetchone()[0]
+        }
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Full-text search over memory-bank/, docs/ and reports/ Markdown sections'
+    )
+    parser.add_argument(
+        '--db',
+        type=str,
+        help='Index database (default: .cache/context-index.db in the project root)'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    index_parser = subparsers.add_parser('index', help='Index new and changed files')
+    index_parser.add_argument('--rebuild', action='store_true', help='Drop the index and re-read every file')
+
+    search_parser = subparsers.add_parser('search', help='Top-k sections for a query')
+    search_parser.add_argument('query', help='Search terms (FTS5 syntax with --raw)')
+    search_parser.add_argument('-k', '--top', type=int, default=5, help='Number of sections (default: 5)')
+    search_parser.add_argument('--all', action='store_true', help='Require every term instead of any')
+    search_parser.add_argument('--raw', action='store_true', help='Pass the query to FTS5 unchanged (AND, OR, NEAR, "phrases", prefix*)')
+    search_parser.add_argument('--path', help='Only sections of files under this path prefix, e.g. memory-bank/')
+    search_parser.add_argument('--text', action='store_true', help='Include each section\'s full text')
+    search_parser.add_argument('--no-refresh', action='store_true', help='Search without re-indexing changed files first')
+    search_parser.add_argument('--json', action='store_true', help='Print hits as JSON')
+
+    read_parser = subparsers.add_parser('read', help='Print a byte range of an indexed file')
+    read_parser.add_argument('path', help='File path relative to the project root')
+    read_parser.add_argument('byte_start', type=int)
+    read_parser.add_argument('byte_end', type=int)
+
+    subparsers.add_parser('stats', help='Indexed files and sections')
+
+    args = parser.parse_args()
+    db_path = Path(args.db) if args.db else PROJECT_ROOT / '.cache' / 'context-index.db'
+
+    with ContextIndex(db_path) as index:
+        if args.command == 'index':
+            print(json.dumps(index.refresh(rebuild=args.rebuild), indent=2))
+        elif args.command == 'read':
+            sys.stdout.write(index.read(args.path, args.byte_start, args.byte_end))
+        elif args.command == 'stats':
+            print(json.dumps(index.stats(), indent=2))
+        else:
+            if not args.no_refresh:
+                index.refresh()
+            try:
+                hits = index.search(args.query, args.top, args.raw, args.all, args.path)
+            except ValueError as e:
+                print(json.dumps({'error': str(e)}), file=sys.stderr)
+                sys.exit(2)
+            if args.text:
+                for hit in hits:
+                    hit['text'] = index.read(hit['path'], hit['byte_start'], hit['byte_end'])
+            if args.json:
+                print(json.dumps(hits, indent=2, ensure_ascii=False))
+                return
+            if not hits:
+                print('No matching sections')
+                sys.exit(1)
+            for hit in hits:
+                print(f"{hit['path']}:{hit['line']}  bytes {hit['byte_start']}-{hit['byte_end']}  "
+                      f"score {hit['score']:.2f}")
+                print(f"  {hit['heading_path']}")
+                print(f"  {' '.join(hit['snippet'].split())}")
+                if args.text:
+                    print(hit['text'].rstrip() + '\n')
+                print()
+
+if __name__ == '__main__':
+    main()
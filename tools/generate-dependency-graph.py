@@ -10,23 +10,45 @@ Usage:
     python tools/generate-dependency-graph.py --format png
     python tools/generate-dependency-graph.py --format mermaid
     python tools/generate-dependency-graph.py --output docs/agent-graph
+    python tools/generate-dependency-graph.py --cluster --reduce --format svg
+    python tools/generate-dependency-graph.py --focus spec-writer-comprehensive --depth 2
+    python tools/generate-dependency-graph.py query summary
+    python tools/generate-dependency-graph.py query reached-by spec-writer-comprehensive
+    python tools/generate-dependency-graph.py --format all --profile
 """
 
 import sys
 import re
-import yaml
+import json
+import time
 import argparse
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-try:
-    import graphviz
-    HAS_GRAPHVIZ = True
-except ImportError:
-    HAS_GRAPHVIZ = False
-    print("Warning: graphviz not installed. Only Mermaid output will be available.")
-    print("Install with: pip install graphviz")
+# The graph model lives in agent_graph; names are re-exported for existing importers
+from agent_graph import (
+    AGENT_KEYWORDS,
+    AgentGraph,
+    DelegationMatcher,
+    analyze_agents,
+    extract_delegations
+)
+from graph_analytics import GraphAnalytics
+import profiling
+
+def import_graphviz() -> Any:
+    """
+    The graphviz module, imported on first use so Mermaid-only runs and
+    queries neither pay for it nor warn when it is missing; None if absent.
+    """
+    try:
+        import graphviz
+    except ImportError:
+        print("Warning: graphviz not installed. Only Mermaid output will be available.", file=sys.stderr)
+        print("Install with: pip install graphviz", file=sys.stderr)
+        return None
+    return graphviz
 
 # Color codes for terminal output
 class Colors:
@@ -37,152 +59,54 @@ class Colors:
     BOLD = '\033[1m'
     END = '\033[0m'
 
-class AgentGraph:
-    """Represents the agent dependency graph."""
-    
-    def __init__(self):
-        self.nodes: Dict[str, Dict] = {}  # slug -> {name, role, groups}
-        self.edges: List[Tuple[str, str, str]] = []  # (from, to, delegation_type)
-        self.categories: Dict[str, List[str]] = defaultdict(list)
-        
-    def add_agent(self, slug: str, name: str, role: str, groups: List[str]):
-        """Add an agent node to the graph."""
-        self.nodes[slug] = {
-            'name': name,
-            'role': role,
-            'groups': groups
-        }
-        
-        # Categorize by type
-        if 'orchestrator' in slug:
-            self.categories['orchestrator'].append(slug)
-        elif any(x in slug for x in ['validator', 'auditor', 'guardian']):
-            self.categories['validator'].append(slug)
-        elif any(x in slug for x in ['coder', 'tester', 'writer', 'architect']):
-            self.categories['worker'].append(slug)
-        elif 'bmo' in slug or 'ruler' in slug or 'devil' in slug:
-            self.categories['quality'].append(slug)
-        else:
-            self.categories['other'].append(slug)
-    
-    def add_delegation(self, from_slug: str, to_slug: str, delegation_type: str = "delegates"):
-        """Add a delegation edge between agents."""
-        self.edges.append((from_slug, to_slug, delegation_type))
-    
-    def get_node_color(self, slug: str) -> str:
-        """Get color for node based on category."""
-        if slug in self.categories['orchestrator']:
-            return '#4A90E2'  # Blue
-        elif slug in self.categories['worker']:
-            return '#7ED321'  # Green
-        elif slug in self.categories['validator']:
-            return '#F5A623'  # Orange
-        elif slug in self.categories['quality']:
-            return '#BD10E0'  # Purple
-        else:
-            return '#9B9B9B'  # Gray
+# Cluster titles for --cluster, in drawing order
+CATEGORY_LABELS = {
+    'orchestrator': 'Orchestrators',
+    'worker': 'Workers',
+    'validator': 'Validators',
+    'quality': 'Quality Agents',
+    'other': 'Other Agents'
+}
 
-def extract_delegations(custom_instructions: str) -> Set[str]:
-    """
-    Extract agent slugs that are delegated to from customInstructions.
-    Looks for patterns like: "delegate to agent-slug" or "new_task to agent-slug"
-    """
-    delegations = set()
-    
-    # Pattern 1: "delegate to agent-slug"
-    pattern1 = r'delegate[s]?\s+to\s+([a-z0-9]+(?:-[a-z0-9]+)*)'
-    matches1 = re.findall(pattern1, custom_instructions, re.IGNORECASE)
-    delegations.update(matches1)
-    
-    # Pattern 2: "new_task to agent-slug" or "task agent-slug"
-    pattern2 = r'(?:new_task|task)\s+(?:to\s+)?([a-z0-9]+(?:-[a-z0-9]+)*)'
-    matches2 = re.findall(pattern2, custom_instructions, re.IGNORECASE)
-    delegations.update(matches2)
-    
-    # Pattern 3: Direct agent mentions in workflow sequences
-    pattern3 = r'\b([a-z]+-[a-z]+(?:-[a-z]+)*)\b'
-    potential_agents = re.findall(pattern3, custom_instructions)
-    # Filter to only include known agent-like patterns
-    agent_keywords = ['orchestrator', 'writer', 'coder', 'tester', 'architect', 
-                     'validator', 'auditor', 'guardian', 'planner', 'researcher',
-                     'debugger', 'optimizer', 'advocate', 'ruler', 'bmo']
-    for agent in potential_agents:
-        if any(keyword in agent for keyword in agent_keywords):
-            delegations.add(agent)
-    
-    return delegations
-
-def analyze_agents(agents_dir: Path) -> AgentGraph:
-    """Analyze all agent YAML files and build dependency graph."""
-    graph = AgentGraph()
-    
-    yaml_files = sorted(agents_dir.glob('*.yaml'))
-    print(f"\n{Colors.BLUE}Analyzing {len(yaml_files)} agent files...{Colors.END}\n")
-    
-    # First pass: collect all agents
-    all_agent_data = {}
-    for yaml_file in yaml_files:
-        try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                
-            if 'customModes' in data:
-                for mode in data['customModes']:
-                    slug = mode.get('slug', '')
-                    name = mode.get('name', '')
-                    role = mode.get('roleDefinition', '')[:100] + '...'
-                    groups = mode.get('groups', [])
-                    custom_inst = mode.get('customInstructions', '')
-                    
-                    all_agent_data[slug] = {
-                        'name': name,
-                        'role': role,
-                        'groups': groups,
-                        'instructions': custom_inst
-                    }
-                    
-                    graph.add_agent(slug, name, role, groups)
-                    
-        except Exception as e:
-            print(f"{Colors.YELLOW}Warning: Could not parse {yaml_file}: {e}{Colors.END}")
-    
-    # Second pass: extract delegations
-    for slug, data in all_agent_data.items():
-        delegations = extract_delegations(data['instructions'])
-        
-        # Filter to only include actual agents in our system
-        valid_delegations = delegations.intersection(all_agent_data.keys())
-        
-        for target in valid_delegations:
-            graph.add_delegation(slug, target)
-            
-        if valid_delegations:
-            print(f"{Colors.GREEN}✓{Colors.END} {slug} → {', '.join(sorted(valid_delegations))}")
-    
-    return graph
+def node_groups(graph: AgentGraph, clusters: bool) -> List[Tuple[Optional[str], List[str]]]:
+    """Nodes to draw as (category, slugs) groups; one uncategorized group unless clustering."""
+    if not clusters:
+        return [(None, list(graph.nodes))]
+    return [
+        (category, list(dict.fromkeys(graph.categories[category])))
+        for category in CATEGORY_LABELS
+        if graph.categories.get(category)
+    ]
 
-def generate_mermaid(graph: AgentGraph, output_path: Path):
-    """Generate Mermaid flowchart syntax."""
+def generate_mermaid(graph: AgentGraph, output_path: Path, clusters: bool = False):
+    """Generate Mermaid flowchart syntax, optionally with one subgraph per category."""
     lines = [
         "```mermaid",
         "flowchart TD",
         ""
     ]
     
-    # Define nodes with shortened names
-    for slug, data in graph.nodes.items():
-        # Extract emoji and short name
-        name = data['name']
-        emoji_match = re.match(r'([^\w\s]+)\s*(.*)', name)
-        if emoji_match:
-            emoji, short_name = emoji_match.groups()
-            label = f"{emoji} {short_name[:30]}"
-        else:
-            label = name[:35]
-        
-        # Node style based on category
-        node_id = slug.replace('-', '_')
-        lines.append(f"    {node_id}[\"{label}\"]")
+    for category, slugs in node_groups(graph, clusters):
+        indent = "    "
+        if category is not None:
+            lines.append(f"    subgraph {category}_agents[\"{CATEGORY_LABELS[category]}\"]")
+            indent = "        "
+        # Define nodes with shortened names
+        for slug in slugs:
+            # Extract emoji and short name
+            name = graph.nodes[slug]['name']
+            emoji_match = re.match(r'([^\w\s]+)\s*(.*)', name)
+            if emoji_match:
+                emoji, short_name = emoji_match.groups()
+                label = f"{emoji} {short_name[:30]}"
+            else:
+                label = name[:35]
+            
+            # Node style based on category
+            node_id = slug.replace('-', '_')
+            lines.append(f"{indent}{node_id}[\"{label}\"]")
+        if category is not None:
+            lines.append("    end")
     
     lines.append("")
     
@@ -215,22 +139,12 @@ def generate_mermaid(graph: AgentGraph, output_path: Path):
     output_path.write_text('\n'.join(lines), encoding='utf-8')
     print(f"\n{Colors.GREEN}✓ Generated Mermaid diagram: {output_path}{Colors.END}")
 
-def generate_graphviz(graph: AgentGraph, output_path: Path, format: str = 'png'):
-    """Generate Graphviz DOT format and render to image."""
-    if not HAS_GRAPHVIZ:
-        print(f"{Colors.RED}✗ Graphviz not installed. Cannot generate {format} output.{Colors.END}")
-        return
-    
-    dot = graphviz.Digraph(comment='AI Agent Dependency Graph')
-    dot.attr(rankdir='TB', splines='ortho', nodesep='0.5', ranksep='0.8')
-    dot.attr('node', shape='box', style='rounded,filled', fontname='Arial', fontsize='10')
-    dot.attr('edge', fontname='Arial', fontsize='8')
-    
-    # Add nodes
-    for slug, data in graph.nodes.items():
+def add_graphviz_nodes(dot: Any, graph: AgentGraph, slugs: List[str]):
+    """Add slugs as colored, shortened-label nodes to a Digraph or cluster subgraph."""
+    for slug in slugs:
         color = graph.get_node_color(slug)
         # Shorten label
-        name = data['name']
+        name = graph.nodes[slug]['name']
         emoji_match = re.match(r'([^\w\s]+)\s*(.*)', name)
         if emoji_match:
             emoji, short_name = emoji_match.groups()
@@ -239,10 +153,36 @@ def generate_graphviz(graph: AgentGraph, output_path: Path, format: str = 'png')
             label = name[:30]
         
         dot.node(slug, label, fillcolor=color, fontcolor='white' if color in ['#4A90E2', '#BD10E0'] else 'black')
+
+def build_digraph(graphviz: Any, graph: AgentGraph, clusters: bool = False) -> Any:
+    """Build the Graphviz Digraph for graph, optionally clustered by category."""
+    dot = graphviz.Digraph(comment='AI Agent Dependency Graph')
+    dot.attr(rankdir='TB', splines='ortho', nodesep='0.5', ranksep='0.8')
+    dot.attr('node', shape='box', style='rounded,filled', fontname='Arial', fontsize='10')
+    dot.attr('edge', fontname='Arial', fontsize='8')
+    
+    # Add nodes, each category in its own cluster when requested
+    for category, slugs in node_groups(graph, clusters):
+        if category is None:
+            add_graphviz_nodes(dot, graph, slugs)
+            continue
+        with dot.subgraph(name=f'cluster_{category}') as cluster:
+            cluster.attr(label=CATEGORY_LABELS[category], style='rounded,dashed', color='#9B9B9B', fontname='Arial')
+            add_graphviz_nodes(cluster, graph, slugs)
     
     # Add edges
     for from_slug, to_slug, delegation_type in graph.edges:
         dot.edge(from_slug, to_slug, label='')
+    return dot
+
+def generate_graphviz(graph: AgentGraph, output_path: Path, format: str = 'png', clusters: bool = False):
+    """Generate Graphviz DOT format and render to image, optionally clustered by category."""
+    graphviz = import_graphviz()
+    if graphviz is None:
+        print(f"{Colors.RED}✗ Graphviz not installed. Cannot generate {format} output.{Colors.END}")
+        return
+    
+    dot = build_digraph(graphviz, graph, clusters)
     
     # Render
     try:
@@ -251,28 +191,172 @@ def generate_graphviz(graph: AgentGraph, output_path: Path, format: str = 'png')
     except Exception as e:
         print(f"{Colors.RED}✗ Failed to render graph: {e}{Colors.END}")
 
-def main():
-    parser = argparse.ArgumentParser(
-        description='Generate agent dependency graph visualizations'
-    )
-    parser.add_argument(
-        '--format', '-f',
-        choices=['dot', 'png', 'svg', 'mermaid', 'all'],
-        default='mermaid',
-        help='Output format (default: mermaid)'
-    )
-    parser.add_argument(
-        '--output', '-o',
-        type=str,
-        default='docs/agent-dependency-graph',
-        help='Output file path (without extension)'
-    )
+def layout_graphviz(graph: AgentGraph, clusters: bool = False) -> Optional[Tuple[Any, str]]:
+    """
+    Run the dot layout once and return (graphviz module, positioned DOT).
+    Every node and edge in the positioned DOT carries its computed pos, so
+    neato -n2 renders it to any format without laying it out again. None when
+    graphviz is missing or the layout fails.
+    """
+    graphviz = import_graphviz()
+    if graphviz is None:
+        print(f"{Colors.RED}✗ Graphviz not installed. Cannot generate DOT, PNG or SVG output.{Colors.END}")
+        return None
+    try:
+        return graphviz, build_digraph(graphviz, graph, clusters).pipe(format='dot', encoding='utf-8')
+    except Exception as e:
+        print(f"{Colors.RED}✗ Failed to lay out graph: {e}{Colors.END}")
+        return None
+
+def render_positioned(graphviz: Any, positioned: str, output_path: Path, format: str):
+    """Write one format from positioned DOT; the .dot output is the layout itself."""
+    target = Path(f"{output_path}.{format}")
+    try:
+        if format == 'dot':
+            target.write_text(positioned, encoding='utf-8')
+        else:
+            target.write_bytes(graphviz.pipe('neato', format, positioned.encode('utf-8'), neato_no_op=2))
+        print(f"\n{Colors.GREEN}✓ Generated {format.upper()} diagram: {target}{Colors.END}")
+    except Exception as e:
+        print(f"{Colors.RED}✗ Failed to render graph: {e}{Colors.END}")
+
+def timed(func: Callable, *args) -> float:
+    """Call func(*args) and return its wall time; used for work done on pool threads."""
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+def render_outputs(graph: AgentGraph, output_path: Path, formats: List[str], clusters: bool = False):
+    """
+    Write every requested format. A single format renders directly. With
+    several, Mermaid is written on a pool thread while dot lays the graph out
+    once, then DOT, PNG and SVG render from that layout concurrently, so the
+    whole run costs about one layout.
+    """
+    if len(formats) == 1:
+        fmt = formats[0]
+        with profiling.phase(f"render:{fmt}"):
+            if fmt == 'mermaid':
+                generate_mermaid(graph, output_path.with_suffix('.md'), clusters)
+            else:
+                generate_graphviz(graph, output_path, fmt, clusters)
+        return
     
-    args = parser.parse_args()
+    graphviz_formats = [fmt for fmt in formats if fmt != 'mermaid']
+    with ThreadPoolExecutor(max_workers=len(formats)) as pool:
+        renders: Dict[str, Any] = {}
+        if 'mermaid' in formats:
+            renders['mermaid'] = pool.submit(timed, generate_mermaid, graph, output_path.with_suffix('.md'), clusters)
+        if len(graphviz_formats) == 1:
+            fmt = graphviz_formats[0]
+            renders[fmt] = pool.submit(timed, generate_graphviz, graph, output_path, fmt, clusters)
+        elif graphviz_formats:
+            with profiling.phase('layout'):
+                layout = layout_graphviz(graph, clusters)
+            if layout is not None:
+                graphviz, positioned = layout
+                for fmt in graphviz_formats:
+                    renders[fmt] = pool.submit(timed, render_positioned, graphviz, positioned, output_path, fmt)
+        # Pool threads do not touch the profiler; their timings are recorded here
+        for fmt, future in renders.items():
+            profiling.active().add(f"render:{fmt}", None, future.result())
+
+# Analyses exposed by the query subcommand; 'slug' ones need an agent argument
+QUERIES = {
+    'summary': 'Headline numbers from every analysis',
+    'cycles': 'Delegation cycles (strongly connected components) and self-loops',
+    'reach': 'Agents SLUG can reach through delegation',
+    'reached-by': 'Agents that can reach SLUG through delegation',
+    'closure': 'Transitive closure (reach counts; --full for member lists)',
+    'longest-chain': 'Longest delegation chain',
+    'fanout': 'Breadth-first delegation levels below --root',
+    'hotspots': 'Highest in-degree and out-degree agents',
+    'orphans': 'Agents with no delegations in or out',
+    'unreachable': 'Agents not reachable from --root',
+    'reduction': 'Delegations implied by longer paths (transitive reduction)'
+}
+
+def run_query(graph: AgentGraph, args: argparse.Namespace) -> Any:
+    """Run one analysis and return its JSON-serializable result."""
+    analytics = GraphAnalytics(graph)
+    roots = args.root or None
+    
+    if args.analysis in ('reach', 'reached-by'):
+        if not args.slug:
+            raise ValueError(f"'{args.analysis}' requires an agent SLUG")
+        if args.analysis == 'reach':
+            agents = analytics.reachable_from(args.slug)
+        else:
+            agents = analytics.reaching(args.slug)
+        return {'slug': args.slug, 'count': len(agents), 'agents': agents}
+    if args.analysis == 'summary':
+        return analytics.summary()
+    if args.analysis == 'cycles':
+        return analytics.cycles()
+    if args.analysis == 'closure':
+        return analytics.transitive_closure(counts_only=not args.full)
+    if args.analysis == 'longest-chain':
+        return analytics.longest_chain()
+    if args.analysis == 'fanout':
+        return [analytics.fanout(root) for root in roots or analytics.default_roots()]
+    if args.analysis == 'reduction':
+        return analytics.transitive_reduction()
+    if args.analysis == 'hotspots':
+        return analytics.hotspots(args.top)
+    if args.analysis == 'orphans':
+        agents = analytics.orphans()
+        return {'count': len(agents), 'agents': agents}
+    return analytics.unreachable(roots)
+
+def report_dropped(label: str, before: AgentGraph, after: AgentGraph):
+    """Print how many agents and delegations a view option removed."""
+    print(
+        f"{label}: kept {len(after.nodes)} agents and {len(after.edges)} delegations, "
+        f"dropped {len(before.nodes) - len(after.nodes)} agents and "
+        f"{len(before.edges) - len(after.edges)} delegations"
+    )
+
+def select_view(graph: AgentGraph, args: argparse.Namespace) -> AgentGraph:
+    """
+    Apply the large-graph options: --focus/--depth keeps one agent's
+    neighborhood, then --reduce drops delegations implied by longer paths.
+    Raises KeyError for an unknown --focus slug.
+    """
+    if args.focus:
+        with profiling.phase('focus'):
+            view = graph.subgraph(GraphAnalytics(graph).neighborhood(args.focus, args.depth))
+        report_dropped(f"Focus on {args.focus} (depth {args.depth})", graph, view)
+        graph = view
+    if args.reduce:
+        with profiling.phase('transitive_reduction'):
+            redundant = GraphAnalytics(graph).transitive_reduction()['redundant']
+            view = graph.subgraph(graph.nodes, redundant)
+        report_dropped("Transitive reduction", graph, view)
+        graph = view
+    if args.cluster:
+        clusters = len(node_groups(graph, True))
+        print(f"Category clusters: {clusters} groups, dropped 0 agents and 0 delegations")
+    return graph
+
+def run(args: argparse.Namespace):
+    """Build the graph and render it, or answer a query."""
     
     # Paths
     project_root = Path(__file__).parent.parent
     agents_dir = project_root / 'agents'
+    
+    if args.command == 'query':
+        graph = analyze_agents(agents_dir, verbose=False)
+        try:
+            with profiling.phase(f"query:{args.analysis}"):
+                result = run_query(graph, args)
+        except (KeyError, ValueError) as e:
+            # str() of a KeyError quotes its message, so report the message itself
+            print(json.dumps({'error': e.args[0]}), file=sys.stderr)
+            sys.exit(2)
+        print(json.dumps(result, indent=args.indent or None, ensure_ascii=False))
+        return
+    
     output_path = project_root / args.output
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
@@ -293,17 +377,82 @@ def main():
     print(f"Validators:       {len(graph.categories['validator'])}")
     print(f"Quality Agents:   {len(graph.categories['quality'])}")
     
-    # Generate output
-    formats = [args.format] if args.format != 'all' else ['mermaid', 'png', 'svg']
+    if args.focus or args.reduce or args.cluster:
+        print()
+        try:
+            graph = select_view(graph, args)
+        except KeyError as e:
+            # str() of a KeyError quotes its message, so report the message itself
+            print(f"{Colors.RED}✗ {e.args[0]}{Colors.END}")
+            sys.exit(2)
     
-    for fmt in formats:
-        if fmt == 'mermaid':
-            mermaid_path = output_path.with_suffix('.md')
-            generate_mermaid(graph, mermaid_path)
-        else:
-            generate_graphviz(graph, output_path, fmt)
+    # Generate output
+    formats = [args.format] if args.format != 'all' else ['mermaid', 'dot', 'png', 'svg']
+    render_outputs(graph, output_path, formats, args.cluster)
     
     print(f"\n{Colors.GREEN}✓ Dependency graph generation complete{Colors.END}\n")
 
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate agent dependency graph visualizations'
+    )
+    parser.add_argument(
+        '--format', '-f',
+        choices=['dot', 'png', 'svg', 'mermaid', 'all'],
+        default='mermaid',
+        help='Output format (default: mermaid)'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        type=str,
+        default='docs/agent-dependency-graph',
+        help='Output file path (without extension)'
+    )
+    parser.add_argument(
+        '--cluster',
+        action='store_true',
+        help='Group agents into one cluster subgraph per category'
+    )
+    parser.add_argument(
+        '--reduce',
+        action='store_true',
+        help='Drop delegations already implied by longer paths (transitive reduction)'
+    )
+    parser.add_argument(
+        '--focus',
+        metavar='SLUG',
+        help='Render only the agents within --depth delegation hops of SLUG'
+    )
+    parser.add_argument(
+        '--depth',
+        type=int,
+        default=2,
+        help='Hops around --focus, in either direction (default: 2)'
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    query_parser = subparsers.add_parser(
+        'query',
+        help='Analyze the delegation graph and print JSON',
+        description='Analyze the delegation graph and print JSON. Analyses: '
+                    + '; '.join(f"{name}: {text}" for name, text in QUERIES.items())
+    )
+    query_parser.add_argument('analysis', choices=list(QUERIES), help='Analysis to run')
+    query_parser.add_argument('slug', nargs='?', help='Agent slug for reach / reached-by')
+    query_parser.add_argument(
+        '--root',
+        action='append',
+        metavar='SLUG',
+        help='Root agent for fanout / unreachable (repeatable, default: uber-orchestrator)'
+    )
+    query_parser.add_argument('--top', type=int, default=10, help='Hotspot entries per ranking (default: 10)')
+    query_parser.add_argument('--full', action='store_true', help='List members for closure instead of counts')
+    query_parser.add_argument('--indent', type=int, default=2, help='JSON indentation, 0 for compact (default: 2)')
+    profiling.add_profiling_arguments(parser)
+    
+    args = parser.parse_args()
+    
+    with profiling.session('generate-dependency-graph', args):
+        run(args)
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Synthetic Agent Corpus Generator
+
+Writes a directory of schema-valid agent YAML files shaped like the real ones
+in agents/, so the tools can be measured at scales the 46-file corpus cannot
+reach. Agents are orchestrators, workers, validators and quality agents with
+emoji names, the mandatory routing-header sentence, delegation sentences
+("delegate to X", "new_task X", bare slug mentions) at a configurable density,
+and customInstructions that are mostly long single-line strings plus some
+literal blocks. One generated orchestrator-state-scribe carries a multi-KB
+single-line Signal Interpretation Framework, like the real one.
+
+Output is deterministic for a given set of options and seed.
+
+Usage:
+    python tools/generate-synthetic-corpus.py --count 1000
+    python tools/generate-synthetic-corpus.py --count 100000 --length 4000 --density 8 --output /tmp/agents
+
+The real agents/ directory is never touched. The command-line tools always read
+agents/, so measure a generated corpus through the library entry points that
+take a directory (agent_graph.analyze_agents, agent_registry.AgentRegistry) or
+the benchmarks in tools/benchmarks, which generate their own corpora.
+"""
+
+import sys
+import json
+import random
+import shutil
+import argparse
+from pathlib import Path
+from typing import Dict, List
+
+import yaml
+
+# (category, name emoji, role words); categories match AgentGraph.add_agent's keywords
+KINDS = [
+    ('orchestrator', '🎯', ['orchestrator']),
+    ('worker', '👨\u200d💻', ['coder', 'writer', 'tester', 'architect', 'planner', 'researcher', 'debugger', 'optimizer']),
+    ('validator', '🛡️', ['validator', 'auditor', 'guardian']),
+    ('quality', '⚖️', ['ruler', 'devils-advocate', 'bmo'])
+]
+KIND_WEIGHTS = [0.2, 0.6, 0.12, 0.08]
+TOPICS = ['spec', 'api', 'module', 'security', 'performance', 'docs', 'state', 'data',
+          'edge-case', 'integration', 'acceptance', 'feature', 'pseudocode', 'simulation',
+          'refinement', 'completion', 'architecture', 'portal', 'ledger', 'capital']
+GROUP_SETS = [
+    (['read', 'edit', 'mcp', 'command'], 0.76),
+    (['read', 'mcp'], 0.17),
+    (['read', 'edit', 'mcp'], 0.07)
+]
+PROTOCOL = ("You must adhere to a strict communication protocol by including the mandatory routing "
+            "header To: [recipient agent's slug], From: [your agent's slug] at the absolute beginning "
+            "of your task_complete message ONLY.")
+SENTENCES = [
+    "Before you begin, engage in a step-by-step thought process and analyze every requirement provided to you.",
+    "Your core operational process is a persistent loop of coding and verification until all tests pass.",
+    "You must avoid bad fallbacks that mask the true source of a failure or introduce new security risks.",
+    "Use the read-only tools first, then write a well-structured report under docs/reports with your findings.",
+    "Keep an up-to-date, end-to-end view of the project state and record every decision with its rationale.",
+    "When your work is complete, use attempt_completion with a comprehensive natural language summary.",
+    "All output must be written in Markdown and follow the high-level plan agreed with the orchestrator.",
+    "Verify acceptance criteria against the specification and flag any ambiguity to the requesting agent."
+]
+DELEGATION_TEMPLATES = [
+    "When this phase is ready you delegate to {slug} with the full context.",
+    "Dispatch a new_task {slug} for each pending item in the plan.",
+    "Assign the follow-up task to {slug} once the checks are green.",
+    "Consult {slug} whenever the results are ambiguous."
+]
+
+class _LiteralStr(str):
+    """customInstructions rendered as a YAML literal block."""
+
+class _CorpusDumper(yaml.SafeDumper):
+    pass
+
+_CorpusDumper.add_representer(
+    _LiteralStr,
+    lambda dumper, data: dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
+)
+
+def _scribe_framework() -> str:
+    """The scribe's prose framework, built from the machine-readable table when present."""
+    framework_path = Path(__file__).parent.parent / 'schemas' / 'signal-framework.json'
+    parts = ["You will use the internal Signal Interpretation Framework to map keywords from the summary "
+             "to a signal type. The framework is built upon signalCategories, signalTypes and interpretationLogic."]
+    try:
+        framework = json.loads(framework_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return ' '.join(parts + ["The keywordsToSignalType mapping translates phrases into signals."])
+    for category, signal_types in framework['signalCategories'].items():
+        parts.append(f"The {category} category includes signals like {', '.join(signal_types)}.")
+    parts.append("The keywordsToSignalType mapping translates phrases into signals; for instance " + ', '.join(
+        f"{keyword} maps to {signal_type}" for keyword, signal_type in framework['keywordsToSignalType'].items()
+    ) + '.')
+    return ' '.join(parts)
+
+def make_slugs(count: int, rng: random.Random) -> List[Dict]:
+    """Pick a kind and a unique, schema-valid slug for every agent."""
+    agents = []
+    used = {'orchestrator-state-scribe'}
+    for index in range(count - 1):
+        category, emoji, roles = rng.choices(KINDS, weights=KIND_WEIGHTS)[0]
+        role = rng.choice(roles)
+        topic = rng.choice(TOPICS)
+        slug = f"{role}-{topic}"
+        if slug in used:
+            slug = f"{slug}-{index}"
+        used.add(slug)
+        agents.append({'slug': slug, 'category': category, 'emoji': emoji, 'role': role, 'topic': topic})
+    # Orchestrators first so delegation mostly flows down the list, like the real hierarchy
+    agents.sort(key=lambda agent: (agent['category'] != 'orchestrator', agent['slug']))
+    agents.insert(0, {
+        'slug': 'orchestrator-state-scribe', 'category': 'orchestrator', 'emoji': '✍️', 'role': 'scribe', 'topic': 'state'
+    })
+    return agents
+
+def make_instructions(
+    agent_index: int,
+    agents: List[Dict],
+    length: int,
+    density: float,
+    rng: random.Random
+) -> str:
+    """Instructions of roughly `length` chars with about density delegations per 1000 chars."""
+    parts = [PROTOCOL]
+    size = len(PROTOCOL)
+    delegation_probability = min(1.0, density * 0.11)
+    while size < length:
+        if rng.random() < delegation_probability and len(agents) > 1:
+            # Mostly downward in the hierarchy, occasionally back up (cycles exist in real graphs)
+            if rng.random() < 0.9 and agent_index + 1 < len(agents):
+                target = agents[rng.randrange(agent_index + 1, len(agents))]
+            else:
+                target = agents[rng.randrange(len(agents))]
+            sentence = rng.choice(DELEGATION_TEMPLATES).format(slug=target['slug'])
+        else:
+            sentence = rng.choice(SENTENCES)
+        parts.append(sentence)
+        size += len(sentence) + 1
+    return ' '.join(parts)
+
+def make_mode(
+    agent_index: int,
+    agents: List[Dict],
+    length: int,
+    density: float,
+    block_ratio: float,
+    scribe_length: int,
+    rng: random.Random
+) -> Dict:
+    agent = agents[agent_index]
+    title = ' '.join(word.capitalize() for word in agent['slug'].split('-'))
+    groups = rng.choices([groups for groups, _ in GROUP_SETS], weights=[w for _, w in GROUP_SETS])[0]
+    if agent['slug'] == 'orchestrator-state-scribe':
+        instructions = ' '.join([PROTOCOL, _scribe_framework()])
+        filler = make_instructions(agent_index, agents, max(0, scribe_length - len(instructions)), 0, rng)
+        instructions = ' '.join([instructions, filler[len(PROTOCOL) + 1:]]).strip()
+    else:
+        # Lengths vary around the target like the real corpus (0.3x to 2.5x)
+        target = int(length * rng.uniform(0.3, 2.5))
+        instructions = make_instructions(agent_index, agents, target, density, rng)
+        if rng.random() < block_ratio:
+            sentences = instructions.split('. ')
+            instructions = _LiteralStr('.\n'.join(sentences) + '\n')
+    return {
+        'slug': agent['slug'],
+        'name': f"{agent['emoji']} {title}",
+        'roleDefinition': (f"You are the {title} agent, a specialist {agent['role']} responsible for the "
+                           f"{agent['topic']} area of the project. " + rng.choice(SENTENCES)),
+        'customInstructions': instructions,
+        'groups': list(groups),
+        'source': 'project'
+    }
+
+def generate_corpus(
+    output_dir: Path,
+    count: int,
+    length: int = 3000,
+    density: float = 2.0,
+    block_ratio: float = 0.1,
+    scribe_length: int = 6500,
+    seed: int = 42
+) -> List[Path]:
+    """
+    Write count agent files into output_dir and return their paths.
+
+    length is the typical customInstructions size in characters, density the
+    delegation sentences per 1000 characters, block_ratio the share of agents
+    whose instructions are a literal block instead of one long line.
+    """
+    if count < 1:
+        raise ValueError('count must be at least 1')
+    rng = random.Random(seed)
+    agents = make_slugs(count, rng)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for agent_index, agent in enumerate(agents):
+        mode = make_mode(agent_index, agents, length, density, block_ratio, scribe_length, rng)
+        text = yaml.dump(
+            {'customModes': [mode]},
+            Dumper=_CorpusDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+            width=float('inf'),
+            sort_keys=False
+        )
+        path = output_dir / f"{agent['slug']}.yaml"
+        path.write_text(text, encoding='utf-8')
+        paths.append(path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate a synthetic, schema-valid agent corpus'
+    )
+    parser.add_argument('--count', '-n', type=int, default=1000, help='Number of agents (default: 1000)')
+    parser.add_argument(
+        '--output', '-o',
+        type=str,
+        default='.cache/synthetic/agents',
+        help='Output directory (default: .cache/synthetic/agents)'
+    )
+    parser.add_argument('--length', type=int, default=3000, help='Typical customInstructions length in chars (default: 3000)')
+    parser.add_argument('--density', type=float, default=2.0, help='Delegation sentences per 1000 chars (default: 2.0)')
+    parser.add_argument('--block-ratio', type=float, default=0.1, help='Share of literal-block instructions (default: 0.1)')
+    parser.add_argument('--scribe-length', type=int, default=6500, help='State scribe single-line instruction length (default: 6500)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--clean', action='store_true', help='Remove the output directory first')
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    output_dir = Path(args.output)
+    if not output_dir.is_absolute():
+        output_dir = project_root / output_dir
+    if output_dir.resolve() == (project_root / 'agents').resolve():
+        print("✗ Refusing to write synthetic agents into agents/", file=sys.stderr)
+        sys.exit(2)
+    if args.clean and output_dir.exists():
+        shutil.rmtree(output_dir)
+
+    paths = generate_corpus(
+        output_dir, args.count, args.length, args.density, args.block_ratio, args.scribe_length, args.seed
+    )
+    total = sum(path.stat().st_size for path in paths)
+    print(f"✓ Generated {len(paths)} agents ({total / 1e6:.1f} MB) in {output_dir}")
+
+if __name__ == '__main__':
+    main()
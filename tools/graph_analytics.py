@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Delegation Graph Analytics
+
+Answers structural questions about the agent delegation graph using the
+integer-ID adjacency indexes kept by AgentGraph: delegation cycles (strongly
+connected components), reachability and neighborhoods, transitive closure and
+reduction, the longest delegation chain, fan-out depth from a root, degree
+hotspots, and orphan or unreachable agents.
+
+All traversals are iterative and linear in nodes + edges (the closure is
+computed once over the SCC condensation with integer bitsets), so they scale
+to tens of thousands of agents. Results use slugs and are sorted so that the
+JSON output is deterministic.
+
+Usage:
+    from agent_graph import analyze_agents
+    from graph_analytics import GraphAnalytics
+
+    analytics = GraphAnalytics(analyze_agents(Path('agents'), verbose=False))
+    print(analytics.cycles())
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+from agent_graph import AgentGraph
+
+# Default root for reachability questions when it exists in the graph
+DEFAULT_ROOT = 'uber-orchestrator'
+
+class GraphAnalytics:
+    """Graph algorithms over an AgentGraph's interned adjacency indexes."""
+
+    def __init__(self, graph: AgentGraph):
+        self.graph = graph
+        self.slugs = graph.slugs
+        self.successors = graph.successors
+        self.predecessors = graph.predecessors
+        self._components: Optional[List[List[int]]] = None
+        self._component_of: Optional[List[int]] = None
+
+    def node_id(self, slug: str) -> int:
+        """Resolve a slug to its node ID, raising KeyError for unknown agents."""
+        try:
+            return self.graph.node_ids[slug]
+        except KeyError:
+            raise KeyError(f"Unknown agent slug: {slug}")
+
+    def _names(self, node_ids: Iterable[int]) -> List[str]:
+        return sorted(self.slugs[node_id] for node_id in node_ids)
+
+    # -- Strongly connected components -----------------------------------------
+
+    def components(self) -> List[List[int]]:
+        """
+        Strongly connected components (iterative Tarjan), in reverse
+        topological order: every component comes after those it delegates to.
+        """
+        if self._components is not None:
+            return self._components
+
+        count = len(self.slugs)
+        index = [-1] * count
+        lowlink = [0] * count
+        on_stack = [False] * count
+        stack: List[int] = []
+        components: List[List[int]] = []
+        component_of = [-1] * count
+        next_index = 0
+
+        for start in range(count):
+            if index[start] != -1:
+                continue
+            work = [(start, iter(self.successors[start]))]
+            index[start] = lowlink[start] = next_index
+            next_index += 1
+            stack.append(start)
+            on_stack[start] = True
+
+            while work:
+                node, targets = work[-1]
+                advanced = False
+                for target in targets:
+                    if index[target] == -1:
+                        index[target] = lowlink[target] = next_index
+                        next_index += 1
+                        stack.append(target)
+                        on_stack[target] = True
+                        work.append((target, iter(self.successors[target])))
+                        advanced = True
+                        break
+                    if on_stack[target] and index[target] < lowlink[node]:
+                        lowlink[node] = index[target]
+                if advanced:
+                    continue
+
+                work.pop()
+                if work and lowlink[node] < lowlink[work[-1][0]]:
+                    lowlink[work[-1][0]] = lowlink[node]
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component_of[member] = len(components)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        self._components = components
+        self._component_of = component_of
+        return components
+
+    def cycles(self) -> Dict:
+        """Delegation cycles: multi-agent SCCs plus agents that delegate to themselves."""
+        cyclic = [self._names(component) for component in self.components() if len(component) > 1]
+        self_loops = self._names(
+            node for node in range(len(self.slugs)) if node in self.successors[node]
+        )
+        return {
+            'has_cycles': bool(cyclic or self_loops),
+            'cycles': sorted(cyclic),
+            'self_loops': self_loops
+        }
+
+    # -- Reachability ----------------------------------------------------------
+
+    def _bfs(self, sources: Iterable[int], adjacency: List[set], max_depth: Optional[int] = None) -> Dict[int, int]:
+        """Breadth-first search returning node ID -> hop distance from sources, up to max_depth hops."""
+        distance = {source: 0 for source in sources}
+        queue = deque(distance)
+        while queue:
+            node = queue.popleft()
+            if max_depth is not None and distance[node] >= max_depth:
+                continue
+            for target in adjacency[node]:
+                if target not in distance:
+                    distance[target] = distance[node] + 1
+                    queue.append(target)
+        return distance
+
+    def reachable_from(self, slug: str) -> List[str]:
+        """Every agent slug can delegate to, directly or transitively."""
+        source = self.node_id(slug)
+        return self._names(self._bfs(self.successors[source], self.successors))
+
+    def reaching(self, slug: str) -> List[str]:
+        """Every agent that can reach slug through delegation ("who can reach X")."""
+        target = self.node_id(slug)
+        return self._names(self._bfs(self.predecessors[target], self.predecessors))
+
+    def neighborhood(self, slug: str, depth: int) -> List[str]:
+        """slug plus every agent within depth delegation hops of it, in either direction."""
+        source = self.node_id(slug)
+        downstream = self._bfs([source], self.successors, depth)
+        upstream = self._bfs([source], self.predecessors, depth)
+        return self._names(set(downstream) | set(upstream))
+
+    def _cyclic_nodes(self) -> set:
+        """Nodes that can reach themselves (members of a cycle or self-loop)."""
+        cyclic = set()
+        for component in self.components():
+            if len(component) > 1 or component[0] in self.successors[component[0]]:
+                cyclic.update(component)
+        return cyclic
+
+    def transitive_closure(self, counts_only: bool = False) -> Dict[str, Any]:
+        """
+        Map every agent to the sorted agents it can reach (or, with
+        counts_only, to how many it can reach).
+
+        Computed once over the SCC condensation: components are visited in
+        reverse topological order and each one's reach set is the OR of its
+        successors' reach sets, stored as integer bitsets.
+        """
+        components = self.components()
+        component_of = self._component_of
+        member_bits = [0] * len(components)
+        for position, component in enumerate(components):
+            for node in component:
+                member_bits[position] |= 1 << node
+
+        cyclic = self._cyclic_nodes()
+        reach_bits = [0] * len(components)
+        for position, component in enumerate(components):
+            bits = member_bits[position] if component[0] in cyclic else 0
+            for node in component:
+                for target in self.successors[node]:
+                    target_component = component_of[target]
+                    if target_component != position:
+                        bits |= reach_bits[target_component] | member_bits[target_component]
+            reach_bits[position] = bits
+
+        closure = {}
+        for node, slug in enumerate(self.slugs):
+            bits = reach_bits[component_of[node]]
+            if counts_only:
+                closure[slug] = bin(bits).count('1')
+                continue
+            # Bit i of the set is node ID i; reversed binary digits index nodes
+            digits = bin(bits)[:1:-1]
+            closure[slug] = self._names(
+                position for position, digit in enumerate(digits) if digit == '1'
+            )
+        return dict(sorted(closure.items()))
+
+    def transitive_reduction(self) -> Dict[str, Any]:
+        """
+        Delegations that other paths already imply: dropping them leaves every
+        agent able to reach exactly the same agents.
+
+        Works on the SCC condensation in reverse topological order, with each
+        component's reach kept as an integer bitset of components. An edge
+        between two components is redundant when its target is also reachable
+        through another successor component, or when an earlier edge (by slug)
+        already connects the same two components. Edges inside a component,
+        i.e. cycles and self-loops, are always kept.
+        """
+        components = self.components()
+        component_of = self._component_of
+        by_slug = self.slugs.__getitem__
+        reach = [0] * len(components)  # components reachable from each, excluding itself
+        redundant = []
+        for position, component in enumerate(components):
+            first_edge: Dict[int, tuple] = {}  # successor component -> edge kept into it
+            for node in sorted(component, key=by_slug):
+                for target in sorted(self.successors[node], key=by_slug):
+                    target_component = component_of[target]
+                    if target_component == position:
+                        continue
+                    if target_component in first_edge:
+                        redundant.append((node, target))
+                    else:
+                        first_edge[target_component] = (node, target)
+            indirect = 0
+            for target_component in first_edge:
+                indirect |= reach[target_component]
+            direct = 0
+            for target_component, edge in first_edge.items():
+                if indirect >> target_component & 1:
+                    redundant.append(edge)
+                direct |= 1 << target_component
+            reach[position] = indirect | direct
+
+        edges = sum(len(targets) for targets in self.successors)
+        return {
+            'delegations': edges,
+            'kept': edges - len(redundant),
+            'redundant': sorted([self.slugs[source], self.slugs[target]] for source, target in redundant)
+        }
+
+    # -- Chains and fan-out ----------------------------------------------------
+
+    def longest_chain(self) -> Dict:
+        """
+        Longest delegation chain, measured in components of the condensation.
+
+        Cycles have no longest simple path, so each strongly connected
+        component counts as one step; cyclic steps list all their members.
+        """
+        components = self.components()
+        component_of = self._component_of
+        if not components:
+            return {'length': 0, 'chain': []}
+        # Ties are broken by the smallest member slug so output is deterministic
+        names = [min(self.slugs[node] for node in component) for component in components]
+        best_length = [1] * len(components)
+        best_next: List[Optional[int]] = [None] * len(components)
+
+        # Reverse topological order: successors are finalized before predecessors
+        for position, component in enumerate(components):
+            for node in component:
+                for target in self.successors[node]:
+                    target_component = component_of[target]
+                    if target_component == position:
+                        continue
+                    length = best_length[target_component] + 1
+                    current = best_next[position]
+                    if length > best_length[position] or (
+                        length == best_length[position]
+                        and current is not None
+                        and names[target_component] < names[current]
+                    ):
+                        best_length[position] = length
+                        best_next[position] = target_component
+
+        longest = max(best_length)
+        start = min(
+            (position for position in range(len(components)) if best_length[position] == longest),
+            key=lambda position: names[position]
+        )
+        chain = []
+        position: Optional[int] = start
+        while position is not None:
+            chain.append(self._names(components[position]))
+            position = best_next[position]
+        return {'length': len(chain), 'chain': chain}
+
+    def fanout(self, root: str) -> Dict:
+        """Breadth-first delegation levels below root and how deep they go."""
+        distance = self._bfs([self.node_id(root)], self.successors)
+        levels: Dict[int, List[int]] = {}
+        for node, depth in distance.items():
+            levels.setdefault(depth, []).append(node)
+        return {
+            'root': root,
+            'depth': max(levels) if levels else 0,
+            'reachable': len(distance) - 1,
+            'levels': [self._names(levels[depth]) for depth in sorted(levels)]
+        }
+
+    # -- Degrees and coverage --------------------------------------------------
+
+    def hotspots(self, top: int = 10) -> Dict:
+        """Agents with the highest in-degree (most delegated to) and out-degree."""
+        def ranking(adjacency: List[set]) -> List[Dict]:
+            ranked = sorted(
+                ((len(adjacency[node]), self.slugs[node]) for node in range(len(self.slugs))),
+                key=lambda item: (-item[0], item[1])
+            )
+            return [{'slug': slug, 'degree': degree} for degree, slug in ranked[:top] if degree > 0]
+        return {
+            'in_degree': ranking(self.predecessors),
+            'out_degree': ranking(self.successors)
+        }
+
+    def orphans(self) -> List[str]:
+        """Agents that neither delegate nor are delegated to."""
+        return self._names(
+            node for node in range(len(self.slugs))
+            if not self.successors[node] and not self.predecessors[node]
+        )
+
+    def default_roots(self) -> List[str]:
+        """The uber-orchestrator if present, otherwise every agent nobody delegates to."""
+        if DEFAULT_ROOT in self.graph.node_ids:
+            return [DEFAULT_ROOT]
+        return self._names(node for node in range(len(self.slugs)) if not self.predecessors[node])
+
+    def unreachable(self, roots: Optional[List[str]] = None) -> Dict:
+        """Agents that no delegation path from the roots ever reaches."""
+        roots = roots or self.default_roots()
+        reached = self._bfs([self.node_id(root) for root in roots], self.successors)
+        return {
+            'roots': roots,
+            'unreachable': self._names(node for node in range(len(self.slugs)) if node not in reached)
+        }
+
+    def summary(self) -> Dict:
+        """Headline numbers from every analysis."""
+        cycles = self.cycles()
+        chain = self.longest_chain()
+        unreachable = self.unreachable()
+        return {
+            'agents': len(self.slugs),
+            'delegations': sum(len(targets) for targets in self.successors),
+            'components': len(self.components()),
+            'cycles': len(cycles['cycles']),
+            'self_loops': len(cycles['self_loops']),
+            'longest_chain': chain['length'],
+            'orphans': len(self.orphans()),
+            'unreachable_from_roots': len(unreachable['unreachable']),
+            'roots': unreachable['roots']
+        }
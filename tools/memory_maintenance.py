@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Project Memory Maintenance
+
+The state scribe never hard-deletes project_memory rows and every write adds
+a change-log entry, so memory.db only grows. This command moves cold history
+into a separate archive database (memory-archive.db next to memory.db) and
+then compacts the live one:
+
+1. Archive soft-deleted project_memory rows, and change-log entries that a
+   newer entry for the same file supersedes, once they are older than the
+   retention window of their signal category (schemas/memory-retention.json).
+   The newest change-log entry of every file is always kept, so a consumer
+   catching up with changes_since(cursor, latest_only=True) still sees every
+   file's final state, deletions included.
+2. Rebuild the indexes (REINDEX) and refresh planner statistics (ANALYZE,
+   bounded by analysis_limit).
+3. Return free pages to the filesystem with PRAGMA incremental_vacuum in
+   short steps. Databases created before the store enabled
+   auto_vacuum=INCREMENTAL cannot do this until --migrate runs the one full,
+   exclusive VACUUM that switches them; routine runs never do it implicitly.
+
+Every step is a short transaction of its own, so WAL readers keep reading
+and writers wait at most one step. Archiving copies rows into the archive
+database first and only then deletes, from memory.db, rows present in the
+archive, so an interrupted run loses nothing and a rerun finishes the job.
+
+The report gives the database size (page_count * page_size, free pages
+included), the main file size and the WAL size separately, and the latency of
+typical orchestrator reads before and after. size_reduction_bytes compares
+database sizes, so a WAL that grew while archiving does not count against it.
+
+Usage:
+    python tools/memory_maintenance.py --dry-run
+    python tools/memory_maintenance.py
+    python tools/memory_maintenance.py --migrate
+    python tools/memory_maintenance.py --db memory.db --archive-db /backups/memory-archive.db --retention custom.json
+"""
+
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import statistics
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from project_memory import ProjectMemoryStore, RECORD_FIELDS
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_RETENTION_PATH = PROJECT_ROOT / 'schemas' / 'memory-retention.json'
+
+RETENTION_KEYS = ('deletedDays', 'historyDays')
+
+# Pages freed per incremental_vacuum step (one short write transaction each)
+VACUUM_STEP_PAGES = 2000
+
+# Rows sampled by ANALYZE per index; keeps it fast on large tables
+ANALYSIS_LIMIT = 1000
+
+MEMORY_COLUMNS = ['id'] + RECORD_FIELDS + ['version', 'timestamp']
+CHANGE_COLUMNS = ['seq', 'memory_id', 'operation'] + RECORD_FIELDS + ['version', 'timestamp']
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive.project_memory (
+    archive_id INTEGER PRIMARY KEY,
+    id INTEGER NOT NULL,
+    file_path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    memory_type TEXT,
+    signal_type TEXT NOT NULL,
+    signal_category TEXT NOT NULL,
+    brief_description TEXT,
+    elements_description TEXT,
+    rationale TEXT,
+    version INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    archived_at TEXT NOT NULL,
+    UNIQUE (file_path, version, timestamp)
+);
+CREATE TABLE IF NOT EXISTS archive.project_memory_changes (
+    seq INTEGER PRIMARY KEY,
+    memory_id INTEGER NOT NULL,
+    operation TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    memory_type TEXT,
+    signal_type TEXT NOT NULL,
+    signal_category TEXT NOT NULL,
+    brief_description TEXT,
+    elements_description TEXT,
+    rationale TEXT,
+    version INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    archived_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS archive.idx_archive_memory_path ON project_memory(file_path);
+CREATE INDEX IF NOT EXISTS archive.idx_archive_changes_path ON project_memory_changes(file_path, seq);
+"""
+
+# Candidate filters; ? = signal category, timestamp cutoff
+DELETED_WHERE = "m.status = 'deleted' AND m.signal_category = ? AND m.timestamp < ?"
+SUPERSEDED_WHERE = (
+    "c.signal_category = ? AND c.timestamp < ? AND c.seq < "
+    "(SELECT MAX(n.seq) FROM main.project_memory_changes n WHERE n.file_path = c.file_path)"
+)
+
+def load_retention(retention_path: Path = DEFAULT_RETENTION_PATH) -> Dict[str, Any]:
+    """
+    Load the retention table.
+
+    Raises ValueError if a window is not a non-negative number or null, or
+    uses an unknown key.
+    """
+    with open(retention_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    windows = {'default': config.get('default', {})}
+    windows.update(config.get('categories', {}))
+    for name, window in windows.items():
+        unknown = set(window) - set(RETENTION_KEYS)
+        if unknown:
+            raise ValueError(f"Retention '{name}' has unknown keys: {', '.join(sorted(unknown))}")
+        for key, days in window.items():
+            if days is not None and (isinstance(days, bool) or not isinstance(days, (int, float)) or days < 0):
+                raise ValueError(f"Retention '{name}'.{key} must be a non-negative number of days or null, got {days!r}")
+    return config
+
+def retention_for(config: Dict[str, Any], category: str) -> Dict[str, Optional[float]]:
+    """The deletedDays / historyDays windows of a category, falling back to the default."""
+    window = dict(config.get('default', {}))
+    window.update(config.get('categories', {}).get(category, {}))
+    return {key: window.get(key) for key in RETENTION_KEYS}
+
+def cutoff(now: datetime, days: Optional[float]) -> Optional[str]:
+    """ISO timestamp `days` before now, comparable with the timestamp column."""
+    if days is None:
+        return None
+    return (now - timedelta(days=days)).isoformat(timespec='seconds')
+
+def file_sizes(conn: sqlite3.Connection, db_path: Path) -> Dict[str, int]:
+    """
+    Database size in bytes from its page count (what the main file holds once
+    the WAL is checkpointed), the free pages within it, and the main file and
+    WAL file sizes on disk.
+    """
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    wal_path = Path(str(db_path) + '-wal')
+    return {
+        'database': conn.execute('PRAGMA page_count').fetchone()[0] * page_size,
+        'free': conn.execute('PRAGMA freelist_count').fetchone()[0] * page_size,
+        'main_file': db_path.stat().st_size,
+        'wal_file': wal_path.stat().st_size if wal_path.exists() else 0
+    }
+
+def _median_ms(run: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 3)
+
+def measure_reads(store: ProjectMemoryStore, repeat: int = 5, seed: int = 0) -> Dict[str, float]:
+    """Median latency (ms) of the reads an orchestrator makes each cycle."""
+    paths = [row[0] for row in store.conn.execute('SELECT file_path FROM project_memory')]
+    lookups = random.Random(seed).sample(paths, min(200, len(paths)))
+    return {
+        'active_records': _median_ms(lambda: store.query(status='active'), repeat),
+        'recent_50': _median_ms(lambda: store.query(limit=50), repeat),
+        'problem_signals': _median_ms(lambda: store.query(status='active', signal_category='problem'), repeat),
+        'get_200_paths': _median_ms(lambda: [store.get(path) for path in lookups], repeat),
+        'changes_latest_from_0': _median_ms(lambda: list(store.changes_since(0, latest_only=True)), repeat),
+        'stats': _median_ms(store.stats, repeat)
+    }
+
+class MemoryMaintenance:
+    """Archive, reindex, analyze and vacuum one memory.db."""
+
+    def __init__(self, store: ProjectMemoryStore, archive_path: Path, retention: Dict[str, Any]):
+        self.store = store
+        self.conn = store.conn
+        self.archive_path = archive_path
+        self.retention = retention
+
+    def _cutoffs(self, table: str, key: str, now: datetime) -> List[tuple]:
+        """(category, cutoff) for every category in table with a finite window."""
+        categories = [row[0] for row in self.conn.execute(f'SELECT DISTINCT signal_category FROM main.{table}')]
+        pairs = []
+        for category in sorted(categories):
+            limit = cutoff(now, retention_for(self.retention, category)[key])
+            if limit is not None:
+                pairs.append((category, limit))
+        return pairs
+
+    def plan(self, now: datetime) -> Dict[str, Dict[str, int]]:
+        """Rows each category would archive, without changing anything."""
+        planned: Dict[str, Dict[str, int]] = {}
+        for category, limit in self._cutoffs('project_memory', 'deletedDays', now):
+            count = self.conn.execute(
+                f'SELECT COUNT(*) FROM main.project_memory m WHERE {DELETED_WHERE}', (category, limit)
+            ).fetchone()[0]
+            planned.setdefault(category, {'deleted_records': 0, 'superseded_changes': 0})['deleted_records'] = count
+        for category, limit in self._cutoffs('project_memory_changes', 'historyDays', now):
+            count = self.conn.execute(
+                f'SELECT COUNT(*) FROM main.project_memory_changes c WHERE {SUPERSEDED_WHERE}', (category, limit)
+            ).fetchone()[0]
+            planned.setdefault(category, {'deleted_records': 0, 'superseded_changes': 0})['superseded_changes'] = count
+        return {category: counts for category, counts in planned.items() if any(counts.values())}
+
+    def _run(self, sql: str, params: tuple = ()) -> int:
+        """One statement in its own write transaction; returns the rows changed."""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            changed = self.conn.execute(sql, params).rowcount
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return changed
+
+    def archive(self, now: datetime) -> Dict[str, int]:
+        """
+        Copy expired rows into the archive database, then delete from
+        memory.db only the rows the archive holds. Each copy and each delete
+        is its own transaction on a single database.
+        """
+        self.conn.execute('ATTACH DATABASE ? AS archive', (str(self.archive_path),))
+        try:
+            self.conn.execute('PRAGMA archive.journal_mode=WAL')
+            self.conn.executescript(ARCHIVE_SCHEMA)
+            archived_at = now.isoformat(timespec='seconds')
+            counts = {'deleted_records': 0, 'superseded_changes': 0}
+            memory_columns = ', '.join(MEMORY_COLUMNS)
+            change_columns = ', '.join(CHANGE_COLUMNS)
+
+            for category, limit in self._cutoffs('project_memory', 'deletedDays', now):
+                self._run(
+                    f'INSERT OR IGNORE INTO archive.project_memory ({memory_columns}, archived_at) '
+                    f'SELECT {", ".join("m." + c for c in MEMORY_COLUMNS)}, ? FROM main.project_memory m '
+                    f'WHERE {DELETED_WHERE}',
+                    (archived_at, category, limit)
+                )
+                counts['deleted_records'] += self._run(
+                    f'DELETE FROM main.project_memory WHERE id IN ('
+                    f'SELECT m.id FROM main.project_memory m JOIN archive.project_memory a '
+                    f'ON a.file_path = m.file_path AND a.version = m.version AND a.timestamp = m.timestamp '
+                    f'WHERE {DELETED_WHERE})',
+                    (category, limit)
+                )
+
+            for category, limit in self._cutoffs('project_memory_changes', 'historyDays', now):
+                self._run(
+                    f'INSERT OR IGNORE INTO archive.project_memory_changes ({change_columns}, archived_at) '
+                    f'SELECT {", ".join("c." + col for col in CHANGE_COLUMNS)}, ? FROM main.project_memory_changes c '
+                    f'WHERE {SUPERSEDED_WHERE}',
+                    (archived_at, category, limit)
+                )
+                counts['superseded_changes'] += self._run(
+                    f'DELETE FROM main.project_memory_changes WHERE seq IN ('
+                    f'SELECT c.seq FROM main.project_memory_changes c '
+                    f'JOIN archive.project_memory_changes a ON a.seq = c.seq '
+                    f'WHERE {SUPERSEDED_WHERE})',
+                    (category, limit)
+                )
+        finally:
+            self.conn.execute('DETACH DATABASE archive')
+        return counts
+
+    def reindex_and_analyze(self) -> None:
+        for table in ('project_memory', 'project_memory_changes'):
+            self._run(f'REINDEX main.{table}')
+        self.conn.execute(f'PRAGMA analysis_limit={ANALYSIS_LIMIT}')
+        self._run('ANALYZE main')
+
+    def incremental(self) -> bool:
+        """True if the database is in auto_vacuum=INCREMENTAL mode."""
+        return self.conn.execute('PRAGMA auto_vacuum').fetchone()[0] == 2
+
+    def migrate(self) -> None:
+        """
+        Switch the database to auto_vacuum=INCREMENTAL with one full VACUUM.
+        The VACUUM rewrites the whole file and holds an exclusive lock while
+        it does, so it only runs when asked for (--migrate).
+        """
+        self.conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        self.conn.execute('VACUUM')
+
+    def vacuum(self, step_pages: int = VACUUM_STEP_PAGES, truncate_wal: bool = False) -> Dict[str, Any]:
+        """
+        Free pages in steps of step_pages. A database without
+        auto_vacuum=INCREMENTAL cannot free pages this way; it is left as is
+        (its free pages are reused by later writes) until migrate() runs.
+
+        The checkpoint afterwards is PASSIVE: it never waits for readers, and
+        the WAL file keeps its size for reuse. truncate_wal uses a TRUNCATE
+        checkpoint instead, which waits (up to the busy timeout) for readers
+        to finish and then empties the WAL file.
+        """
+        result: Dict[str, Any] = {'incremental': self.incremental(), 'steps': 0}
+        result['free_pages_before'] = self.conn.execute('PRAGMA freelist_count').fetchone()[0]
+        while result['incremental'] and self.conn.execute('PRAGMA freelist_count').fetchone()[0] > 0:
+            # incremental_vacuum frees one page per step of its statement, and
+            # execute() steps a statement without result columns only once;
+            # executescript() steps it to completion
+            self.conn.executescript(f'PRAGMA incremental_vacuum({step_pages})')
+            result['steps'] += 1
+        mode = 'TRUNCATE' if truncate_wal else 'PASSIVE'
+        busy, wal_frames, checkpointed = self.conn.execute(f'PRAGMA wal_checkpoint({mode})').fetchone()
+        result['checkpoint'] = {'busy': bool(busy), 'wal_frames': wal_frames, 'checkpointed': checkpointed}
+        return result
+
+def row_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    return {
+        table: conn.execute(f'SELECT COUNT(*) FROM main.{table}').fetchone()[0]
+        for table in ('project_memory', 'project_memory_changes')
+    }
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Archive expired project_memory history, reindex, analyze and vacuum memory.db'
+    )
+    parser.add_argument('--db', type=str, help='Database path (default: memory.db in the project root)')
+    parser.add_argument(
+        '--archive-db',
+        type=str,
+        help='Archive database path (default: memory-archive.db next to the database)'
+    )
+    parser.add_argument(
+        '--retention',
+        type=str,
+        default=str(DEFAULT_RETENTION_PATH),
+        help='Retention windows per signal category (default: schemas/memory-retention.json)'
+    )
+    parser.add_argument('--dry-run', action='store_true', help='Report what would be archived and exit')
+    parser.add_argument('--no-vacuum', action='store_true', help='Skip the vacuum step')
+    parser.add_argument(
+        '--migrate',
+        action='store_true',
+        help='Switch an older database to auto_vacuum=INCREMENTAL with one full VACUUM '
+             '(rewrites the file and blocks every reader and writer while it runs)'
+    )
+    parser.add_argument(
+        '--truncate-wal',
+        action='store_true',
+        help='Wait for active readers after vacuuming and empty the WAL file'
+    )
+    parser.add_argument(
+        '--vacuum-step',
+        type=int,
+        default=VACUUM_STEP_PAGES,
+        help=f'Pages freed per incremental vacuum transaction (default: {VACUUM_STEP_PAGES})'
+    )
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions per read query (default: 5)')
+    args = parser.parse_args()
+
+    db_path = Path(args.db) if args.db else PROJECT_ROOT / 'memory.db'
+    archive_path = Path(args.archive_db) if args.archive_db else db_path.with_name(f'{db_path.stem}-archive.db')
+    if not db_path.exists():
+        print(json.dumps({'error': f'No database at {db_path}'}), file=sys.stderr)
+        sys.exit(1)
+    try:
+        retention = load_retention(Path(args.retention))
+    except (OSError, ValueError) as e:
+        print(json.dumps({'error': f'Invalid retention config: {e}'}), file=sys.stderr)
+        sys.exit(1)
+
+    now = datetime.now(timezone.utc)
+    with ProjectMemoryStore(db_path) as store:
+        maintenance = MemoryMaintenance(store, archive_path, retention)
+        if args.dry_run:
+            print(json.dumps({'database': str(db_path), 'rows': row_counts(store.conn),
+                              'incremental_vacuum': maintenance.incremental(),
+                              'would_archive': maintenance.plan(now)}, indent=2))
+            return
+
+        before = {'sizes': file_sizes(store.conn, db_path), 'rows': row_counts(store.conn),
+                  'read_ms': measure_reads(store, args.repeat)}
+        timings = {}
+        start = time.perf_counter()
+        archived = maintenance.archive(now)
+        timings['archive'] = time.perf_counter() - start
+        start = time.perf_counter()
+        maintenance.reindex_and_analyze()
+        timings['reindex_analyze'] = time.perf_counter() - start
+        migrated = False
+        if args.migrate and not maintenance.incremental():
+            start = time.perf_counter()
+            maintenance.migrate()
+            timings['migrate'] = time.perf_counter() - start
+            migrated = True
+        vacuum = None
+        if not args.no_vacuum:
+            start = time.perf_counter()
+            vacuum = maintenance.vacuum(args.vacuum_step, args.truncate_wal)
+            timings['vacuum'] = time.perf_counter() - start
+        after = {'sizes': file_sizes(store.conn, db_path), 'rows': row_counts(store.conn),
+                 'read_ms': measure_reads(store, args.repeat)}
+
+    report = {
+        'database': str(db_path),
+        'archive': str(archive_path),
+        'archived': archived,
+        'migrated': migrated,
+        'vacuum': vacuum,
+        'seconds': {step: round(seconds, 3) for step, seconds in timings.items()},
+        'before': before,
+        'after': after,
+        'size_reduction_bytes': before['sizes']['database'] - after['sizes']['database'],
+        'read_speedup': {
+            query: round(before['read_ms'][query] / after['read_ms'][query], 2) if after['read_ms'][query] else None
+            for query in before['read_ms']
+        }
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Project Memory Write Queue
+
+A small local asyncio service that owns the only write connection to
+memory.db. Agents and tools send it project_memory upserts and soft deletes
+instead of opening the database and committing per row, which under
+concurrent writers ends in SQLITE_BUSY errors and lock convoys.
+
+Pending writes are keyed by file path, so several writes to one path before
+a commit coalesce: the newest upsert wins, and a delete after an upsert is
+applied after it in the same transaction. Pending paths are committed
+together by ProjectMemoryStore.write_batch() when --batch-size distinct
+paths are waiting or --max-delay-ms after the first one arrived, whichever
+comes first. Each request is acknowledged only once its transaction has
+committed (or has failed). Records with unknown or non-scalar fields are
+rejected before they are queued, and if a batch still fails its paths are
+retried one at a time, so only the offending request gets the error.
+
+Protocol: newline-delimited JSON over a unix socket (default
+.cache/memory-writer.sock) or localhost TCP. Requests may be pipelined;
+every response echoes the request's id.
+
+    {"id": 1, "op": "upsert", "record": {"file_path": "src/app.py", ...}}
+    {"id": 2, "op": "delete", "file_path": "src/old.py", "signal_type": "...", "signal_category": "..."}
+    {"id": 3, "op": "stats"}
+    -> {"id": 1, "ok": true, "batch": 37, "coalesced": 1}
+
+Usage:
+    python tools/memory_writer.py serve
+    python tools/memory_writer.py serve --port 8765 --batch-size 512 --max-delay-ms 2
+    python tools/memory_writer.py upsert records.jsonl
+    python tools/memory_writer.py delete src/old_module.py
+    python tools/memory_writer.py stats
+"""
+
+import sys
+import json
+import signal
+import socket
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from project_memory import (
+    ProjectMemoryStore,
+    RECORD_FIELDS,
+    DEFAULT_SIGNAL_TYPE,
+    DEFAULT_SIGNAL_CATEGORY,
+    read_records
+)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_SOCKET = PROJECT_ROOT / '.cache' / 'memory-writer.sock'
+
+# Group-commit triggers: distinct pending paths, and seconds since the first.
+# With no delay a batch commits as soon as the previous one has; writes that
+# arrive during a commit form the next batch.
+BATCH_SIZE = 256
+MAX_DELAY = 0.0
+
+# Requests a client keeps in flight before it reads acknowledgements. Without
+# a bound, a large send fills both socket buffers and client and server block
+# on their writes forever.
+SEND_WINDOW = 1000
+
+# Fields an upserted record may carry; write_batch also honours a timestamp
+UPSERT_FIELDS = set(RECORD_FIELDS) | {'timestamp'}
+
+class PendingWrite:
+    """The coalesced writes to one path waiting for the next commit."""
+
+    __slots__ = ('upsert', 'delete', 'waiters')
+
+    def __init__(self):
+        self.upsert: Optional[Dict[str, Any]] = None
+        self.delete: Optional[Tuple[str, str]] = None
+        self.waiters: List[asyncio.Future] = []
+
+class WriteQueue:
+    """
+    Coalescing group-commit queue in front of a ProjectMemoryStore.
+
+    The store is opened and used on one dedicated thread, so the event loop
+    keeps accepting requests while a batch commits; whatever arrives during
+    the commit forms the next batch.
+    """
+
+    def __init__(self, db_path: Path, batch_size: int = BATCH_SIZE, max_delay: float = MAX_DELAY):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.pending: Dict[str, PendingWrite] = {}
+        self.stats = {'requests': 0, 'coalesced': 0, 'batches': 0, 'paths_committed': 0, 'failed_batches': 0}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='memory-writer')
+        self._store: Optional[ProjectMemoryStore] = None
+        self._wakeup = asyncio.Event()
+        self._full = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._store = await loop.run_in_executor(self._executor, ProjectMemoryStore, self.db_path)
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Commit whatever is pending, then close the store."""
+        self._closing = True
+        self._wakeup.set()
+        self._full.set()
+        if self._task is not None:
+            await self._task
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._store.close)
+        self._executor.shutdown()
+
+    def _enqueue(self, file_path: str) -> Tuple[PendingWrite, asyncio.Future]:
+        if self._closing:
+            raise RuntimeError('Write queue is shutting down')
+        self.stats['requests'] += 1
+        entry = self.pending.get(file_path)
+        if entry is None:
+            entry = self.pending[file_path] = PendingWrite()
+            if len(self.pending) >= self.batch_size:
+                self._full.set()
+        else:
+            self.stats['coalesced'] += 1
+        future = asyncio.get_running_loop().create_future()
+        entry.waiters.append(future)
+        self._wakeup.set()
+        return entry, future
+
+    def upsert(self, record: Dict[str, Any]) -> asyncio.Future:
+        """Queue an upsert; the future resolves to its acknowledgement."""
+        entry, future = self._enqueue(record['file_path'])
+        entry.upsert = record
+        entry.delete = None
+        return future
+
+    def delete(
+        self,
+        file_path: str,
+        signal_type: str = DEFAULT_SIGNAL_TYPE,
+        signal_category: str = DEFAULT_SIGNAL_CATEGORY
+    ) -> asyncio.Future:
+        """Queue a soft delete; the future resolves to its acknowledgement."""
+        entry, future = self._enqueue(file_path)
+        entry.delete = (signal_type, signal_category)
+        return future
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            if not self.max_delay:
+                # Let requests already read from the sockets join this batch
+                await asyncio.sleep(0)
+            elif not self._full.is_set():
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            self._full.clear()
+            batch, self.pending = self.pending, {}
+            if batch:
+                await self._commit(batch)
+            if self._closing and not self.pending:
+                return
+
+    async def _write(self, batch: Dict[str, PendingWrite]) -> Optional[str]:
+        """Commit batch in one transaction; the error message if it failed."""
+        records = [entry.upsert for entry in batch.values() if entry.upsert is not None]
+        deletions = [(path,) + entry.delete for path, entry in batch.items() if entry.delete is not None]
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, self._store.write_batch, records, deletions)
+        except Exception as e:
+            return f'{type(e).__name__}: {e}'
+        return None
+
+    async def _commit(self, batch: Dict[str, PendingWrite]) -> None:
+        error = await self._write(batch)
+        if error is None:
+            self.stats['batches'] += 1
+            self.stats['paths_committed'] += len(batch)
+            acks = {path: {'ok': True, 'batch': len(batch)} for path in batch}
+        elif len(batch) == 1:
+            self.stats['failed_batches'] += 1
+            acks = {path: {'ok': False, 'error': error} for path in batch}
+        else:
+            # One bad write must not fail everyone else's: retry path by path,
+            # so only the offending requests are rejected
+            self.stats['failed_batches'] += 1
+            acks = {}
+            for path, entry in batch.items():
+                error = await self._write({path: entry})
+                if error is None:
+                    self.stats['paths_committed'] += 1
+                    acks[path] = {'ok': True, 'batch': 1}
+                else:
+                    acks[path] = {'ok': False, 'error': error}
+        for path, entry in batch.items():
+            for future in entry.waiters:
+                if not future.done():
+                    future.set_result({**acks[path], 'coalesced': len(entry.waiters)})
+
+def _request_error(request: Any) -> Optional[str]:
+    """Why a decoded request is malformed, or None."""
+    if not isinstance(request, dict):
+        return 'Request must be a JSON object'
+    op = request.get('op')
+    if op == 'upsert':
+        record = request.get('record')
+        if not isinstance(record, dict) or not isinstance(record.get('file_path'), str):
+            return "upsert needs a 'record' object with a string 'file_path'"
+        unknown = sorted(set(record) - UPSERT_FIELDS)
+        if unknown:
+            return f"Unknown record fields: {', '.join(unknown)}"
+        for field, value in record.items():
+            if value is not None and not isinstance(value, (str, int, float)):
+                return f"Record field '{field}' must be a string, number or null"
+    elif op == 'delete':
+        if not isinstance(request.get('file_path'), str):
+            return "delete needs a string 'file_path'"
+        for field in ('signal_type', 'signal_category'):
+            if request.get(field) is not None and not isinstance(request[field], str):
+                return f"delete '{field}' must be a string"
+    elif op != 'stats':
+        return f"Unknown op {op!r} (expected upsert, delete or stats)"
+    return None
+
+class WriterServer:
+    """NDJSON front end for a WriteQueue on a unix socket or localhost port."""
+
+    def __init__(self, queue: WriteQueue):
+        self.queue = queue
+
+    async def _respond(self, writer: asyncio.StreamWriter, request_id: Any, future: asyncio.Future) -> None:
+        ack = await future
+        if not writer.is_closing():
+            writer.write((json.dumps({'id': request_id, **ack}) + '\n').encode())
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        responses = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    request, error = None, f'Invalid JSON: {e}'
+                else:
+                    error = _request_error(request)
+                request_id = request.get('id') if isinstance(request, dict) else None
+                if error is None and request['op'] == 'stats':
+                    writer.write((json.dumps({'id': request_id, 'ok': True, **self.queue.stats}) + '\n').encode())
+                elif error is None:
+                    try:
+                        if request['op'] == 'upsert':
+                            future = self.queue.upsert(request['record'])
+                        else:
+                            future = self.queue.delete(
+                                request['file_path'],
+                                request.get('signal_type') or DEFAULT_SIGNAL_TYPE,
+                                request.get('signal_category') or DEFAULT_SIGNAL_CATEGORY
+                            )
+                    except RuntimeError as e:
+                        error = str(e)
+                    else:
+                        task = asyncio.create_task(self._respond(writer, request_id, future))
+                        responses.add(task)
+                        task.add_done_callback(responses.discard)
+                if error is not None:
+                    writer.write((json.dumps({'id': request_id, 'ok': False, 'error': error}) + '\n').encode())
+                await writer.drain()
+            # Client finished sending: deliver the remaining acknowledgements
+            if responses:
+                await asyncio.gather(*responses)
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(
+    db_path: Path,
+    socket_path: Optional[Path],
+    port: Optional[int],
+    batch_size: int,
+    max_delay: float
+) -> None:
+    queue = WriteQueue(db_path, batch_size, max_delay)
+    await queue.start()
+    server_front = WriterServer(queue)
+    if port is not None:
+        server = await asyncio.start_server(server_front.handle, '127.0.0.1', port)
+        address = f'127.0.0.1:{port}'
+    else:
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if socket_path.exists():
+            socket_path.unlink()
+        server = await asyncio.start_unix_server(server_front.handle, str(socket_path))
+        address = str(socket_path)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+    print(json.dumps({'listening': address, 'database': str(db_path),
+                      'batch_size': batch_size, 'max_delay_ms': max_delay * 1000}), flush=True)
+
+    await stop.wait()
+    server.close()
+    await server.wait_closed()
+    await queue.close()
+    if port is None and socket_path.exists():
+        socket_path.unlink()
+    print(json.dumps({'stopped': address, **queue.stats}), flush=True)
+
+class MemoryWriterClient:
+    """Blocking client for the write queue; requests can be pipelined with send_many()."""
+
+    def __init__(self, socket_path: Optional[Path] = DEFAULT_SOCKET, port: Optional[int] = None, timeout: float = 60.0):
+        if port is not None:
+            self.sock = socket.create_connection(('127.0.0.1', port), timeout=timeout)
+        else:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(str(socket_path))
+        self.stream = self.sock.makefile('rwb')
+        self.next_id = 0
+
+    def close(self) -> None:
+        self.stream.close()
+        self.sock.close()
+
+    def __enter__(self) -> 'MemoryWriterClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _read_ack(self) -> Dict[str, Any]:
+        line = self.stream.readline()
+        if not line:
+            raise ConnectionError('Write queue closed the connection')
+        return json.loads(line)
+
+    def send_many(self, requests: Iterable[Dict[str, Any]], window: int = SEND_WINDOW) -> List[Dict[str, Any]]:
+        """
+        Pipeline requests with at most window of them unacknowledged; return
+        their acks in request order.
+        """
+        ids = []
+        acks = {}
+        for request in requests:
+            if len(ids) - len(acks) >= window:
+                self.stream.flush()
+                ack = self._read_ack()
+                acks[ack.get('id')] = ack
+            self.next_id += 1
+            ids.append(self.next_id)
+            self.stream.write((json.dumps({**request, 'id': self.next_id}) + '\n').encode())
+        self.stream.flush()
+        while len(acks) < len(ids):
+            ack = self._read_ack()
+            acks[ack.get('id')] = ack
+        return [acks[request_id] for request_id in ids]
+
+    def request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return self.send_many([request])[0]
+
+    def upsert(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Upsert one record and wait until it is committed."""
+        return self.request({'op': 'upsert', 'record': record})
+
+    def delete(
+        self,
+        file_path: str,
+        signal_type: str = DEFAULT_SIGNAL_TYPE,
+        signal_category: str = DEFAULT_SIGNAL_CATEGORY
+    ) -> Dict[str, Any]:
+        """Soft-delete one record and wait until it is committed."""
+        return self.request({'op': 'delete', 'file_path': file_path,
+                             'signal_type': signal_type, 'signal_category': signal_category})
+
+def summarize(acks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    failed = [ack for ack in acks if not ack.get('ok')]
+    return {
+        'acknowledged': len(acks) - len(failed),
+        'failed': len(failed),
+        'errors': sorted({ack.get('error') for ack in failed})
+    }
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Batching write queue for project_memory in memory.db'
+    )
+    parser.add_argument('--socket', type=str, help='Unix socket path (default: .cache/memory-writer.sock)')
+    parser.add_argument('--port', type=int, help='Use localhost TCP on this port instead of a unix socket')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Run the write queue service')
+    serve_parser.add_argument('--db', type=str, help='Database path (default: memory.db in the project root)')
+    serve_parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                              help=f'Commit once this many distinct paths are pending (default: {BATCH_SIZE})')
+    serve_parser.add_argument('--max-delay-ms', type=float, default=MAX_DELAY * 1000,
+                              help=f'Commit at most this long after the first pending write (default: {MAX_DELAY * 1000:g})')
+
+    upsert_parser = subparsers.add_parser('upsert', help='Send records from a JSON or JSONL file')
+    upsert_parser.add_argument('source', help="Records file, or '-' for stdin")
+
+    delete_parser = subparsers.add_parser('delete', help='Soft-delete records (status=deleted)')
+    delete_parser.add_argument('paths', nargs='+', help='File paths to mark deleted')
+    delete_parser.add_argument('--signal-type', default=DEFAULT_SIGNAL_TYPE)
+    delete_parser.add_argument('--signal-category', default=DEFAULT_SIGNAL_CATEGORY)
+
+    subparsers.add_parser('stats', help='Queue counters of the running service')
+
+    args = parser.parse_args()
+    socket_path = Path(args.socket) if args.socket else DEFAULT_SOCKET
+
+    if args.command == 'serve':
+        if args.batch_size < 1 or args.max_delay_ms < 0:
+            parser.error('--batch-size must be at least 1 and --max-delay-ms non-negative')
+        db_path = Path(args.db) if args.db else PROJECT_ROOT / 'memory.db'
+        asyncio.run(serve(db_path, socket_path, args.port, args.batch_size, args.max_delay_ms / 1000))
+        return
+
+    records: List[Dict[str, Any]] = []
+    if args.command == 'upsert':
+        # Check the whole input before sending any of it
+        try:
+            records = read_records(args.source)
+        except (OSError, ValueError) as e:
+            print(json.dumps({'error': str(e)}), file=sys.stderr)
+            sys.exit(1)
+    try:
+        client = MemoryWriterClient(socket_path, args.port)
+    except OSError as e:
+        print(json.dumps({'error': f'Write queue not reachable: {e}'}), file=sys.stderr)
+        sys.exit(1)
+    with client:
+        if args.command == 'upsert':
+            acks = client.send_many({'op': 'upsert', 'record': record} for record in records)
+            result: Dict[str, Any] = summarize(acks)
+        elif args.command == 'delete':
+            acks = client.send_many(
+                {'op': 'delete', 'file_path': path, 'signal_type': args.signal_type,
+                 'signal_category': args.signal_category}
+                for path in args.paths
+            )
+            result = summarize(acks)
+        else:
+            result = client.request({'op': 'stats'})
+            result.pop('id', None)
+    print(json.dumps(result, indent=2))
+    if result.get('failed'):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -1,57 +1,229 @@
 #!/usr/bin/env python3
 """
 Merge all agent YAML files into RooCode's custom_modes.yaml
+
+The merge is incremental: a manifest records each agent file's stat, content
+hash and serialized YAML fragment, so only changed agents are re-serialized,
+an unchanged corpus is detected from stat() calls alone, and the output is
+only rewritten (atomically, via temp file + rename) when its bytes change.
+
+Shared prompt fragment includes ({{> name}}, see agent_fragments.py) are
+expanded in the output. Editing a file in agents/fragments/ re-serializes
+every agent.
+
+Usage:
+    python tools/merge-agents.py
+    python tools/merge-agents.py --output build/custom_modes.yaml
+    python tools/merge-agents.py --force
+    python tools/merge-agents.py --profile
 """
 
-import yaml
 import os
+import sys
+import marshal
+import argparse
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import profiling
+from agent_fragments import library_for
+from agent_registry import load_registry
+
+# Bump when the manifest layout or the serialization options change
+MANIFEST_VERSION = 2
+
+MANIFEST_ENTRY_KEYS = {'stat', 'digest', 'fragments'}
+
+# yaml.dump options for the merged file; fragments must use the same ones
+DUMP_OPTIONS = dict(default_flow_style=False, allow_unicode=True, width=120, sort_keys=False)
+
+def default_output_path() -> Path:
+    """RooCode's global custom_modes.yaml location for the current platform."""
+    settings = Path('Code') / 'User' / 'globalStorage' / 'rooveterinaryinc.roo-cline' / 'settings' / 'custom_modes.yaml'
+    if sys.platform == 'win32':
+        base = Path(os.environ.get('APPDATA', Path.home() / 'AppData' / 'Roaming'))
+    elif sys.platform == 'darwin':
+        base = Path.home() / 'Library' / 'Application Support'
+    else:
+        base = Path(os.environ.get('XDG_CONFIG_HOME', Path.home() / '.config'))
+    return base / settings
 
-def merge_agents():
-    # Define paths
-    agents_dir = Path('agents')
-    output_file = Path('../../../AppData/Roaming/Code/User/globalStorage/rooveterinaryinc.roo-cline/settings/custom_modes.yaml')
-    
-    # Get all YAML files in agents directory
+def serialize_mode(mode: Dict) -> str:
+    """
+    Serialize one mode as a top-level sequence item.
+
+    Block sequences under a mapping key are not indented by PyYAML, so these
+    fragments concatenated after 'customModes:' are byte-identical to dumping
+    the whole merged document at once.
+    """
+    import yaml
+
+    return yaml.dump([mode], **DUMP_OPTIONS)
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def load_manifest(manifest_path: Path) -> Dict:
+    """
+    Read the merge manifest, returning an empty one if missing, stale or
+    malformed. It is stored with marshal, which only builds plain data.
+    """
+    try:
+        with open(manifest_path, 'rb') as f:
+            manifest = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        manifest = None
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get('version') != MANIFEST_VERSION
+        or not isinstance(manifest.get('files'), dict)
+        or not all(isinstance(entry, dict) and entry.keys() == MANIFEST_ENTRY_KEYS
+                   for entry in manifest['files'].values())
+    ):
+        manifest = {'version': MANIFEST_VERSION, 'files': {}}
+    return manifest
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write data to path via a temp file in the same directory and a rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    import tempfile
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def merge_agents(agents_dir: Path, output_file: Path, manifest_path: Path, force: bool = False) -> int:
+    """Merge agents_dir into output_file, doing only the work that changed."""
     agent_files = sorted(agents_dir.glob('*.yaml'))
-    
     print(f"Found {len(agent_files)} agent files")
-    
-    # Collect all agent definitions
-    all_agents = []
-    
-    for agent_file in agent_files:
-        print(f"Processing {agent_file.name}...")
-        with open(agent_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+
+    manifest = {'version': MANIFEST_VERSION, 'files': {}} if force else load_manifest(manifest_path)
+    output_key = os.path.abspath(output_file)
+    with profiling.phase('stat'):
+        stats = {os.path.abspath(path): _stat_key(path) for path in agent_files}
+        shared_fragments = library_for(agents_dir).stat_key()
+    if manifest.get('shared_fragments') != shared_fragments:
+        # Any agent may include the edited fragment
+        manifest['files'] = {}
+
+    # Fast path: nothing touched since the last merge into this same output
+    if (
+        manifest.get('output') == output_key
+        and manifest.get('shared_fragments') == shared_fragments
+        and list(manifest['files']) == list(stats)
+        and all(manifest['files'][key]['stat'] == stat for key, stat in stats.items())
+        and manifest.get('output_stat') is not None
+        and manifest.get('output_stat') == _stat_key(output_file)
+    ):
+        count = manifest['count']
+        print(f"\n✓ Output already up to date ({count} agents): {output_file}")
+        return count
+
+    # Collect serialized fragments, re-serializing only changed files
+    with profiling.phase('registry_load'):
+        registry = load_registry(agents_dir)
+    files = {}
+    fragments: List[str] = []
+    reserialized = 0
+
+    for agent_file, data, error in registry.iter_documents():
+        if error is not None:
+            raise error
+        key = os.path.abspath(agent_file)
+        digest = registry.digest(agent_file)
+        previous = manifest['files'].get(key)
+        if previous is not None and previous['digest'] == digest:
+            file_fragments = previous['fragments']
+        else:
+            print(f"Processing {agent_file.name}...")
+            file_fragments = []
             if 'customModes' in data and isinstance(data['customModes'], list):
                 # Each file should have one agent in the customModes array
-                all_agents.extend(data['customModes'])
-    
-    # Create the merged structure
-    merged_data = {
-        'customModes': all_agents
-    }
-    
-    # Write to output file
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        yaml.dump(merged_data, f, default_flow_style=False, allow_unicode=True, width=120, sort_keys=False)
-    
-    print(f"\n✓ Successfully merged {len(all_agents)} agents into {output_file}")
+                with profiling.phase('serialize', agent_file):
+                    file_fragments = [serialize_mode(mode) for mode in data['customModes']]
+            reserialized += 1
+        files[key] = {'stat': stats.get(key), 'digest': digest, 'fragments': file_fragments}
+        fragments.extend(file_fragments)
+
+    if fragments:
+        content = ('customModes:\n' + ''.join(fragments)).encode('utf-8')
+    else:
+        import yaml
+
+        content = yaml.dump({'customModes': []}, **DUMP_OPTIONS).encode('utf-8')
+
+    # Skip the write when the output would be byte-identical
+    with profiling.phase('write'):
+        try:
+            unchanged = output_file.read_bytes() == content
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            atomic_write(output_file, content)
+
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'output': output_key,
+            'output_stat': _stat_key(output_file),
+            'count': len(fragments),
+            'shared_fragments': shared_fragments,
+            'files': files
+        }
+        atomic_write(manifest_path, marshal.dumps(manifest))
+
+    print(f"\nRe-serialized {reserialized} of {len(agent_files)} agent files")
+    if unchanged:
+        print(f"✓ Output unchanged ({len(fragments)} agents), skipped write: {output_file}")
+    else:
+        print(f"✓ Successfully merged {len(fragments)} agents into {output_file}")
     print(f"  File: {output_file.absolute()}")
-    
-    return len(all_agents)
+
+    return len(fragments)
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Merge all agent YAML files into RooCode's custom_modes.yaml"
+    )
+    parser.add_argument(
+        '--output', '-o',
+        type=str,
+        help=f'Output file path (default: {default_output_path()})'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Ignore the merge manifest and re-serialize every agent'
+    )
+    profiling.add_profiling_arguments(parser)
+
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    agents_dir = project_root / 'agents'
+    output_file = Path(args.output) if args.output else default_output_path()
+    manifest_path = project_root / '.cache' / 'merge-manifest.marshal'
+
     print("="*70)
     print("AI Agent Orchestration System - Agent Merger")
     print("="*70)
     print()
-    
-    count = merge_agents()
-    
+
+    with profiling.session('merge-agents', args):
+        count = merge_agents(agents_dir, output_file, manifest_path, args.force)
+
     print()
     print("="*70)
     print(f"Merge complete: {count} agents now available in RooCode")
-    print("="*70)
\ No newline at end of file
+    print("="*70)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Phase Timing & Profiling
+
+Shared instrumentation for the CLI tools. Code marks its phases with
+
+    with profiling.phase('validate', item=yaml_path):
+        ...
+
+and, when a tool runs with --profile or --timings-json, every phase records
+its wall time, aggregated per phase name and per item (file or agent), so the
+slowest files can be reported. With profiling off, phase() returns a shared
+no-op context manager.
+
+--profile-memory adds each phase's peak traced memory (tracemalloc). Tracing
+slows allocation-heavy code such as pure-Python YAML dumping several times
+over, so it is opt-in; the process peak RSS is always reported. Nested phases
+each report their own peak, and a parent's peak includes its children. Pool
+workers record into their own profiler and send the records back with their
+results (see drain() and merge()). --cprofile PATH also dumps a cProfile of
+the main process for snakeviz / pstats.
+
+Usage:
+    parser = argparse.ArgumentParser()
+    profiling.add_profiling_arguments(parser)
+    args = parser.parse_args()
+    with profiling.session('validate-agents', args):
+        ...
+"""
+
+import sys
+import json
+import time
+import argparse
+import cProfile
+import tracemalloc
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# (phase name, item, seconds, peak bytes) as exchanged with pool workers
+PhaseRecord = Tuple[str, Optional[str], float, int]
+
+_NULL_CONTEXT = nullcontext()
+
+class Profiler:
+    """Collects per-phase wall time and peak memory for one tool run."""
+
+    def __init__(self, tool: str, enabled: bool = True, trace_memory: bool = False):
+        self.tool = tool
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        # name -> [calls, total seconds, max seconds, peak bytes]
+        self.phases: Dict[str, List[float]] = {}
+        # item -> {phase name -> seconds}
+        self.items: Dict[str, Dict[str, float]] = {}
+        self.records: List[PhaseRecord] = []
+        self.keep_records = False
+        self._stack: List[List[int]] = []  # [start traced bytes, max peak seen by children]
+        self._started = time.perf_counter()
+        self._owns_tracemalloc = False
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def stop(self) -> float:
+        """Stop tracing and return the wall time since start()."""
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        return time.perf_counter() - self._started
+
+    @contextmanager
+    def _measure(self, name: str, item: Optional[str]) -> Iterator[None]:
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            self._stack.append([current, 0])
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            peak_bytes = 0
+            if self.trace_memory:
+                start_bytes, child_peak = self._stack.pop()
+                peak = max(child_peak, tracemalloc.get_traced_memory()[1])
+                peak_bytes = max(0, peak - start_bytes)
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+            self.add(name, item, elapsed, peak_bytes)
+
+    def phase(self, name: str, item: Any = None):
+        """Context manager timing one phase; item names the file or agent it worked on."""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._measure(name, None if item is None else str(item))
+
+    def add(self, name: str, item: Optional[str], seconds: float, peak_bytes: int = 0) -> None:
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = [0, 0.0, 0.0, 0]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+        stats[3] = max(stats[3], peak_bytes)
+        if item is not None:
+            phases = self.items.setdefault(item, {})
+            phases[name] = phases.get(name, 0.0) + seconds
+        if self.keep_records:
+            self.records.append((name, item, seconds, peak_bytes))
+
+    def drain(self) -> List[PhaseRecord]:
+        """Return and clear the raw records (used by pool workers)."""
+        records, self.records = self.records, []
+        return records
+
+    def merge(self, records: List[PhaseRecord]) -> None:
+        """Fold records drained from another process into this profiler."""
+        for name, item, seconds, peak_bytes in records:
+            self.add(name, item, seconds, peak_bytes)
+
+    def slowest_items(self, top: int = 10) -> List[Dict]:
+        """The items with the most time spent across all their phases."""
+        ranked = sorted(self.items.items(), key=lambda entry: (-sum(entry[1].values()), entry[0]))
+        return [
+            {
+                'item': item,
+                'seconds': sum(phases.values()),
+                'phases': dict(sorted(phases.items(), key=lambda entry: -entry[1]))
+            }
+            for item, phases in ranked[:top]
+        ]
+
+    def to_dict(self, wall_seconds: float, top: int = 10) -> Dict:
+        return {
+            'tool': self.tool,
+            'wall_seconds': wall_seconds,
+            'peak_rss_bytes': peak_rss_bytes(),
+            'memory_traced': self.trace_memory,
+            'phases': {
+                name: {
+                    'calls': int(calls),
+                    'total_seconds': total,
+                    'mean_seconds': total / calls if calls else 0.0,
+                    'max_seconds': longest,
+                    'peak_bytes': int(peak)
+                }
+                for name, (calls, total, longest, peak) in sorted(
+                    self.phases.items(), key=lambda entry: -entry[1][1]
+                )
+            },
+            'slowest': self.slowest_items(top)
+        }
+
+    def report(self, wall_seconds: float, top: int = 10, file=sys.stderr) -> None:
+        """Print the phase table and the slowest items."""
+        data = self.to_dict(wall_seconds, top)
+        rss = data['peak_rss_bytes']
+        rss_text = f", peak RSS {rss / 1e6:.1f} MB" if rss is not None else ''
+        print(f"\nProfile ({self.tool}): {wall_seconds * 1000:.1f} ms wall{rss_text}", file=file)
+        header = f"{'Phase':<32} {'Calls':>7} {'Total ms':>10} {'Mean ms':>9} {'Max ms':>9}"
+        print(header + (f" {'Peak MB':>9}" if self.trace_memory else ''), file=file)
+        for name, stats in data['phases'].items():
+            row = (
+                f"{name:<32} {stats['calls']:>7} {stats['total_seconds'] * 1000:10.1f} "
+                f"{stats['mean_seconds'] * 1000:9.2f} {stats['max_seconds'] * 1000:9.2f}"
+            )
+            if self.trace_memory:
+                row += f" {stats['peak_bytes'] / 1e6:9.2f}"
+            print(row, file=file)
+        if data['slowest']:
+            print(f"\nSlowest {len(data['slowest'])}:", file=file)
+            for entry in data['slowest']:
+                breakdown = ', '.join(
+                    f"{name} {seconds * 1000:.1f}" for name, seconds in entry['phases'].items() if seconds >= 5e-5
+                )
+                print(f"{entry['seconds'] * 1000:9.1f} ms  {_display(entry['item'])}  ({breakdown})", file=file)
+
+def _display(item: str) -> str:
+    """Show file items relative to the working directory when they are inside it."""
+    path = Path(item)
+    if path.is_absolute():
+        try:
+            return str(path.relative_to(Path.cwd()))
+        except ValueError:
+            pass
+    return item
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of this process, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+# The profiler phase() calls record into; disabled unless a tool installs one
+_active = Profiler('disabled', enabled=False)
+_cprofile: Optional[cProfile.Profile] = None
+
+def install(profiler: Profiler) -> Profiler:
+    """Make profiler the target of module-level phase() calls."""
+    global _active
+    _active = profiler
+    return profiler
+
+def active() -> Profiler:
+    return _active
+
+def phase(name: str, item: Any = None):
+    """Time a phase on the installed profiler (no-op when profiling is off)."""
+    return _active.phase(name, item)
+
+def iter_phase(name: str, iterable: Iterable) -> Iterator:
+    """Yield from iterable, timing each step as one call of phase name."""
+    iterator = iter(iterable)
+    while True:
+        with phase(name):
+            try:
+                value = next(iterator)
+            except StopIteration:
+                return
+        yield value
+
+def add_profiling_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the --profile family of options to a tool's parser."""
+    group = parser.add_argument_group('profiling')
+    group.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print wall time and peak memory per phase, and the slowest files, to stderr'
+    )
+    group.add_argument(
+        '--timings-json',
+        type=str,
+        metavar='PATH',
+        help='Write per-phase timings and the slowest files as JSON'
+    )
+    group.add_argument(
+        '--profile-memory',
+        action='store_true',
+        help='Also record peak traced memory per phase (tracemalloc, slows the run)'
+    )
+    group.add_argument(
+        '--profile-top',
+        type=int,
+        default=10,
+        metavar='N',
+        help='Number of slowest files to report (default: 10)'
+    )
+    group.add_argument(
+        '--cprofile',
+        type=str,
+        metavar='PATH',
+        help='Dump a cProfile of the main process to PATH (pstats format)'
+    )
+
+def start_from_args(tool: str, args: argparse.Namespace) -> Profiler:
+    """Install and start a profiler configured from the parsed arguments."""
+    global _cprofile
+    enabled = bool(args.profile or args.timings_json)
+    profiler = install(Profiler(tool, enabled=enabled, trace_memory=args.profile_memory))
+    profiler.start()
+    if args.cprofile:
+        _cprofile = cProfile.Profile()
+        _cprofile.enable()
+    return profiler
+
+@contextmanager
+def session(tool: str, args: argparse.Namespace) -> Iterator[Profiler]:
+    """Profile the enclosed block, reporting even when it ends in sys.exit()."""
+    profiler = start_from_args(tool, args)
+    try:
+        yield profiler
+    finally:
+        finish(profiler, args)
+
+def finish(profiler: Profiler, args: argparse.Namespace) -> None:
+    """Stop profiling and emit whatever the arguments asked for."""
+    global _cprofile
+    if _cprofile is not None:
+        _cprofile.disable()
+        _cprofile.dump_stats(args.cprofile)
+        print(f"cProfile written to {args.cprofile}", file=sys.stderr)
+        _cprofile = None
+    wall_seconds = profiler.stop()
+    if not profiler.enabled:
+        return
+    if args.profile:
+        profiler.report(wall_seconds, args.profile_top)
+    if args.timings_json:
+        path = Path(args.timings_json)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(profiler.to_dict(wall_seconds, args.profile_top), indent=2) + '\n', encoding='utf-8')
+        print(f"Timings written to {path}", file=sys.stderr)
@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Project Memory Store
+
+Owns the schema of the project_memory table in ./memory.db, the semantic
+project history maintained by the orchestrator-state-scribe agent, and
+provides batched writes so recording a task's file changes is one
+transaction instead of a SELECT plus an UPDATE or INSERT per file.
+
+The database runs in WAL mode so readers never block the writer. Records are
+upserted with INSERT ... ON CONFLICT(file_path): new paths start at version 1,
+existing ones are re-activated with their version incremented. Deletes are
+soft: the status becomes 'deleted' and the version is incremented, rows are
+never removed. Transient files (.gitignore, memory.db itself) are never
+recorded.
+
+Every insert, update and soft delete is also appended, by triggers, to the
+project_memory_changes log with a monotonically increasing seq, so a consumer
+can catch up from its last cursor in O(changes) instead of re-reading the
+whole table.
+
+Usage:
+    python tools/project_memory.py init
+    python tools/project_memory.py upsert records.jsonl
+    python tools/project_memory.py upsert records.jsonl --classify
+    python tools/project_memory.py delete src/old_module.py --signal-type state_update_generic
+    python tools/project_memory.py show src/app.py
+    python tools/project_memory.py list --status active --signal-category problem
+    python tools/project_memory.py stats
+    python tools/project_memory.py changes --since 120 --signal-category problem
+    python tools/project_memory.py changes --since 120 --latest --ndjson
+"""
+
+import sys
+import json
+import sqlite3
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Columns a caller may set on a record, in table order
+RECORD_FIELDS = [
+    'file_path',
+    'status',
+    'memory_type',
+    'signal_type',
+    'signal_category',
+    'brief_description',
+    'elements_description',
+    'rationale'
+]
+
+DEFAULT_SIGNAL_TYPE = 'state_update_generic'
+DEFAULT_SIGNAL_CATEGORY = 'state'
+
+# Files the scribe must never record
+TRANSIENT_NAMES = {
+    '.gitignore',
+    'memory.db', 'memory.db-wal', 'memory.db-shm', 'memory.db-journal',
+    'memory-archive.db', 'memory-archive.db-wal', 'memory-archive.db-shm', 'memory-archive.db-journal'
+}
+
+# Host parameters per IN (...) lookup, well below SQLite's variable limit
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS project_memory (
+    id INTEGER PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active',
+    memory_type TEXT,
+    signal_type TEXT NOT NULL DEFAULT 'state_update_generic',
+    signal_category TEXT NOT NULL DEFAULT 'state',
+    brief_description TEXT,
+    elements_description TEXT,
+    rationale TEXT,
+    version INTEGER NOT NULL DEFAULT 1,
+    timestamp TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_project_memory_file_path ON project_memory(file_path);
+CREATE INDEX IF NOT EXISTS idx_project_memory_signal_type ON project_memory(signal_type);
+CREATE INDEX IF NOT EXISTS idx_project_memory_status ON project_memory(status);
+"""
+
+# Append-only change log. AUTOINCREMENT keeps seq strictly increasing even if
+# old entries are pruned, so cursors held by consumers stay valid.
+CHANGE_LOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS project_memory_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    memory_id INTEGER NOT NULL,
+    operation TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    memory_type TEXT,
+    signal_type TEXT NOT NULL,
+    signal_category TEXT NOT NULL,
+    brief_description TEXT,
+    elements_description TEXT,
+    rationale TEXT,
+    version INTEGER NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_project_memory_changes_category ON project_memory_changes(signal_category, seq);
+CREATE INDEX IF NOT EXISTS idx_project_memory_changes_path ON project_memory_changes(file_path, seq);
+CREATE TRIGGER IF NOT EXISTS project_memory_log_insert AFTER INSERT ON project_memory
+BEGIN
+    INSERT INTO project_memory_changes (
+        memory_id, operation, file_path, status, memory_type, signal_type, signal_category,
+        brief_description, elements_description, rationale, version, timestamp
+    ) VALUES (
+        NEW.id, 'insert', NEW.file_path, NEW.status, NEW.memory_type, NEW.signal_type, NEW.signal_category,
+        NEW.brief_description, NEW.elements_description, NEW.rationale, NEW.version, NEW.timestamp
+    );
+END;
+CREATE TRIGGER IF NOT EXISTS project_memory_log_update AFTER UPDATE ON project_memory
+BEGIN
+    INSERT INTO project_memory_changes (
+        memory_id, operation, file_path, status, memory_type, signal_type, signal_category,
+        brief_description, elements_description, rationale, version, timestamp
+    ) VALUES (
+        NEW.id,
+        CASE WHEN NEW.status = 'deleted' AND OLD.status != 'deleted' THEN 'delete' ELSE 'update' END,
+        NEW.file_path, NEW.status, NEW.memory_type, NEW.signal_type, NEW.signal_category,
+        NEW.brief_description, NEW.elements_description, NEW.rationale, NEW.version, NEW.timestamp
+    );
+END;
+"""
+
+# Seed the log of a database created before it existed: one 'insert' per row,
+# only if nothing was ever logged (so a concurrent opener cannot repeat it)
+CHANGE_LOG_BACKFILL_SQL = """
+INSERT INTO project_memory_changes (
+    memory_id, operation, file_path, status, memory_type, signal_type, signal_category,
+    brief_description, elements_description, rationale, version, timestamp
+)
+SELECT id, 'insert', file_path, status, memory_type, signal_type, signal_category,
+       brief_description, elements_description, rationale, version, timestamp
+FROM project_memory
+WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'project_memory_changes')
+ORDER BY id;
+"""
+
+UPSERT_SQL = """
+INSERT INTO project_memory (
+    file_path, status, memory_type, signal_type, signal_category,
+    brief_description, elements_description, rationale, version, timestamp
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1, ?)
+ON CONFLICT(file_path) DO UPDATE SET
+    status = excluded.status,
+    memory_type = excluded.memory_type,
+    signal_type = excluded.signal_type,
+    signal_category = excluded.signal_category,
+    brief_description = excluded.brief_description,
+    elements_description = excluded.elements_description,
+    rationale = excluded.rationale,
+    version = project_memory.version + 1,
+    timestamp = excluded.timestamp
+"""
+
+SOFT_DELETE_SQL = """
+UPDATE project_memory SET
+    status = 'deleted',
+    signal_type = ?,
+    signal_category = ?,
+    version = version + 1,
+    timestamp = ?
+WHERE file_path = ? AND status != 'deleted'
+"""
+
+def utc_timestamp() -> str:
+    """Current UTC time in ISO 8601, the format stored in the timestamp column."""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+def is_recordable(file_path: str) -> bool:
+    """False for transient files the scribe must never record."""
+    return Path(file_path).name not in TRANSIENT_NAMES
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class ProjectMemoryStore:
+    """Connection to memory.db with the project_memory schema applied."""
+
+    def __init__(self, db_path: Path, timeout: float = 30.0):
+        self.db_path = db_path
+        # Autocommit mode: write batches open their own BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(str(db_path), timeout=timeout, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        # Only takes effect on a new database; memory_maintenance.py --migrate switches older ones
+        self.conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute(f'PRAGMA busy_timeout={int(timeout * 1000)}')
+        self.ensure_schema()
+
+    def ensure_schema(self) -> None:
+        """Create the tables, indexes and change-log triggers if they do not exist yet."""
+        self.conn.executescript(SCHEMA)
+        has_log = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'project_memory_log_update'"
+        ).fetchone()
+        if has_log:
+            return
+        # Log, triggers and backfill in one write transaction
+        try:
+            self.conn.executescript('BEGIN IMMEDIATE;' + CHANGE_LOG_SCHEMA + CHANGE_LOG_BACKFILL_SQL + 'COMMIT;')
+        except BaseException:
+            if self.conn.in_transaction:
+                self.conn.execute('ROLLBACK')
+            raise
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> 'ProjectMemoryStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _existing_paths(self, paths: List[str]) -> set:
+        """Which of paths already have a row, via the file_path index."""
+        existing = set()
+        for chunk in _chunks(paths, LOOKUP_CHUNK):
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT file_path FROM project_memory WHERE file_path IN ({placeholders})', chunk
+            )
+            existing.update(row[0] for row in rows)
+        return existing
+
+    def upsert_many(self, records: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Insert or update records in a single transaction.
+
+        Each record needs a file_path; other RECORD_FIELDS are optional and a
+        missing status, signal_type or signal_category defaults to active /
+        state_update_generic / state. Updated rows get version + 1.
+
+        Returns counts of inserted, updated and skipped (transient) records.
+        """
+        counts = self.write_batch(records, [])
+        del counts['deleted']
+        return counts
+
+    def upsert(self, record: Dict[str, Any]) -> Dict[str, int]:
+        """Insert or update a single record (a batch of one)."""
+        return self.upsert_many([record])
+
+    def soft_delete_many(
+        self,
+        file_paths: Iterable[str],
+        signal_type: str = DEFAULT_SIGNAL_TYPE,
+        signal_category: str = DEFAULT_SIGNAL_CATEGORY
+    ) -> int:
+        """
+        Mark records deleted in a single transaction; rows are never removed.
+
+        Paths without a record, or already deleted, are left untouched.
+        Returns the number of records marked deleted.
+        """
+        return self.write_batch([], [(path, signal_type, signal_category) for path in file_paths])['deleted']
+
+    def write_batch(
+        self,
+        records: Iterable[Dict[str, Any]],
+        deletions: Iterable[tuple]
+    ) -> Dict[str, int]:
+        """
+        Upsert records, then soft-delete (file_path, signal_type,
+        signal_category) deletions, all in one transaction.
+
+        Returns counts of inserted, updated, skipped (transient) and deleted
+        records.
+        """
+        timestamp = utc_timestamp()
+        rows = []
+        skipped = 0
+        for record in records:
+            file_path = record['file_path']
+            if not is_recordable(file_path):
+                skipped += 1
+                continue
+            rows.append((
+                file_path,
+                record.get('status') or 'active',
+                record.get('memory_type'),
+                record.get('signal_type') or DEFAULT_SIGNAL_TYPE,
+                record.get('signal_category') or DEFAULT_SIGNAL_CATEGORY,
+                record.get('brief_description'),
+                record.get('elements_description'),
+                record.get('rationale'),
+                record.get('timestamp') or timestamp
+            ))
+        delete_params = [
+            (signal_type, signal_category, timestamp, path) for path, signal_type, signal_category in deletions
+        ]
+
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            unique_paths = list(dict.fromkeys(row[0] for row in rows))
+            inserted = len(unique_paths) - len(self._existing_paths(unique_paths))
+            self.conn.executemany(UPSERT_SQL, rows)
+            # rowcount, not total_changes: the change-log trigger rows would count too
+            deleted = self.conn.executemany(SOFT_DELETE_SQL, delete_params).rowcount if delete_params else 0
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        return {'inserted': inserted, 'updated': len(rows) - inserted, 'skipped': skipped, 'deleted': deleted}
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """The record for file_path, or None."""
+        row = self.conn.execute(
+            'SELECT * FROM project_memory WHERE file_path = ?', (file_path,)
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        signal_type: Optional[str] = None,
+        signal_category: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Records matching every given filter, most recently updated first."""
+        clauses = []
+        params: List[Any] = []
+        for column, value in (('status', status), ('signal_type', signal_type), ('signal_category', signal_category)):
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        sql = 'SELECT * FROM project_memory'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY timestamp DESC, id DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def change_head(self) -> int:
+        """The seq of the newest change-log entry (0 if nothing was logged)."""
+        return self.conn.execute('SELECT COALESCE(MAX(seq), 0) FROM project_memory_changes').fetchone()[0]
+
+    def changes_since(
+        self,
+        cursor: int = 0,
+        signal_category: Optional[str] = None,
+        limit: Optional[int] = None,
+        latest_only: bool = False,
+        until: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream change-log entries with seq > cursor, oldest first.
+
+        Each entry is the record as written by that change plus seq, memory_id
+        and operation (insert / update / delete). latest_only keeps only the
+        newest entry per file_path, which is all a consumer rebuilding current
+        state needs. until caps seq, so a caller can pin the range to
+        change_head() and then resume from it, even when a filter matched
+        nothing.
+        """
+        clauses = ['seq > ?']
+        params: List[Any] = [cursor]
+        if until is not None:
+            clauses.append('seq <= ?')
+            params.append(until)
+        if signal_category is not None:
+            clauses.append('signal_category = ?')
+            params.append(signal_category)
+        where = ' AND '.join(clauses)
+        if latest_only:
+            sql = (
+                f'SELECT * FROM project_memory_changes WHERE seq IN '
+                f'(SELECT MAX(seq) FROM project_memory_changes WHERE {where} GROUP BY file_path) ORDER BY seq'
+            )
+        else:
+            sql = f'SELECT * FROM project_memory_changes WHERE {where} ORDER BY seq'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        for row in self.conn.execute(sql, params):
+            yield dict(row)
+
+    def stats(self) -> Dict[str, Any]:
+        """Record counts by status and by signal category."""
+        by_status = dict(self.conn.execute(
+            'SELECT status, COUNT(*) FROM project_memory GROUP BY status ORDER BY status'
+        ).fetchall())
+        by_category = dict(self.conn.execute(
+            'SELECT signal_category, COUNT(*) FROM project_memory GROUP BY signal_category ORDER BY signal_category'
+        ).fetchall())
+        return {
+            'records': sum(by_status.values()),
+            'by_status': by_status,
+            'by_signal_category': by_category,
+            'change_seq': self.change_head()
+        }
+
+def read_records(source: str) -> List[Dict[str, Any]]:
+    """
+    Read records from a JSON array or JSON Lines file ('-' for stdin).
+
+    Raises OSError if the file cannot be read and ValueError for invalid
+    JSON or a record that is not an object with a string file_path.
+    """
+    text = sys.stdin.read() if source == '-' else Path(source).read_text(encoding='utf-8')
+    stripped = text.lstrip()
+    if stripped.startswith('['):
+        try:
+            records = json.loads(stripped)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+        if not isinstance(records, list):
+            raise ValueError("Expected a JSON array of records")
+        numbered = list(enumerate(records, 1))
+        label = 'Record'
+    else:
+        numbered = []
+        for number, line in enumerate(text.splitlines(), 1):
+            if line.strip():
+                try:
+                    numbered.append((number, json.loads(line)))
+                except ValueError as e:
+                    raise ValueError(f"Line {number}: invalid JSON: {e}")
+        label = 'Line'
+    for number, record in numbered:
+        if not isinstance(record, dict) or not isinstance(record.get('file_path'), str) or not record['file_path']:
+            raise ValueError(f"{label} {number}: a record needs a non-empty string 'file_path'")
+    return [record for _, record in numbered]
+
+def classify_records(records: List[Dict[str, Any]]) -> None:
+    """Set signal_type and signal_category on records that lack a signal_type."""
+    from signal_framework import SignalClassifier
+
+    classifier = SignalClassifier()
+    for record in records:
+        if record.get('signal_type'):
+            continue
+        summary = record.pop('summary', None) or record.get('brief_description') or ''
+        signal = classifier.classify(summary)
+        record['signal_type'] = signal['signal_type']
+        record['signal_category'] = signal['signal_category']
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Manage the project_memory table in memory.db'
+    )
+    parser.add_argument(
+        '--db',
+        type=str,
+        help='Database path (default: memory.db in the project root)'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('init', help='Create the table, indexes and WAL journal')
+
+    upsert_parser = subparsers.add_parser('upsert', help='Upsert records from a JSON or JSONL file')
+    upsert_parser.add_argument('source', help="Records file, or '-' for stdin")
+    upsert_parser.add_argument(
+        '--classify',
+        action='store_true',
+        help="Fill a missing signal_type/signal_category from each record's 'summary' "
+             "(or brief_description) with the Signal Interpretation Framework"
+    )
+
+    delete_parser = subparsers.add_parser('delete', help='Soft-delete records (status=deleted)')
+    delete_parser.add_argument('paths', nargs='+', help='File paths to mark deleted')
+    delete_parser.add_argument('--signal-type', default=DEFAULT_SIGNAL_TYPE)
+    delete_parser.add_argument('--signal-category', default=DEFAULT_SIGNAL_CATEGORY)
+
+    show_parser = subparsers.add_parser('show', help='Show the record for a file path')
+    show_parser.add_argument('path')
+
+    list_parser = subparsers.add_parser('list', help='List records, newest first')
+    list_parser.add_argument('--status')
+    list_parser.add_argument('--signal-type')
+    list_parser.add_argument('--signal-category')
+    list_parser.add_argument('--limit', type=int)
+
+    subparsers.add_parser('stats', help='Record counts by status and signal category')
+
+    changes_parser = subparsers.add_parser('changes', help='Change-log entries after a cursor, oldest first')
+    changes_parser.add_argument('--since', type=int, default=0, help='Cursor: the last seq already seen (default: 0)')
+    changes_parser.add_argument('--signal-category')
+    changes_parser.add_argument('--limit', type=int)
+    changes_parser.add_argument('--latest', action='store_true', help='Only the newest change per file path')
+    changes_parser.add_argument(
+        '--ndjson',
+        action='store_true',
+        help='Stream one JSON line per change, then a line with the next cursor'
+    )
+
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    db_path = Path(args.db) if args.db else project_root / 'memory.db'
+
+    with ProjectMemoryStore(db_path) as store:
+        if args.command == 'init':
+            result: Any = {'database': str(db_path), **store.stats()}
+        elif args.command == 'upsert':
+            try:
+                records = read_records(args.source)
+            except (OSError, ValueError) as e:
+                print(json.dumps({'error': str(e)}), file=sys.stderr)
+                sys.exit(1)
+            if args.classify:
+                classify_records(records)
+            result = store.upsert_many(records)
+        elif args.command == 'delete':
+            result = {'deleted': store.soft_delete_many(args.paths, args.signal_type, args.signal_category)}
+        elif args.command == 'show':
+            result = store.get(args.path)
+            if result is None:
+                print(json.dumps({'error': f'No record for {args.path}'}), file=sys.stderr)
+                sys.exit(1)
+        elif args.command == 'list':
+            result = store.query(args.status, args.signal_type, args.signal_category, args.limit)
+        elif args.command == 'changes':
+            head = store.change_head()
+            changes = store.changes_since(args.since, args.signal_category, args.limit, args.latest, until=head)
+            # Resume from head unless --limit cut the range short
+            cursor = args.since
+            if args.ndjson:
+                count = 0
+                for count, change in enumerate(changes, 1):
+                    cursor = change['seq']
+                    print(json.dumps(change, ensure_ascii=False), flush=True)
+                if args.limit is None or count < args.limit:
+                    cursor = max(cursor, head)
+                print(json.dumps({'cursor': cursor}))
+                return
+            changes = list(changes)
+            if changes:
+                cursor = changes[-1]['seq']
+            if args.limit is None or len(changes) < args.limit:
+                cursor = max(cursor, head)
+            result = {'cursor': cursor, 'changes': changes}
+        else:
+            result = store.stats()
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+if __name__ == '__main__':
+    main()
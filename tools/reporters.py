@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Validation Reporters
+
+Machine-readable output for validate-agents.py --format:
+
+    ndjson  one JSON object per file, written and flushed as soon as that file
+            is validated (in completion order with --jobs), then a summary line
+    json    one document with every file record and the summary
+    junit   JUnit XML (one testcase per file) for CI test report viewers
+
+File records carry the file, status (pass / warn / fail), the error and
+warning messages without terminal decoration, whether the result came from
+the cache, and the validation wall time, so they can feed dashboards directly.
+
+Usage:
+    reporter = create_reporter('ndjson', sys.stdout)
+    reporter.file(file_record('agents/a.yaml', (True, [], []), cache_hit=False, seconds=0.002))
+    reporter.finish(summary)
+"""
+
+import os
+import re
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+from xml.etree import ElementTree
+
+FORMATS = ['text', 'json', 'ndjson', 'junit']
+
+# Leading indentation and ✗ / ⚠️ / ✓ markers used by the text output
+_DECORATION = re.compile(r'^\s*(?:[✗✓]|⚠️?)?\s*')
+
+def plain(message: str) -> str:
+    """Strip the terminal indentation and status marker from a message."""
+    return _DECORATION.sub('', message, count=1)
+
+def result_status(is_valid: bool, warnings: List[str]) -> str:
+    if not is_valid:
+        return 'fail'
+    return 'warn' if warnings else 'pass'
+
+def file_record(
+    file: str,
+    result: Tuple[bool, List[str], List[str]],
+    cache_hit: bool = False,
+    seconds: float = 0.0,
+    **extra: Any
+) -> Dict[str, Any]:
+    """Build the record reported for one validated file (or streamed mode)."""
+    is_valid, errors, warnings = result
+    record = {
+        'type': 'file',
+        'file': file,
+        'status': result_status(is_valid, warnings),
+        'valid': is_valid,
+        'errors': [plain(error) for error in errors],
+        'warnings': [plain(warning) for warning in warnings],
+        'cache_hit': cache_hit,
+        'seconds': round(seconds, 6)
+    }
+    record.update(extra)
+    return record
+
+class Reporter(ABC):
+    """Receives file records as they complete and the run summary at the end."""
+
+    def __init__(self, out: TextIO):
+        self.out = out
+        self.closed = False
+
+    def _emit(self, text: str) -> None:
+        """Write and flush text, going quiet once the reader closes the pipe."""
+        if self.closed:
+            return
+        try:
+            self.out.write(text)
+            self.out.flush()
+        except BrokenPipeError:
+            # Reader went away (e.g. `| head`); keep validating for the exit code
+            self.closed = True
+            os.dup2(os.open(os.devnull, os.O_WRONLY), self.out.fileno())
+
+    @abstractmethod
+    def file(self, record: Dict[str, Any]) -> None:
+        """Report one file record."""
+
+    @abstractmethod
+    def finish(self, summary: Dict[str, Any]) -> None:
+        """Report the run summary and finish the output."""
+
+class NdjsonReporter(Reporter):
+    """One JSON line per file, flushed immediately, then a summary line."""
+
+    def file(self, record: Dict[str, Any]) -> None:
+        self._emit(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def finish(self, summary: Dict[str, Any]) -> None:
+        self._emit(json.dumps({'type': 'summary', **summary}, ensure_ascii=False) + '\n')
+
+class JsonReporter(Reporter):
+    """A single JSON document written when the run finishes."""
+
+    def __init__(self, out: TextIO):
+        super().__init__(out)
+        self.records: List[Dict[str, Any]] = []
+
+    def file(self, record: Dict[str, Any]) -> None:
+        self.records.append(record)
+
+    def finish(self, summary: Dict[str, Any]) -> None:
+        self._emit(json.dumps({'summary': summary, 'files': self.records}, indent=2, ensure_ascii=False) + '\n')
+
+class JunitReporter(Reporter):
+    """JUnit XML with one testcase per file; warnings go to system-out."""
+
+    def __init__(self, out: TextIO, suite: str = 'validate-agents'):
+        super().__init__(out)
+        self.suite = suite
+        self.records: List[Dict[str, Any]] = []
+
+    def file(self, record: Dict[str, Any]) -> None:
+        self.records.append(record)
+
+    def finish(self, summary: Dict[str, Any]) -> None:
+        failures = sum(1 for record in self.records if not record['valid'])
+        errors = 1 if summary.get('error') else 0
+        suite = ElementTree.Element('testsuite', {
+            'name': self.suite,
+            'tests': str(len(self.records) + errors),
+            'failures': str(failures),
+            'errors': str(errors),
+            'skipped': '0',
+            'time': f"{summary.get('seconds', 0.0):.6f}"
+        })
+        for record in self.records:
+            name = record['file'] if 'slug' not in record else f"{record['file']}::{record['slug']}"
+            case = ElementTree.SubElement(suite, 'testcase', {
+                'classname': self.suite,
+                'name': name,
+                'time': f"{record['seconds']:.6f}"
+            })
+            if not record['valid']:
+                failure = ElementTree.SubElement(case, 'failure', {
+                    'message': record['errors'][0] if record['errors'] else 'validation failed'
+                })
+                failure.text = '\n'.join(record['errors'])
+            output = list(record['warnings'])
+            if record['cache_hit']:
+                output.append('(cached result)')
+            if output:
+                ElementTree.SubElement(case, 'system-out').text = '\n'.join(output)
+        if errors:
+            case = ElementTree.SubElement(suite, 'testcase', {'classname': self.suite, 'name': 'structure', 'time': '0'})
+            ElementTree.SubElement(case, 'error', {'message': summary['error']}).text = summary['error']
+
+        self._emit('<?xml version="1.0" encoding="UTF-8"?>\n' + ElementTree.tostring(suite, encoding='unicode') + '\n')
+
+REPORTERS = {
+    'json': JsonReporter,
+    'ndjson': NdjsonReporter,
+    'junit': JunitReporter
+}
+
+def create_reporter(fmt: str, out: TextIO) -> Optional[Reporter]:
+    """The reporter for a --format value, or None for the colored text output."""
+    reporter_class = REPORTERS.get(fmt)
+    return reporter_class(out) if reporter_class is not None else None
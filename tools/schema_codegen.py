@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Schema Fast-Path Code Generator
+
+Turns a JSON schema into a specialized Python function that answers only
+"is this document valid?". Each keyword becomes straight-line code: type
+checks are isinstance() calls, required and additionalProperties are
+frozenset operations, patterns are precompiled regexes and local $refs become
+their own functions. Nothing walks the schema at validation time.
+
+The generated function is conservative. True means Draft-7 validation would
+also pass. False means "not sure": the caller falls back to jsonschema, which
+produces the error message. A few cases that jsonschema accepts take that
+fallback too, such as 1.0 for an integer or [1, true] for uniqueItems. A
+schema using a keyword the generator does not know gets no fast path at all.
+
+The module is generated and compiled in memory on every run, once per
+process and schema. That takes about a millisecond, as long as importing it
+from a disk cache did, and nothing that could have been tampered with on
+disk is ever executed.
+
+Usage:
+    from schema_codegen import load_fast_validator
+
+    is_valid = load_fast_validator(schema)  # None if the schema is unsupported
+    if is_valid is None or not is_valid(document):
+        ...  # jsonschema path
+
+    python tools/schema_codegen.py                     # generate and summarize
+    python tools/schema_codegen.py --print             # print the generated source
+    python tools/schema_codegen.py --schema other.json --print
+"""
+
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_SCHEMA = PROJECT_ROOT / 'schemas' / 'agent-mode-schema.json'
+
+# Bump whenever generated code changes; part of the schema digest
+GENERATOR_VERSION = '1'
+
+# Keywords with no effect on validity
+ANNOTATIONS = {'$schema', '$id', 'title', 'description', 'default', 'examples', '$comment', 'definitions'}
+
+STRING_KEYWORDS = {'minLength', 'maxLength', 'pattern'}
+ARRAY_KEYWORDS = {'minItems', 'maxItems', 'uniqueItems', 'items'}
+OBJECT_KEYWORDS = {'required', 'properties', 'additionalProperties'}
+SUPPORTED = {'$ref', 'type', 'enum'} | STRING_KEYWORDS | ARRAY_KEYWORDS | OBJECT_KEYWORDS
+
+# Draft-7 type -> check expression template for a value {v}
+TYPE_CHECKS = {
+    'object': 'isinstance({v}, dict)',
+    'array': 'isinstance({v}, list)',
+    'string': 'isinstance({v}, str)',
+    'boolean': 'isinstance({v}, bool)',
+    'null': '{v} is None',
+    # jsonschema also accepts integral floats; those take the fallback
+    'integer': '(isinstance({v}, int) and not isinstance({v}, bool))',
+    'number': '(isinstance({v}, (int, float)) and not isinstance({v}, bool))'
+}
+
+class UnsupportedSchema(ValueError):
+    """The schema uses a keyword or form the generator does not translate."""
+
+class _Generator:
+    """Emits the source of one validator module for a schema."""
+
+    def __init__(self, schema: Dict):
+        self.schema = schema
+        self.constants: Dict[str, str] = {}  # source -> constant name
+        self.functions: List[List[str]] = []
+        self.refs: Dict[str, str] = {}  # JSON pointer -> generated function name
+        self.pending: List[str] = []
+        self.variables = 0
+
+    def constant(self, source: str) -> str:
+        """Module-level name for source, shared by identical constants."""
+        if source not in self.constants:
+            self.constants[source] = f"_C{len(self.constants)}"
+        return self.constants[source]
+
+    def variable(self) -> str:
+        self.variables += 1
+        return f"v{self.variables}"
+
+    def ref(self, pointer: str) -> str:
+        """Function name validating the local JSON pointer; generated once."""
+        if pointer not in self.refs:
+            if not pointer.startswith('#'):
+                raise UnsupportedSchema(f"Only local $ref is supported: {pointer}")
+            self.refs[pointer] = f"_ref{len(self.refs)}"
+            self.pending.append(pointer)
+        return self.refs[pointer]
+
+    def resolve(self, pointer: str) -> Any:
+        node = self.schema
+        for part in filter(None, pointer[1:].split('/')):
+            part = part.replace('~1', '/').replace('~0', '~')
+            try:
+                node = node[int(part)] if isinstance(node, list) else node[part]
+            except (KeyError, IndexError, ValueError):
+                raise UnsupportedSchema(f"Unresolvable $ref: {pointer}")
+        return node
+
+    def function(self, name: str, schema: Any, comment: str) -> None:
+        body: List[str] = []
+        self.node(schema, 'v0', 1, body)
+        self.functions.append([f"def {name}(v0):  # {comment}"] + body + ["    return True"])
+
+    def node(self, schema: Any, v: str, depth: int, out: List[str]) -> None:
+        """Append statements that return False unless v is valid against schema."""
+        pad = '    ' * depth
+        if schema is True:
+            return
+        if schema is False:
+            out.append(f"{pad}return False")
+            return
+        if not isinstance(schema, dict):
+            raise UnsupportedSchema(f"Schema must be an object or boolean, got {type(schema).__name__}")
+        unknown = set(schema) - SUPPORTED - ANNOTATIONS
+        if unknown:
+            raise UnsupportedSchema(f"Unsupported keywords: {', '.join(sorted(unknown))}")
+        if '$ref' in schema:
+            # Draft 7 ignores every sibling of $ref
+            out.append(f"{pad}if not {self.ref(schema['$ref'])}({v}):")
+            out.append(f"{pad}    return False")
+            return
+
+        types = schema.get('type')
+        if types is not None:
+            types = [types] if isinstance(types, str) else list(types)
+            if not types or any(t not in TYPE_CHECKS for t in types):
+                raise UnsupportedSchema(f"Unsupported type: {schema['type']}")
+            check = ' or '.join(TYPE_CHECKS[t].format(v=v) for t in types)
+            out.append(f"{pad}if not {check}:" if len(types) == 1 else f"{pad}if not ({check}):")
+            out.append(f"{pad}    return False")
+
+        if 'enum' in schema:
+            values = schema['enum']
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                raise UnsupportedSchema('Only string enums are supported')
+            allowed = self.constant(f"frozenset({sorted(set(values))!r})")
+            if types == ['string']:
+                out.append(f"{pad}if {v} not in {allowed}:")
+            else:
+                out.append(f"{pad}if not (isinstance({v}, str) and {v} in {allowed}):")
+            out.append(f"{pad}    return False")
+
+        # Keywords of one type family only apply to instances of that type
+        for family, keywords, emit in (
+            ('string', STRING_KEYWORDS, self.string_keywords),
+            ('array', ARRAY_KEYWORDS, self.array_keywords),
+            ('object', OBJECT_KEYWORDS, self.object_keywords)
+        ):
+            if not keywords & set(schema):
+                continue
+            if types == [family]:
+                emit(schema, v, depth, out)
+                continue
+            body: List[str] = []
+            emit(schema, v, depth + 1, body)
+            if body:
+                out.append(f"{pad}if {TYPE_CHECKS[family].format(v=v)}:")
+                out.extend(body)
+
+    def string_keywords(self, schema: Dict, v: str, depth: int, out: List[str]) -> None:
+        pad = '    ' * depth
+        if 'minLength' in schema:
+            out.append(f"{pad}if len({v}) < {int(schema['minLength'])}:")
+            out.append(f"{pad}    return False")
+        if 'maxLength' in schema:
+            out.append(f"{pad}if len({v}) > {int(schema['maxLength'])}:")
+            out.append(f"{pad}    return False")
+        if 'pattern' in schema:
+            # jsonschema matches patterns with re.search as well
+            search = self.constant(f"re.compile({schema['pattern']!r}).search")
+            out.append(f"{pad}if {search}({v}) is None:")
+            out.append(f"{pad}    return False")
+
+    def array_keywords(self, schema: Dict, v: str, depth: int, out: List[str]) -> None:
+        pad = '    ' * depth
+        if 'minItems' in schema:
+            out.append(f"{pad}if len({v}) < {int(schema['minItems'])}:")
+            out.append(f"{pad}    return False")
+        if 'maxItems' in schema:
+            out.append(f"{pad}if len({v}) > {int(schema['maxItems'])}:")
+            out.append(f"{pad}    return False")
+        if schema.get('uniqueItems') is True:
+            out.append(f"{pad}if not _unique({v}):")
+            out.append(f"{pad}    return False")
+        if 'items' in schema:
+            if isinstance(schema['items'], list):
+                raise UnsupportedSchema('Tuple-form items is not supported')
+            item = self.variable()
+            body: List[str] = []
+            self.node(schema['items'], item, depth + 1, body)
+            if body:
+                out.append(f"{pad}for {item} in {v}:")
+                out.extend(body)
+
+    def object_keywords(self, schema: Dict, v: str, depth: int, out: List[str]) -> None:
+        pad = '    ' * depth
+        if schema.get('required'):
+            required = self.constant(f"frozenset({sorted(schema['required'])!r})")
+            out.append(f"{pad}if not {required}.issubset({v}):")
+            out.append(f"{pad}    return False")
+        properties = schema.get('properties', {})
+        additional = schema.get('additionalProperties', True)
+        if additional is False:
+            allowed = self.constant(f"frozenset({sorted(properties)!r})")
+            out.append(f"{pad}if not {allowed}.issuperset({v}):")
+            out.append(f"{pad}    return False")
+        elif additional is not True:
+            raise UnsupportedSchema('Only boolean additionalProperties is supported')
+        for name, subschema in properties.items():
+            value = self.variable()
+            body: List[str] = []
+            self.node(subschema, value, depth + 1, body)
+            if body:
+                out.append(f"{pad}if {name!r} in {v}:")
+                out.append(f"{pad}    {value} = {v}[{name!r}]")
+                out.extend(body)
+
+    def source(self, digest: str) -> str:
+        self.function('is_valid', self.schema, '#')
+        while self.pending:
+            pointer = self.pending.pop(0)
+            self.function(self.refs[pointer], self.resolve(pointer), pointer)
+        header = [
+            f'"""Generated by tools/schema_codegen.py (generator {GENERATOR_VERSION}, schema {digest[:16]}); do not edit."""',
+            '',
+            'import re',
+            '',
+            *(f"{name} = {source}" for source, name in self.constants.items()),
+            '',
+            'def _unique(items):',
+            '    try:',
+            '        return len(set(items)) == len(items)',
+            '    except TypeError:',
+            '        # Unhashable items: let jsonschema decide',
+            '        return False',
+        ]
+        blocks = ['\n'.join(header)] + ['\n'.join(lines) for lines in reversed(self.functions)]
+        return '\n\n'.join(blocks) + '\n'
+
+def schema_digest(schema: Dict) -> str:
+    """SHA-256 over the generator version and the schema's canonical JSON."""
+    canonical = json.dumps(schema, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(f"{GENERATOR_VERSION}\n{canonical}".encode('utf-8')).hexdigest()
+
+def generate_source(schema: Dict) -> str:
+    """
+    Python source of a module whose is_valid(instance) is the fast path.
+
+    Raises UnsupportedSchema if the schema cannot be translated.
+    """
+    return _Generator(schema).source(schema_digest(schema))
+
+_loaded: Dict[str, Callable[[Any], bool]] = {}
+
+def load_fast_validator(schema: Dict) -> Optional[Callable[[Any], bool]]:
+    """
+    The generated is_valid() for schema, generated and compiled in memory
+    once per process; None when the schema uses keywords the generator does
+    not support.
+    """
+    digest = schema_digest(schema)
+    if digest in _loaded:
+        return _loaded[digest]
+    try:
+        source = generate_source(schema)
+    except UnsupportedSchema:
+        return None
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f"<schema_validator_{digest[:16]}>", 'exec'), namespace)
+    _loaded[digest] = namespace['is_valid']
+    return _loaded[digest]
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the fast-path validator for a JSON schema')
+    parser.add_argument('--schema', type=Path, default=DEFAULT_SCHEMA, help='Schema file (default: agent-mode-schema.json)')
+    parser.add_argument('--print', action='store_true', help='Print the generated source instead of a summary')
+    args = parser.parse_args()
+
+    with open(args.schema, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    try:
+        source = generate_source(schema)
+    except UnsupportedSchema as e:
+        print(json.dumps({'schema': str(args.schema), 'supported': False, 'reason': str(e)}, indent=2))
+        sys.exit(1)
+    if args.print:
+        print(source, end='')
+        return
+    load_fast_validator(schema)
+    print(json.dumps({
+        'schema': str(args.schema),
+        'supported': True,
+        'digest': schema_digest(schema),
+        'lines': source.count('\n')
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
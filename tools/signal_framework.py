@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Signal Interpretation Framework Classifier
+
+Classifies task summaries into a signal type and signal category without a
+model call, using the machine-readable framework in
+schemas/signal-framework.json (the table behind the prose in
+agents/orchestrator-state-scribe.yaml).
+
+All keywordsToSignalType phrases are compiled into one case-insensitive regex,
+so a summary is scanned once regardless of how many keywords exist. When
+several keywords match, the signal whose category comes first in
+categoryPriority wins (a critical bug outranks a completed step), then the
+earliest match in the text. Summaries without any keyword fall back to
+state_update_generic. The result depends only on the text and the table.
+
+Usage:
+    python tools/signal_framework.py classify "Coding complete for the login feature"
+    python tools/signal_framework.py classify --input summaries.txt > signals.ndjson
+    python tools/signal_framework.py check
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_FRAMEWORK_PATH = PROJECT_ROOT / 'schemas' / 'signal-framework.json'
+SCRIBE_AGENT_PATH = PROJECT_ROOT / 'agents' / 'orchestrator-state-scribe.yaml'
+
+def load_framework(framework_path: Path = DEFAULT_FRAMEWORK_PATH) -> Dict:
+    """
+    Load and sanity-check the framework table.
+
+    Raises ValueError if a signal type belongs to several categories, or a
+    keyword, the default signal type or a priority entry is unknown.
+    """
+    with open(framework_path, 'r', encoding='utf-8') as f:
+        framework = json.load(f)
+
+    seen: Dict[str, str] = {}
+    for category, signal_types in framework['signalCategories'].items():
+        for signal_type in signal_types:
+            if signal_type in seen:
+                raise ValueError(
+                    f"Signal type '{signal_type}' is in both '{seen[signal_type]}' and '{category}'"
+                )
+            seen[signal_type] = category
+
+    for keyword, signal_type in framework['keywordsToSignalType'].items():
+        if signal_type not in seen:
+            raise ValueError(f"Keyword '{keyword}' maps to unknown signal type '{signal_type}'")
+    if framework['defaultSignalType'] not in seen:
+        raise ValueError(f"Unknown defaultSignalType '{framework['defaultSignalType']}'")
+    unknown = set(framework['categoryPriority']) ^ set(framework['signalCategories'])
+    if unknown:
+        raise ValueError(f"categoryPriority and signalCategories differ: {', '.join(sorted(unknown))}")
+    return framework
+
+def _normalize(phrase: str) -> str:
+    return ' '.join(phrase.lower().split())
+
+class SignalClassifier:
+    """Compiled keyword matcher mapping summary text to a signal type and category."""
+
+    def __init__(self, framework: Optional[Dict] = None):
+        framework = framework if framework is not None else load_framework()
+        self.default_signal_type = framework['defaultSignalType']
+        self.category_of = {
+            signal_type: category
+            for category, signal_types in framework['signalCategories'].items()
+            for signal_type in signal_types
+        }
+        self.keywords = {
+            _normalize(keyword): signal_type
+            for keyword, signal_type in framework['keywordsToSignalType'].items()
+        }
+        self.priority = {category: rank for rank, category in enumerate(framework['categoryPriority'])}
+
+        # Longest phrases first so a keyword never loses to one of its prefixes
+        alternatives = sorted(self.keywords, key=lambda keyword: (-len(keyword), keyword))
+        self.pattern = re.compile(
+            r'\b(?:' + '|'.join(
+                r'\s+'.join(re.escape(word) for word in keyword.split()) for keyword in alternatives
+            ) + r')\b',
+            re.IGNORECASE
+        )
+
+    def classify(self, text: str) -> Dict:
+        """
+        Classify one summary.
+
+        Returns the winning signal_type, its signal_category, the keyword
+        that selected it (None for the fallback) and every matched keyword in
+        text order.
+        """
+        best = None
+        matched: List[str] = []
+        for match in self.pattern.finditer(text):
+            keyword = _normalize(match.group())
+            matched.append(keyword)
+            rank = (self.priority[self.category_of[self.keywords[keyword]]], match.start())
+            if best is None or rank < best[0]:
+                best = (rank, keyword)
+
+        if best is None:
+            signal_type, keyword = self.default_signal_type, None
+        else:
+            keyword = best[1]
+            signal_type = self.keywords[keyword]
+        return {
+            'signal_type': signal_type,
+            'signal_category': self.category_of[signal_type],
+            'keyword': keyword,
+            'matches': matched
+        }
+
+    def classify_many(self, texts: Iterable[str]) -> List[Dict]:
+        """Classify a batch of summaries, in order."""
+        classify = self.classify
+        return [classify(text) for text in texts]
+
+def check_against_scribe(framework: Dict, agent_path: Path = SCRIBE_AGENT_PATH) -> List[str]:
+    """
+    Report drift between the table and the scribe's prose framework: every
+    signal type and keyword in the table should appear in its customInstructions.
+    """
+    from agent_registry import parse_yaml_file
+
+    instructions = ' '.join(
+        mode.get('customInstructions', '') for mode in parse_yaml_file(agent_path).get('customModes', [])
+    )
+    prose = _normalize(instructions)
+    problems = []
+    for category, signal_types in framework['signalCategories'].items():
+        for signal_type in signal_types:
+            if signal_type not in instructions:
+                problems.append(f"signal type '{signal_type}' ({category}) is not described by the scribe")
+    for keyword, signal_type in framework['keywordsToSignalType'].items():
+        if _normalize(keyword) not in prose:
+            problems.append(f"keyword '{keyword}' -> {signal_type} is not described by the scribe")
+    return problems
+
+def read_summaries(source: str) -> List[str]:
+    """One summary per non-empty line ('-' for stdin)."""
+    text = sys.stdin.read() if source == '-' else Path(source).read_text(encoding='utf-8')
+    return [line for line in text.splitlines() if line.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Classify task summaries with the Signal Interpretation Framework'
+    )
+    parser.add_argument(
+        '--framework',
+        type=str,
+        help='Framework table (default: schemas/signal-framework.json)'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    classify_parser = subparsers.add_parser('classify', help='Classify summaries and print NDJSON')
+    classify_parser.add_argument('texts', nargs='*', help='Summaries to classify')
+    classify_parser.add_argument('--input', '-i', help="File with one summary per line, or '-' for stdin")
+    classify_parser.add_argument('--stats', action='store_true', help='Print throughput to stderr')
+
+    subparsers.add_parser('check', help="Check the table against the scribe's prose framework")
+
+    args = parser.parse_args()
+    framework_path = Path(args.framework) if args.framework else DEFAULT_FRAMEWORK_PATH
+
+    try:
+        framework = load_framework(framework_path)
+    except (OSError, ValueError, KeyError) as e:
+        print(json.dumps({'error': f"Invalid framework {framework_path}: {e}"}), file=sys.stderr)
+        sys.exit(2)
+
+    if args.command == 'check':
+        problems = check_against_scribe(framework)
+        for problem in problems:
+            print(problem)
+        if problems:
+            sys.exit(1)
+        print(f"✓ {framework_path.name} matches {SCRIBE_AGENT_PATH.name}")
+        return
+
+    texts = list(args.texts)
+    if args.input:
+        texts.extend(read_summaries(args.input))
+    if not texts:
+        parser.error('classify needs summaries or --input')
+
+    classifier = SignalClassifier(framework)
+    started = time.perf_counter()
+    results = classifier.classify_many(texts)
+    elapsed = time.perf_counter() - started
+
+    out = sys.stdout
+    for text, result in zip(texts, results):
+        out.write(json.dumps({'summary': text, **result}, ensure_ascii=False) + '\n')
+    if args.stats:
+        rate = len(texts) / elapsed if elapsed else float('inf')
+        print(f"Classified {len(texts)} summaries in {elapsed * 1000:.1f} ms ({rate:,.0f}/s)", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,609 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Routing Header Trace Analyzer
+
+Reads exported task transcripts and rebuilds the delegation trace from the
+mandatory routing header every agent opens its completion with
+(`To: <slug>, From: <slug>`, the requirement the communication_protocol lint
+rule checks for). A header from S to R closes a delegation span R -> S.
+Tasks run one agent at a time and delegations nest, so the span started when
+R last had control: at the previous routing header of the task (or its first
+record), or at the start of the frame S kept open while it delegated further.
+JSONL records typed as a dispatch (new_task, delegate) give exact start times
+instead. They are also needed when an agent is delegated to while it is
+already in the task's delegation chain (a self-delegation or a cycle such as
+uber-orchestrator -> phase orchestrator -> uber-orchestrator): from
+completions alone that cannot be told apart from the earlier activation
+finishing, and it is read as the latter.
+
+Input is read one record at a time. Latencies go into log-bucketed
+histograms whose percentiles are within 1% of the exact values, the slowest
+spans and retry loops are kept in fixed-size heaps, and only the delegation
+stacks of the most recently active --max-open-tasks tasks stay in memory, so
+memory does not grow with the size of the logs.
+
+Formats (detected per file, or forced with --format):
+
+    jsonl   one JSON object per line, with the timestamp in timestamp, ts,
+            time or created_at (ISO 8601 or epoch seconds/milliseconds), the
+            text in text, content or message, the task in task_id, task or
+            conversation_id (default: the file name) and the record kind in
+            event, type or say; .gz files are decompressed
+    text    a record starts at a line beginning with an ISO 8601 timestamp,
+            optionally in brackets, and runs to the next one; one task per file
+
+Reported: per-agent and per-edge latency percentiles, retry loops (an agent
+delegated to more than once by the same activation of its delegator), the
+slowest spans with their delegation chain, and with --overlay the observed
+edges against the declared ones from analyze_agents().
+
+Usage:
+    python tools/trace_analyzer.py transcripts/*.jsonl
+    python tools/trace_analyzer.py --overlay --mermaid reports/observed-delegations.md logs/task-*.log
+    zcat exports.jsonl.gz | python tools/trace_analyzer.py --format jsonl --json -
+"""
+
+import re
+import sys
+import json
+import gzip
+import math
+import heapq
+import argparse
+from itertools import chain
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+FORMATS = ['auto', 'jsonl', 'text']
+
+# The header must open the message; placeholders such as [recipient agent's slug] do not match
+HEADER = re.compile(
+    r'\s*To:\s*([a-z0-9]+(?:-[a-z0-9]+)*)\s*(?:,\s*|\n\s*)From:\s*([a-z0-9]+(?:-[a-z0-9]+)*)'
+)
+# Only the start of each message is kept while reading
+HEADER_WINDOW = 512
+
+TEXT_RECORD = re.compile(
+    r'^\[?(\d{4}-\d\d-\d\d[T ]\d\d:\d\d(?::\d\d(?:\.\d+)?)?(?:Z|[+-]\d\d:?\d\d)?)\]?\s?(.*)'
+)
+
+TIME_FIELDS = ('timestamp', 'ts', 'time', 'created_at')
+TEXT_FIELDS = ('text', 'content', 'message')
+TASK_FIELDS = ('task_id', 'task', 'conversation_id')
+KIND_FIELDS = ('event', 'type', 'say')
+DISPATCH_KINDS = {'new_task', 'delegate', 'delegation', 'dispatch'}
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Epoch seconds for an ISO 8601 string or an epoch number (seconds or milliseconds)."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            try:
+                moment = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+            except ValueError:
+                return None
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=timezone.utc)
+            return moment.timestamp()
+    if isinstance(value, (int, float)) and math.isfinite(value):
+        return value / 1000.0 if value > 1e11 else float(value)
+    return None
+
+def parse_header(text: str) -> Optional[Tuple[str, str]]:
+    """(recipient, sender) from a message that opens with a routing header."""
+    match = HEADER.match(text, 0, HEADER_WINDOW)
+    return (match.group(1), match.group(2)) if match else None
+
+class LatencyHistogram:
+    """
+    Streaming latency distribution in log-spaced buckets.
+
+    Each bucket is GROWTH times wider than the previous one, so a percentile
+    read from a bucket is within 1% of the exact value while the memory
+    used depends only on the range of latencies, not on how many were added.
+    """
+
+    RESOLUTION = 0.001  # seconds; shorter spans share the first bucket
+    GROWTH = 1.01
+    _LOG_GROWTH = math.log(GROWTH)
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        index = 0
+        if seconds > self.RESOLUTION:
+            index = math.ceil(math.log(seconds / self.RESOLUTION) / self._LOG_GROWTH)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentiles(self, fractions: Iterable[float]) -> List[float]:
+        """Nearest-rank percentiles, as workflow_simulator reports them."""
+        if not self.count:
+            return [0.0 for _ in fractions]
+        ranks = [(max(1, math.ceil(fraction * self.count)), position) for position, fraction in enumerate(fractions)]
+        values = [0.0] * len(ranks)
+        pending = sorted(ranks)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            while pending and pending[0][0] <= seen:
+                # The bucket's geometric midpoint is within half a bucket of every value in it
+                middle = self.RESOLUTION * self.GROWTH ** max(index - 0.5, 0)
+                values[pending.pop(0)[1]] = min(max(middle, self.min), self.max)
+            if not pending:
+                break
+        return values
+
+    def summary(self) -> Dict:
+        p50, p90, p99 = self.percentiles((0.5, 0.9, 0.99))
+        return {
+            'count': self.count,
+            'total_seconds': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': p50,
+            'p90': p90,
+            'p99': p99,
+            'max': self.max
+        }
+
+class _Frame:
+    """An agent holding control within a task while its delegations run."""
+
+    __slots__ = ('agent', 'start', 'child_seconds', 'attempts')
+
+    def __init__(self, agent: str, start: float):
+        self.agent = agent
+        self.start = start
+        self.child_seconds = 0.0
+        self.attempts: Dict[str, List[float]] = {}  # delegate -> [count, first start, last end]
+
+class _TaskTrace:
+    """Delegation stack of one task and the time control last changed hands."""
+
+    __slots__ = ('task_id', 'stack', 'last_time')
+
+    def __init__(self, task_id: str, first_time: float):
+        self.task_id = task_id
+        self.stack: List[_Frame] = []
+        self.last_time = first_time
+
+class TraceAnalyzer:
+    """
+    Rebuilds delegation spans from routing-header records and aggregates them.
+
+    Feed records in transcript order with add_record(), then call finish().
+    """
+
+    def __init__(self, top: int = 10, max_open_tasks: int = 1000, max_depth: int = 64):
+        self.top = top
+        self.max_open_tasks = max_open_tasks
+        self.max_depth = max_depth
+        self.tasks: 'OrderedDict[str, _TaskTrace]' = OrderedDict()
+        self.agents: Dict[str, LatencyHistogram] = {}
+        self.self_seconds: Dict[str, float] = {}
+        self.edges: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.retries: Dict[Tuple[str, str], int] = {}
+        self._slowest: List[Tuple] = []  # min-heap of (seconds, sequence, span)
+        self._loops: List[Tuple] = []  # min-heap of (attempts, seconds, sequence, loop)
+        self._sequence = 0
+        self.stats = {
+            'records': 0,
+            'headers': 0,
+            'dispatches': 0,
+            'spans': 0,
+            'untimed': 0,
+            'malformed': 0,
+            'out_of_order': 0,
+            'abandoned': 0,
+            'evicted_tasks': 0,
+            'tasks': 0
+        }
+
+    def skip(self, reason: str) -> None:
+        self.stats['records'] += 1
+        self.stats[reason] += 1
+
+    def add_record(self, task_id: str, timestamp: Optional[float], text: str, kind: Optional[str] = None) -> None:
+        """
+        One transcript record. The first record of a task starts its clock;
+        later records without a routing header (tool output, the agent's own
+        messages) do not hand over control and are only counted.
+        """
+        self.stats['records'] += 1
+        if timestamp is None:
+            self.stats['untimed'] += 1
+            return
+        task = self.tasks.get(task_id)
+        if task is None:
+            task = self.tasks[task_id] = _TaskTrace(task_id, timestamp)
+            self.stats['tasks'] += 1
+            if len(self.tasks) > self.max_open_tasks:
+                self._close_task(self.tasks.popitem(last=False)[1])
+                self.stats['evicted_tasks'] += 1
+        else:
+            self.tasks.move_to_end(task_id)
+
+        header = parse_header(text) if text else None
+        if header is None:
+            return
+        if timestamp < task.last_time:
+            self.stats['out_of_order'] += 1
+            return
+        self.stats['headers'] += 1
+        recipient, sender = header
+        if kind in DISPATCH_KINDS:
+            self.stats['dispatches'] += 1
+            self._dispatch(task, sender, recipient, timestamp)
+        else:
+            self._complete(task, recipient, sender, timestamp)
+        task.last_time = timestamp
+
+    def _push(self, task: _TaskTrace, frame: _Frame) -> None:
+        task.stack.append(frame)
+        if len(task.stack) > self.max_depth:
+            self._close_frame(task, task.stack.pop(0))
+            self.stats['abandoned'] += 1
+
+    def _dispatch(self, task: _TaskTrace, delegator: str, delegate: str, timestamp: float) -> None:
+        if not task.stack or task.stack[-1].agent != delegator:
+            self._push(task, _Frame(delegator, task.last_time))
+        self._push(task, _Frame(delegate, timestamp))
+
+    def _complete(self, task: _TaskTrace, delegator: str, delegate: str, timestamp: float) -> None:
+        stack = task.stack
+        frame = None
+        # The delegate's own frame is on top unless it is a leaf; with self and
+        # cyclic delegations the slug alone is ambiguous, so the frame must sit
+        # on one of the delegator's
+        if stack and stack[-1].agent == delegate and (
+            delegate != delegator or (len(stack) > 1 and stack[-2].agent == delegator)
+        ):
+            frame = stack.pop()
+        elif stack and stack[-1].agent != delegator:
+            for depth in range(len(stack) - 2, -1, -1):
+                if stack[depth].agent == delegate and (depth == 0 or stack[depth - 1].agent == delegator):
+                    # Frames opened above the delegate never completed
+                    while len(stack) > depth + 1:
+                        self._close_frame(task, stack.pop())
+                        self.stats['abandoned'] += 1
+                    frame = stack.pop()
+                    break
+        start = frame.start if frame is not None else task.last_time
+        seconds = timestamp - start
+        own_seconds = seconds - frame.child_seconds if frame is not None else seconds
+        if frame is not None:
+            self._close_frame(task, frame)
+
+        if not stack or stack[-1].agent != delegator:
+            self._push(task, _Frame(delegator, start))
+        parent = stack[-1]
+        parent.child_seconds += seconds
+        attempt = parent.attempts.get(delegate)
+        if attempt is None:
+            parent.attempts[delegate] = [1, start, timestamp]
+        else:
+            attempt[0] += 1
+            attempt[2] = timestamp
+            self.retries[(delegator, delegate)] = self.retries.get((delegator, delegate), 0) + 1
+
+        self.stats['spans'] += 1
+        histogram = self.agents.get(delegate)
+        if histogram is None:
+            histogram = self.agents[delegate] = LatencyHistogram()
+        histogram.add(seconds)
+        self.self_seconds[delegate] = self.self_seconds.get(delegate, 0.0) + max(own_seconds, 0.0)
+        histogram = self.edges.get((delegator, delegate))
+        if histogram is None:
+            histogram = self.edges[(delegator, delegate)] = LatencyHistogram()
+        histogram.add(seconds)
+
+        self._sequence += 1
+        if len(self._slowest) < self.top or seconds > self._slowest[0][0]:
+            span = {
+                'task': task.task_id,
+                'seconds': seconds,
+                'start': start,
+                'end': timestamp,
+                'chain': [entry.agent for entry in stack] + [delegate]
+            }
+            item = (seconds, self._sequence, span)
+            if len(self._slowest) < self.top:
+                heapq.heappush(self._slowest, item)
+            else:
+                heapq.heapreplace(self._slowest, item)
+
+    def _close_frame(self, task: _TaskTrace, frame: _Frame) -> None:
+        """Record the retry loops of a frame that will not see more delegations."""
+        for delegate, (count, first_start, last_end) in frame.attempts.items():
+            if count < 2:
+                continue
+            self._sequence += 1
+            loop = {
+                'task': task.task_id,
+                'delegator': frame.agent,
+                'agent': delegate,
+                'attempts': int(count),
+                'seconds': last_end - first_start
+            }
+            item = (count, loop['seconds'], self._sequence, loop)
+            if len(self._loops) < self.top:
+                heapq.heappush(self._loops, item)
+            elif item[:2] > self._loops[0][:2]:
+                heapq.heapreplace(self._loops, item)
+
+    def _close_task(self, task: _TaskTrace) -> None:
+        while task.stack:
+            self._close_frame(task, task.stack.pop())
+
+    def finish(self) -> None:
+        """Close every open task; frames still open at the end are not spans."""
+        for task_id in list(self.tasks):
+            self._close_task(self.tasks[task_id])
+            del self.tasks[task_id]
+
+    def results(self) -> Dict:
+        agents = {
+            slug: dict(histogram.summary(), self_seconds=self.self_seconds[slug])
+            for slug, histogram in sorted(self.agents.items(), key=lambda entry: (-entry[1].total, entry[0]))
+        }
+        edges = [
+            dict({'from': delegator, 'to': delegate, 'retries': self.retries.get((delegator, delegate), 0)},
+                 **histogram.summary())
+            for (delegator, delegate), histogram in sorted(
+                self.edges.items(), key=lambda entry: (-entry[1].total, entry[0])
+            )
+        ]
+        return {
+            'stats': dict(self.stats),
+            'agents': agents,
+            'edges': edges,
+            'retry_loops': [loop for *_, loop in sorted(self._loops, key=lambda item: item[:3], reverse=True)],
+            'slowest_spans': [span for *_, span in sorted(self._slowest, key=lambda item: item[:2], reverse=True)]
+        }
+
+# -- Readers ------------------------------------------------------------------
+
+def open_source(source: str) -> TextIO:
+    """A text stream for a path ('-' for stdin); .gz files are decompressed."""
+    if source == '-':
+        return sys.stdin
+    if source.endswith('.gz'):
+        return gzip.open(source, 'rt', encoding='utf-8', errors='replace')
+    return open(source, 'r', encoding='utf-8', errors='replace')
+
+def _field(record: Dict, names: Tuple[str, ...]) -> Any:
+    for name in names:
+        if name in record:
+            return record[name]
+    return None
+
+def _record_text(value: Any) -> str:
+    """Message text from a string or a list of content parts ({'type': 'text', 'text': ...})."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        for part in value:
+            if isinstance(part, str):
+                return part
+            if isinstance(part, dict) and isinstance(part.get('text'), str):
+                return part['text']
+    return ''
+
+def read_jsonl(lines: Iterable[str], analyzer: TraceAnalyzer, default_task: str) -> None:
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            analyzer.skip('malformed')
+            continue
+        if not isinstance(record, dict):
+            analyzer.skip('malformed')
+            continue
+        task_id = _field(record, TASK_FIELDS)
+        kind = _field(record, KIND_FIELDS)
+        analyzer.add_record(
+            str(task_id) if task_id is not None else default_task,
+            parse_timestamp(_field(record, TIME_FIELDS)),
+            _record_text(_field(record, TEXT_FIELDS))[:HEADER_WINDOW],
+            kind if isinstance(kind, str) else None
+        )
+
+def read_text(lines: Iterable[str], analyzer: TraceAnalyzer, task_id: str) -> None:
+    timestamp: Optional[float] = None
+    window: List[str] = []
+    size = 0
+    open_record = False
+    for line in lines:
+        match = TEXT_RECORD.match(line)
+        if match:
+            if open_record:
+                analyzer.add_record(task_id, timestamp, ''.join(window))
+            timestamp = parse_timestamp(match.group(1))
+            window = [match.group(2) + '\n']
+            size = len(window[0])
+            open_record = True
+        elif open_record and size < HEADER_WINDOW:
+            window.append(line)
+            size += len(line)
+    if open_record:
+        analyzer.add_record(task_id, timestamp, ''.join(window))
+
+def analyze_source(source: str, analyzer: TraceAnalyzer, format: str = 'auto') -> None:
+    """Stream one transcript file (or '-') into analyzer."""
+    stream = open_source(source)
+    try:
+        lines: Iterator[str] = iter(stream)
+        if format == 'auto':
+            name = source[:-3] if source.endswith('.gz') else source
+            if name.endswith(('.jsonl', '.ndjson')):
+                format = 'jsonl'
+            elif name.endswith(('.log', '.txt', '.md')):
+                format = 'text'
+            else:
+                first = next((line for line in lines if line.strip()), '')
+                format = 'jsonl' if first.lstrip().startswith('{') else 'text'
+                lines = chain([first], lines)
+        task_id = 'stdin' if source == '-' else Path(source).name
+        if format == 'jsonl':
+            read_jsonl(lines, analyzer, task_id)
+        else:
+            read_text(lines, analyzer, task_id)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+# -- Overlay ------------------------------------------------------------------
+
+def overlay(graph: Any, edges: List[Dict]) -> Dict:
+    """Compare observed delegations with the ones declared in customInstructions."""
+    declared = {(from_slug, to_slug) for from_slug, to_slug, _ in graph.edges}
+    observed = {(edge['from'], edge['to']): edge['count'] for edge in edges}
+    agents = {slug for pair in observed for slug in pair}
+    return {
+        'declared': len(declared),
+        'observed': len(observed),
+        'coverage': len(declared & observed.keys()) / len(declared) if declared else 0.0,
+        'exercised': [
+            {'from': a, 'to': b, 'count': observed[(a, b)]} for a, b in sorted(declared & observed.keys())
+        ],
+        'never_observed': [[a, b] for a, b in sorted(declared - observed.keys())],
+        'undeclared': [
+            {'from': a, 'to': b, 'count': observed[(a, b)]} for a, b in sorted(observed.keys() - declared)
+        ],
+        'unknown_agents': sorted(agents - graph.nodes.keys())
+    }
+
+def write_overlay_mermaid(graph: Any, result: Dict, output_path: Path) -> None:
+    """Mermaid flowchart of the declared graph with the observed delegations drawn over it."""
+    def node_id(slug: str) -> str:
+        return slug.replace('-', '_')
+
+    lines = [
+        "```mermaid",
+        "flowchart TD",
+        "    %% solid: declared and observed (label = spans), dotted: declared only, thick red: undeclared",
+        ""
+    ]
+    for slug in list(graph.nodes) + result['unknown_agents']:
+        lines.append(f"    {node_id(slug)}[\"{slug}\"]")
+    lines.append("")
+    links = []
+    for edge in result['exercised']:
+        links.append(f"    {node_id(edge['from'])} -->|{edge['count']}| {node_id(edge['to'])}")
+    for from_slug, to_slug in result['never_observed']:
+        links.append(f"    {node_id(from_slug)} -.-> {node_id(to_slug)}")
+    first_undeclared = len(links)
+    for edge in result['undeclared']:
+        links.append(f"    {node_id(edge['from'])} ==>|{edge['count']}| {node_id(edge['to'])}")
+    lines.extend(links)
+    if len(links) > first_undeclared:
+        indexes = ','.join(str(index) for index in range(first_undeclared, len(links)))
+        lines.append(f"    linkStyle {indexes} stroke:#D0021B,stroke-width:3px")
+    lines.append("```")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+# -- Report -------------------------------------------------------------------
+
+def print_report(results: Dict, top: int = 10, out=sys.stdout) -> None:
+    """Human-readable summary of the analyzed traces."""
+    stats = results['stats']
+    print(f"Delegation traces: {stats['records']} records, {stats['tasks']} tasks, {stats['headers']} routing headers, "
+          f"{stats['spans']} spans (times in seconds)", file=out)
+    skipped = {key: stats[key] for key in ('untimed', 'malformed', 'out_of_order', 'abandoned', 'evicted_tasks') if stats[key]}
+    if skipped:
+        print('Skipped: ' + ', '.join(f"{value} {key.replace('_', ' ')}" for key, value in skipped.items()), file=out)
+
+    print(f"\n{'Agent':<44} {'Spans':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'Max':>8} {'Self':>9}", file=out)
+    for slug, entry in list(results['agents'].items())[:top]:
+        print(f"{slug:<44} {entry['count']:6d} {entry['p50']:8.1f} {entry['p90']:8.1f} {entry['p99']:8.1f} "
+              f"{entry['max']:8.1f} {entry['self_seconds']:9.0f}", file=out)
+
+    print(f"\n{'Delegation':<84} {'Spans':>6} {'p50':>8} {'p99':>8} {'Retries':>8}", file=out)
+    for edge in results['edges'][:top]:
+        label = f"{edge['from']} -> {edge['to']}"
+        print(f"{label:<84} {edge['count']:6d} {edge['p50']:8.1f} {edge['p99']:8.1f} {edge['retries']:8d}", file=out)
+
+    if results['retry_loops']:
+        print("\nRetry loops:", file=out)
+        for loop in results['retry_loops']:
+            print(f"  {loop['attempts']:3d}x {loop['delegator']} -> {loop['agent']}  "
+                  f"{loop['seconds']:.0f} s  ({loop['task']})", file=out)
+
+    if results['slowest_spans']:
+        print("\nSlowest delegations:", file=out)
+        for span in results['slowest_spans']:
+            print(f"  {span['seconds']:8.1f}  {' -> '.join(span['chain'])}  ({span['task']})", file=out)
+
+    result = results.get('overlay')
+    if result:
+        print(f"\nDeclared vs observed: {len(result['exercised'])} of {result['declared']} declared delegations "
+              f"observed ({result['coverage'] * 100:.0f}%), {len(result['undeclared'])} undeclared", file=out)
+        for edge in result['undeclared'][:top]:
+            print(f"  undeclared  {edge['from']} -> {edge['to']}  ({edge['count']} spans)", file=out)
+        if result['unknown_agents']:
+            print(f"  agents not in agents/: {', '.join(result['unknown_agents'])}", file=out)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Rebuild delegation spans from routing headers in task transcripts and report their latency'
+    )
+    parser.add_argument('files', nargs='+', help="Transcript files (JSONL or text, optionally .gz); '-' reads stdin")
+    parser.add_argument('--format', choices=FORMATS, default='auto', help='Input format (default: detect per file)')
+    parser.add_argument('--top', type=int, default=10, help='Rows per table, slowest spans and retry loops kept (default: 10)')
+    parser.add_argument('--max-open-tasks', type=int, default=1000,
+                        help='Interleaved tasks tracked at once; the least recently active is closed beyond this (default: 1000)')
+    parser.add_argument('--overlay', action='store_true', help='Compare observed delegations with the declared graph')
+    parser.add_argument('--agents-dir', type=str, default='agents',
+                        help='Directory containing agent YAML files, for --overlay (default: agents)')
+    parser.add_argument('--mermaid', type=Path, help='With --overlay, write the overlay as a Mermaid flowchart to this path')
+    parser.add_argument('--json', action='store_true', help='Print the full results as JSON')
+    args = parser.parse_args()
+    if args.mermaid and not args.overlay:
+        parser.error('--mermaid requires --overlay')
+
+    analyzer = TraceAnalyzer(top=args.top, max_open_tasks=args.max_open_tasks)
+    try:
+        for source in args.files:
+            analyze_source(source, analyzer, args.format)
+    except OSError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(2)
+    analyzer.finish()
+    results = analyzer.results()
+
+    if args.overlay:
+        from agent_graph import analyze_agents
+
+        agents_dir = Path(args.agents_dir)
+        if not agents_dir.is_absolute():
+            agents_dir = PROJECT_ROOT / agents_dir
+        graph = analyze_agents(agents_dir, verbose=False)
+        results['overlay'] = overlay(graph, results['edges'])
+        if args.mermaid:
+            write_overlay_mermaid(graph, results['overlay'], args.mermaid)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results, args.top)
+
+if __name__ == '__main__':
+    main()
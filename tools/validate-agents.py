@@ -9,15 +9,46 @@ Usage:
     python tools/validate-agents.py
     python tools/validate-agents.py --verbose
     python tools/validate-agents.py --agent agents/uber-orchestrator.yaml
+    python tools/validate-agents.py --jobs 8
+    python tools/validate-agents.py --no-cache
+    python tools/validate-agents.py --watch
+    python tools/validate-agents.py --agent custom_modes.yaml --stream
+    python tools/validate-agents.py --profile --timings-json .cache/validate-timings.json
+    python tools/validate-agents.py --format ndjson -j 8 | jq .
+    python tools/validate-agents.py --format junit > validate-agents.xml
 """
 
+import os
 import sys
 import json
-import yaml
+import time
+import hashlib
+import functools
 import argparse
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
-from jsonschema import validate, ValidationError, SchemaError
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple, Any
+
+import profiling
+from reporters import FORMATS, Reporter, create_reporter, file_record
+from agent_fragments import library_for
+from agent_registry import AgentRegistry, parse_snapshot_entry, parse_yaml_file
+
+# jsonschema, the process pool and the YAML event streamer are imported where
+# they are used: a run answered entirely from the cache never needs them
+if TYPE_CHECKING:
+    from jsonschema import Draft7Validator
+    from agent_lint import LintEngine
+
+# Bump whenever a check changes its output, so cached results are invalidated
+VALIDATOR_VERSION = '1.1.0'
+
+# Enabled lint rules and their severities (see agent_lint)
+LINT_CONFIG_PATH = Path(__file__).resolve().parent.parent / 'schemas' / 'lint-rules.json'
+
+# Per-process validators, compiled once by _init_worker() in each pool worker
+_WORKER_VALIDATOR: Optional['Draft7Validator'] = None
+_WORKER_FAST_VALIDATOR: Optional[Callable[[Any], bool]] = None
+_WORKER_SCHEMA: Optional[Dict] = None
 
 # Color codes for terminal output
 class Colors:
@@ -27,6 +58,143 @@ class Colors:
     BLUE = '\033[94m'
     BOLD = '\033[1m'
     END = '\033[0m'
+    
+    @classmethod
+    def disable(cls) -> None:
+        """Turn every color code into an empty string (output is not a terminal)."""
+        for name in ('GREEN', 'RED', 'YELLOW', 'BLUE', 'BOLD', 'END'):
+            setattr(cls, name, '')
+
+class ValidationCache:
+    """
+    Persistent on-disk cache of per-file validation results.
+    
+    Entries map an agent file to the SHA-256 of its content and the stored
+    (is_valid, errors, warnings) result. The whole cache is discarded when the
+    schema hash, the shared fragments, the lint rule configuration, the
+    validator version or the verbosity differs, so a hit is only possible
+    when re-validating would produce exactly the same output.
+    """
+    
+    def __init__(
+        self,
+        cache_path: Path,
+        schema_hash: str,
+        verbose: bool = False,
+        fragments_hash: Optional[str] = None,
+        lint_hash: Optional[str] = None
+    ):
+        self.cache_path = cache_path
+        self.header = {
+            'validator_version': VALIDATOR_VERSION,
+            'schema_hash': schema_hash,
+            'fragments_hash': fragments_hash,
+            'lint_hash': lint_hash,
+            'verbose': verbose
+        }
+        self.entries: Dict[str, Dict] = {}
+        self.seen: set = set()
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self._load()
+    
+    def _load(self) -> None:
+        """Read the cache file, ignoring it if missing, corrupt or stale."""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('header') == self.header:
+            self.entries = data.get('entries', {})
+        else:
+            self.dirty = True
+    
+    def lookup(self, yaml_path: Path, digest: str) -> Optional[Tuple[bool, List[str], List[str]]]:
+        """Return the cached result for this file content, or None on a miss."""
+        key = str(yaml_path.resolve())
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if entry is not None and entry.get('digest') == digest:
+            self.hits += 1
+            is_valid, errors, warnings = entry['result']
+            return is_valid, errors, warnings
+        self.misses += 1
+        return None
+    
+    def store(self, yaml_path: Path, digest: str, result: Tuple[bool, List[str], List[str]]) -> None:
+        """Record the validation result for this file content."""
+        key = str(yaml_path.resolve())
+        self.seen.add(key)
+        self.entries[key] = {'digest': digest, 'result': list(result)}
+        self.dirty = True
+    
+    def save(self, prune: bool = False) -> None:
+        """
+        Atomically write the cache back to disk if anything changed.
+        
+        With prune=True, entries for files not looked up in this run are dropped.
+        """
+        if prune:
+            stale = set(self.entries) - self.seen
+            for key in stale:
+                del self.entries[key]
+            self.dirty = self.dirty or bool(stale)
+        if not self.dirty:
+            return
+        import tempfile
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.cache_path.parent, prefix=self.cache_path.name, suffix='.tmp'
+        )
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'header': self.header, 'entries': self.entries}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # A cache that cannot be written only costs speed on the next run
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        self.dirty = False
+
+def hash_file(path: Path) -> Optional[str]:
+    """Return the SHA-256 hex digest of a file's content, or None if unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def hash_lint_config(config_path: Path) -> Optional[str]:
+    """
+    SHA-256 over the lint configuration and the source of every rule module
+    it lists, so editing a rule module invalidates cached results too. The
+    modules are located without importing them. None if the configuration
+    is unreadable.
+    """
+    import importlib.util
+
+    try:
+        with open(config_path, 'rb') as f:
+            content = f.read()
+        modules = json.loads(content).get('modules', [])
+    except (OSError, ValueError, AttributeError):
+        return None
+    sha = hashlib.sha256(content)
+    for module in modules if isinstance(modules, list) else []:
+        try:
+            spec = importlib.util.find_spec(str(module))
+        except (ImportError, ValueError):
+            spec = None
+        origin = spec.origin if spec is not None else None
+        # A module that cannot be found hashes as None; load_config() reports it
+        digest = hash_file(Path(origin)) if origin and origin not in ('built-in', 'frozen') else None
+        sha.update(f"\0{module}\0{digest}".encode('utf-8'))
+    return sha.hexdigest()
 
 def load_schema(schema_path: Path) -> Dict:
     """Load and parse the JSON schema."""
@@ -40,103 +208,120 @@ def load_schema(schema_path: Path) -> Dict:
         print(f"{Colors.RED}✗ Invalid JSON in schema: {e}{Colors.END}")
         sys.exit(1)
 
+def compile_validator(schema: Dict) -> 'Draft7Validator':
+    """
+    Check the schema and build a reusable Draft-7 validator for it.
+
+    Raises SchemaError if the schema itself is invalid.
+    """
+    from jsonschema import Draft7Validator
+
+    Draft7Validator.check_schema(schema)
+    return Draft7Validator(schema)
+
+def compile_fast_validator(schema: Dict) -> Optional[Callable[[Any], bool]]:
+    """
+    The generated fast-path check for schema (see schema_codegen); None if
+    the schema uses keywords the generator does not support. Only use it for a schema compile_validator() accepted.
+    """
+    from schema_codegen import load_fast_validator
+
+    return load_fast_validator(schema)
+
 def load_yaml_file(yaml_path: Path) -> Dict:
-    """Load and parse a YAML agent definition file."""
-    try:
-        with open(yaml_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    except FileNotFoundError:
-        raise FileNotFoundError(f"YAML file not found: {yaml_path}")
-    except yaml.YAMLError as e:
-        raise ValueError(f"Invalid YAML: {e}")
+    """
+    Load and parse a YAML agent definition file (libyaml C loader when
+    available), expanding includes from the fragments/ directory next to it.
+    """
+    return library_for(yaml_path.parent).expand_document(parse_yaml_file(yaml_path))
 
 def validate_communication_protocol(agent_data: Dict, agent_file: str) -> List[str]:
     """
     Validate that the agent's customInstructions includes the mandatory
     communication protocol header requirement.
     """
-    warnings = []
-    
-    if 'customModes' not in agent_data:
-        return warnings
-    
-    for mode in agent_data['customModes']:
-        custom_instructions = mode.get('customInstructions', '')
-        slug = mode.get('slug', 'unknown')
-        
-        # Check for mandatory routing header mention
-        protocol_keywords = [
-            'To: [recipient agent\'s slug], From: [your agent\'s slug]',
-            'mandatory routing header',
-            'communication protocol'
-        ]
-        
-        has_protocol = any(keyword in custom_instructions for keyword in protocol_keywords)
-        
-        if not has_protocol:
-            warnings.append(
-                f"  ⚠️  Agent '{slug}' may be missing communication protocol requirement"
-            )
-    
-    return warnings
+    return _single_rule('communication_protocol', agent_data, agent_file)
 
 def validate_signal_framework(agent_data: Dict, agent_file: str) -> List[str]:
     """
     Validate Signal Interpretation Framework presence in orchestrator-state-scribe.
     """
-    warnings = []
-    
-    if 'orchestrator-state-scribe' not in agent_file:
-        return warnings
-    
-    if 'customModes' not in agent_data:
-        return warnings
-    
-    for mode in agent_data['customModes']:
-        custom_instructions = mode.get('customInstructions', '')
-        
-        # Check for Signal Framework components
-        framework_components = [
-            'Signal Interpretation Framework',
-            'signalCategories',
-            'signalTypes',
-            'interpretationLogic',
-            'keywordsToSignalType'
-        ]
-        
-        missing_components = [
-            comp for comp in framework_components 
-            if comp not in custom_instructions
-        ]
-        
-        if missing_components:
-            warnings.append(
-                f"  ⚠️  State Scribe may be missing Signal Framework components: {', '.join(missing_components)}"
-            )
-    
-    return warnings
+    return _single_rule('signal_framework', agent_data, agent_file)
+
+def validate_instruction_layout(agent_data: Dict) -> List[str]:
+    """
+    Warn about very long single-line customInstructions, which are hard to
+    read and review compared with YAML literal blocks.
+    """
+    return _single_rule('instruction_layout', agent_data, '')
+
+def _single_rule(name: str, agent_data: Dict, agent_file: str) -> List[str]:
+    """Run one lint rule regardless of configuration, as a warning (for existing callers)."""
+    errors, warnings = _rule_engine(name).check_document(agent_data, agent_file)
+    return errors + warnings
+
+@functools.lru_cache(maxsize=None)
+def _rule_engine(name: str) -> 'LintEngine':
+    """The engine running only rule name, built (and its Scanner compiled) once per process."""
+    from agent_lint import LintEngine
+
+    return LintEngine(only=[name])
+
+def lint_agent(agent_data: Dict, agent_file: str) -> Tuple[List[str], List[str]]:
+    """
+    Run every lint rule enabled in schemas/lint-rules.json with one scan of
+    each customInstructions. Returns (errors, warnings).
+    """
+    from agent_lint import load_engine
+
+    return load_engine(LINT_CONFIG_PATH).check_document(agent_data, agent_file)
 
 def validate_agent_file(
     yaml_path: Path, 
     schema: Dict, 
-    verbose: bool = False
+    verbose: bool = False,
+    validator: Optional['Draft7Validator'] = None,
+    loader: Optional[Callable[[Path], Any]] = None,
+    fast_validator: Optional[Callable[[Any], bool]] = None
 ) -> Tuple[bool, List[str], List[str]]:
     """
     Validate a single agent YAML file against the schema.
     
+    Pass a validator from compile_validator() to avoid rebuilding it for
+    every file; otherwise one is compiled for this call only. A
+    fast_validator from compile_fast_validator() is tried first, and
+    jsonschema only runs (and reports) when it rejects the document. The
+    loader (default: load_yaml_file) lets callers supply already-parsed
+    documents, e.g. AgentRegistry.document.
+    
     Returns:
         (is_valid, errors, warnings)
     """
+    from jsonschema import ValidationError, SchemaError
+    from jsonschema.exceptions import best_match
+
     errors = []
     warnings = []
     
     try:
         # Load YAML
-        agent_data = load_yaml_file(yaml_path)
+        with profiling.phase('load', yaml_path):
+            agent_data = (loader or load_yaml_file)(yaml_path)
         
-        # Schema validation
+        # Schema validation: the generated fast path accepts valid documents
+        # without walking the schema; jsonschema explains the rest
         try:
-            validate(instance=agent_data, schema=schema)
+            with profiling.phase('validate', yaml_path):
+                accepted = fast_validator is not None and fast_validator(agent_data)
+            if not accepted:
+                if validator is None:
+                    with profiling.phase('schema_compile'):
+                        validator = compile_validator(schema)
+                # Same error selection as jsonschema.validate()
+                with profiling.phase('validate:jsonschema', yaml_path):
+                    error = best_match(validator.iter_errors(agent_data))
+                if error is not None:
+                    raise error
         except ValidationError as e:
             errors.append(f"  ✗ Schema validation failed: {e.message}")
             if verbose:
@@ -146,25 +331,14 @@ def validate_agent_file(
             errors.append(f"  ✗ Schema itself is invalid: {e.message}")
             return False, errors, warnings
         
-        # Custom validation: Communication Protocol
-        comm_warnings = validate_communication_protocol(agent_data, str(yaml_path))
-        warnings.extend(comm_warnings)
+        # Custom validation: communication protocol, Signal Framework (for
+        # state-scribe) and layout rules, in one scan of customInstructions
+        with profiling.phase('check:lint', yaml_path):
+            lint_errors, lint_warnings = lint_agent(agent_data, str(yaml_path))
+        errors.extend(lint_errors)
+        warnings.extend(lint_warnings)
         
-        # Custom validation: Signal Framework (for state-scribe)
-        signal_warnings = validate_signal_framework(agent_data, str(yaml_path))
-        warnings.extend(signal_warnings)
-        
-        # Additional checks
-        if 'customModes' in agent_data:
-            for mode in agent_data['customModes']:
-                # Check for very long single-line customInstructions
-                custom_inst = mode.get('customInstructions', '')
-                if len(custom_inst) > 1000 and '\n' not in custom_inst:
-                    warnings.append(
-                        f"  ⚠️  Agent '{mode.get('slug')}' has very long single-line customInstructions (>1000 chars)"
-                    )
-        
-        return True, errors, warnings
+        return not errors, errors, warnings
         
     except FileNotFoundError as e:
         errors.append(f"  ✗ {e}")
@@ -176,105 +350,716 @@ def validate_agent_file(
         errors.append(f"  ✗ Unexpected error: {e}")
         return False, errors, warnings
 
-def main():
-    parser = argparse.ArgumentParser(
-        description='Validate AI Agent YAML definitions against schema'
-    )
-    parser.add_argument(
-        '--verbose', '-v',
-        action='store_true',
-        help='Show detailed validation messages'
-    )
-    parser.add_argument(
-        '--agent', '-a',
-        type=str,
-        help='Validate a specific agent file instead of all agents'
-    )
+def _init_worker(schema: Dict, profile: bool = False, trace_memory: bool = False) -> None:
+    """
+    Pool initializer: compile the schema validator once per worker process.
     
-    args = parser.parse_args()
+    With profile, phases are recorded in the worker and shipped back with
+    each result.
+    """
+    global _WORKER_VALIDATOR, _WORKER_FAST_VALIDATOR, _WORKER_SCHEMA
+    from jsonschema import SchemaError
+
+    _WORKER_SCHEMA = schema
+    if profile:
+        profiler = profiling.install(profiling.Profiler('worker', trace_memory=trace_memory))
+        profiler.keep_records = True
+        profiler.start()
+    try:
+        _WORKER_VALIDATOR = compile_validator(schema)
+        _WORKER_FAST_VALIDATOR = compile_fast_validator(schema)
+    except SchemaError:
+        # Leave them unset so validate_agent_file() reports the schema error per file
+        _WORKER_VALIDATOR = _WORKER_FAST_VALIDATOR = None
+
+# (is_valid, errors, warnings) as returned by validate_agent_file()
+Result = Tuple[bool, List[str], List[str]]
+
+def _validate_timed(
+    yaml_path: Path,
+    schema: Dict,
+    verbose: bool,
+    validator: Optional['Draft7Validator'],
+    loader: Optional[Callable[[Path], Any]],
+    fast_validator: Optional[Callable[[Any], bool]] = None
+) -> Tuple[Result, float]:
+    """Validate one file and return (result, wall seconds)."""
+    started = time.perf_counter()
+    result = validate_agent_file(yaml_path, schema, verbose, validator, loader, fast_validator)
+    return result, time.perf_counter() - started
+
+# (digest, marshalled document, YAML error) of a file parsed in a worker for the registry
+ParsedEntry = Tuple[str, Optional[bytes], Optional[str]]
+
+def _parsing_loader(parsed: List[ParsedEntry]) -> Callable[[Path], Any]:
+    """A load_yaml_file() that also appends the snapshot entry it parsed to parsed."""
+    def load(yaml_path: Path) -> Any:
+        try:
+            with open(yaml_path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"YAML file not found: {yaml_path}")
+        with profiling.phase('yaml_parse', yaml_path):
+            document, blob, error = parse_snapshot_entry(content, yaml_path)
+        parsed.append((hashlib.sha256(content).hexdigest(), blob, error))
+        if error is not None:
+            raise ValueError(error)
+        return library_for(yaml_path.parent).expand_document(document)
+    return load
+
+def _validate_in_worker(
+    chunk: List[Tuple[int, Path, bool, bool, Any]]
+) -> List[Tuple[int, Result, float, List[profiling.PhaseRecord], Optional[ParsedEntry]]]:
+    """
+    Validate a chunk of files inside a pool worker using its resident validator.
     
-    # Paths
-    project_root = Path(__file__).parent.parent
-    schema_path = project_root / 'schemas' / 'agent-mode-schema.json'
-    agents_dir = project_root / 'agents'
+    Jobs carry the parsed document when the parent already had it from the
+    registry; otherwise the worker parses the file itself, and when the
+    job's document is True (the registry is waiting for that file) also
+    returns the snapshot entry it parsed. Returns, per job, its index, the
+    result, the wall time, the phase records profiled for it (empty unless
+    profiling) and the parsed entry or None.
+    """
+    outcomes = []
+    for index, yaml_path, verbose, preloaded, document in chunk:
+        parsed: List[ParsedEntry] = []
+        if preloaded:
+            loader = lambda _, document=document: document
+        else:
+            loader = _parsing_loader(parsed) if document else None
+        result, seconds = _validate_timed(
+            yaml_path, _WORKER_SCHEMA, verbose, _WORKER_VALIDATOR, loader, _WORKER_FAST_VALIDATOR
+        )
+        outcomes.append((index, result, seconds, profiling.active().drain(), parsed[0] if parsed else None))
+    return outcomes
+
+def _registry_job(
+    registry: Optional[AgentRegistry],
+    index: int,
+    yaml_path: Path,
+    verbose: bool
+) -> Tuple[int, Path, bool, bool, Any]:
+    """
+    Build a worker job, attaching the registry's parsed document when
+    available, or asking the worker to parse files the registry left
+    unparsed and send the result back.
+    """
+    if registry is not None:
+        if registry.needs_parse(yaml_path):
+            return index, yaml_path, verbose, False, True
+        try:
+            return index, yaml_path, verbose, True, registry.document(yaml_path)
+        except (FileNotFoundError, ValueError):
+            pass
+    return index, yaml_path, verbose, False, None
+
+def _run_validation(
+    agent_files: List[Path],
+    schema: Dict,
+    verbose: bool = False,
+    jobs: int = 1,
+    registry: Optional[AgentRegistry] = None,
+    ordered: bool = True
+) -> Iterator[Tuple[int, Result, float]]:
+    """
+    Validate agent files, serially or in a process pool.
     
-    # Load schema
-    print(f"\n{Colors.BLUE}{'='*70}{Colors.END}")
-    print(f"{Colors.BOLD}AI Agent Orchestration System - Validator{Colors.END}")
-    print(f"{Colors.BLUE}{'='*70}{Colors.END}\n")
+    Yields (index into agent_files, result, seconds). Results come in input
+    order unless ordered is False, in which case pool results are yielded as
+    soon as their chunk completes.
+    """
+    if not agent_files:
+        return
+    from jsonschema import SchemaError
+
+    if jobs <= 1 or len(agent_files) <= 1:
+        try:
+            with profiling.phase('schema_compile'):
+                validator = compile_validator(schema)
+                fast_validator = compile_fast_validator(schema)
+        except SchemaError:
+            validator = fast_validator = None
+        loader = registry.document if registry is not None else None
+        for index, yaml_file in enumerate(agent_files):
+            result, seconds = _validate_timed(yaml_file, schema, verbose, validator, loader, fast_validator)
+            yield index, result, seconds
+        return
     
-    print(f"Loading schema from: {schema_path}")
-    schema = load_schema(schema_path)
-    print(f"{Colors.GREEN}✓ Schema loaded successfully{Colors.END}\n")
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    workers = min(jobs, len(agent_files))
+    # Large chunks keep IPC overhead low; several chunks per worker keep them balanced
+    chunksize = max(1, len(agent_files) // (workers * 4))
+    profiler = profiling.active()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(schema, profiler.enabled, profiler.trace_memory)
+    ) as executor:
+        futures = [
+            executor.submit(_validate_in_worker, [
+                _registry_job(registry, index, agent_files[index], verbose)
+                for index in range(start, min(start + chunksize, len(agent_files)))
+            ])
+            for start in range(0, len(agent_files), chunksize)
+        ]
+        for future in (futures if ordered else as_completed(futures)):
+            for index, result, seconds, records, parsed in future.result():
+                profiler.merge(records)
+                if parsed is not None:
+                    registry.record(agent_files[index], *parsed)
+                yield index, result, seconds
+
+def iter_validation_results(
+    agent_files: List[Path],
+    schema: Dict,
+    verbose: bool = False,
+    jobs: int = 1,
+    cache: Optional[ValidationCache] = None,
+    registry: Optional[AgentRegistry] = None,
+    ordered: bool = True
+) -> Iterator[Tuple[Path, Result, bool, float]]:
+    """
+    Validate agent files and yield (path, result, cache_hit, seconds).
     
-    # Determine which files to validate
-    if args.agent:
-        agent_files = [Path(args.agent)]
-        print(f"Validating single agent: {args.agent}\n")
-    else:
-        agent_files = sorted(agents_dir.glob('*.yaml'))
-        print(f"Validating {len(agent_files)} agent files from: {agents_dir}\n")
-    
-    # Validate each file
-    results = {
-        'passed': [],
-        'failed': [],
-        'warnings': []
-    }
+    Files whose content hash is found in the cache are not parsed or validated
+    again (seconds is 0.0 for them). With a refreshed registry, content hashes
+    and parsed documents come from its snapshot instead of being recomputed.
+    With jobs > 1 the remaining files are spread across a process pool.
+    Results are yielded in the order of agent_files so output stays
+    deterministic; with ordered=False cache hits come first and pool results
+    follow as they complete, for streaming consumers.
+    """
+    digests: Dict[Path, Optional[str]] = {}
+    cached: Dict[Path, Result] = {}
+    if cache is not None:
+        with profiling.phase('cache_lookup'):
+            for yaml_file in agent_files:
+                digest = registry.digest(yaml_file) if registry is not None else None
+                if digest is None:
+                    digest = hash_file(yaml_file)
+                digests[yaml_file] = digest
+                if digest is not None:
+                    result = cache.lookup(yaml_file, digest)
+                    if result is not None:
+                        cached[yaml_file] = result
+    
+    pending = [yaml_file for yaml_file in agent_files if yaml_file not in cached]
+    fresh = _run_validation(pending, schema, verbose, jobs, registry, ordered)
+    
+    def finish(index: int, result: Result, seconds: float) -> Tuple[Path, Result, bool, float]:
+        yaml_file = pending[index]
+        digest = digests.get(yaml_file)
+        if cache is not None and digest is not None:
+            cache.store(yaml_file, digest, result)
+        return yaml_file, result, False, seconds
+    
+    if not ordered:
+        for yaml_file, result in cached.items():
+            yield yaml_file, result, True, 0.0
+        for outcome in fresh:
+            yield finish(*outcome)
+        return
     
     for yaml_file in agent_files:
-        relative_path = yaml_file.relative_to(project_root)
-        print(f"Validating: {relative_path}")
+        if yaml_file in cached:
+            yield yaml_file, cached[yaml_file], True, 0.0
+            continue
+        yield finish(*next(fresh))
+
+def iter_stream_results(
+    yaml_path: Path,
+    schema: Dict,
+    verbose: bool = False
+) -> Iterator[Tuple[str, int, List[str], List[str]]]:
+    """
+    Stream-validate a merged custom_modes.yaml one mode at a time.
+    
+    Each customModes item is built from the YAML event stream and validated
+    against #/definitions/agentMode as soon as it is complete, so memory is
+    bounded by one mode plus the running slug table used to detect
+    duplicates. Every schema error of a mode is reported, not just the first.
+    
+    Yields (slug, line, errors, warnings) per mode. Structural problems
+    (invalid YAML, missing or empty customModes) raise ValueError.
+    """
+    from jsonschema import Draft7Validator
+    from yaml_stream import StreamError, iter_sequence_items
+
+    mode_schema = {
+        '$ref': '#/definitions/agentMode',
+        'definitions': schema.get('definitions', {})
+    }
+    mode_validator = Draft7Validator(mode_schema)
+    fast_validator = compile_fast_validator(mode_schema)
+    first_seen: Dict[str, int] = {}  # slug -> line of first definition
+    count = 0
+    
+    for index, line, mode in profiling.iter_phase('yaml_parse', iter_sequence_items(yaml_path, 'customModes')):
+        count += 1
+        slug = mode.get('slug') if isinstance(mode, dict) else None
+        label = slug if isinstance(slug, str) else f"customModes[{index}]"
+        errors = []
+        warnings = []
+        
+        with profiling.phase('validate', label):
+            if fast_validator is not None and fast_validator(mode):
+                schema_errors = []
+            else:
+                schema_errors = sorted(mode_validator.iter_errors(mode), key=lambda e: list(map(str, e.path)))
+        for error in schema_errors:
+            errors.append(f"  ✗ Schema validation failed: {error.message}")
+            if verbose and error.path:
+                errors.append(f"    Path: customModes -> {index} -> {' -> '.join(str(p) for p in error.path)}")
         
-        is_valid, errors, warnings = validate_agent_file(yaml_file, schema, args.verbose)
+        if isinstance(slug, str):
+            if slug in first_seen:
+                errors.append(f"  ✗ Duplicate slug '{slug}' (first defined at line {first_seen[slug]})")
+            else:
+                first_seen[slug] = line
         
-        if is_valid:
-            print(f"{Colors.GREEN}  ✓ PASS{Colors.END}")
-            results['passed'].append(str(relative_path))
+        if isinstance(mode, dict):
+            # The merged file has no per-agent file name, so rules match the scribe by slug
+            with profiling.phase('check:lint', label):
+                lint_errors, lint_warnings = lint_agent({'customModes': [mode]}, label)
+            errors.extend(lint_errors)
+            warnings.extend(lint_warnings)
+        
+        yield label, line, errors, warnings
+    
+    if count == 0:
+        raise StreamError("customModes should be non-empty")
+
+def validate_stream(
+    yaml_path: Path,
+    schema: Dict,
+    verbose: bool = False,
+    reporter: Optional[Reporter] = None
+) -> None:
+    """Report per-mode streaming validation results for a merged file and exit."""
+    if reporter is None:
+        print(f"Streaming modes from: {yaml_path}\n")
+    
+    total = passed = failed = warned = 0
+    structural_error = None
+    run_started = started = time.perf_counter()
+    try:
+        for slug, line, errors, warnings in iter_stream_results(yaml_path, schema, verbose):
+            # Time since the previous mode: building it from the stream plus its checks
+            now = time.perf_counter()
+            seconds, started = now - started, now
+            total += 1
+            if errors:
+                failed += 1
+            else:
+                passed += 1
             if warnings:
-                results['warnings'].append((str(relative_path), warnings))
-                for warning in warnings:
-                    print(f"{Colors.YELLOW}{warning}{Colors.END}")
-        else:
-            print(f"{Colors.RED}  ✗ FAIL{Colors.END}")
-            results['failed'].append(str(relative_path))
-            for error in errors:
-                print(f"{Colors.RED}{error}{Colors.END}")
+                warned += 1
+            if reporter is not None:
+                reporter.file(file_record(
+                    str(yaml_path), (not errors, errors, warnings), seconds=seconds, slug=slug, line=line
+                ))
+                continue
+            if errors:
+                print(f"{Colors.RED}  ✗ {slug} (line {line}){Colors.END}")
+                for error in errors:
+                    print(f"{Colors.RED}{error}{Colors.END}")
+            elif verbose:
+                print(f"{Colors.GREEN}  ✓ {slug}{Colors.END}")
             for warning in warnings:
                 print(f"{Colors.YELLOW}{warning}{Colors.END}")
-        
-        print()  # Blank line between files
+    except FileNotFoundError:
+        structural_error = f"YAML file not found: {yaml_path}"
+    except ValueError as e:
+        structural_error = str(e)
     
-    # Summary
-    print(f"{Colors.BLUE}{'='*70}{Colors.END}")
-    print(f"{Colors.BOLD}Validation Summary{Colors.END}")
-    print(f"{Colors.BLUE}{'='*70}{Colors.END}\n")
+    exit_code = 1 if failed > 0 or structural_error is not None else 0
+    if reporter is not None:
+        reporter.finish({
+            'total': total,
+            'passed': passed,
+            'failed': failed,
+            'warnings': warned,
+            'error': structural_error,
+            'seconds': round(time.perf_counter() - run_started, 6),
+            'ok': exit_code == 0
+        })
+        sys.exit(exit_code)
     
-    total = len(agent_files)
-    passed = len(results['passed'])
-    failed = len(results['failed'])
-    warned = len(results['warnings'])
+    print(f"\n{Colors.BLUE}{'='*70}{Colors.END}")
+    print(f"{Colors.BOLD}Streaming Validation Summary{Colors.END}")
+    print(f"{Colors.BLUE}{'='*70}{Colors.END}\n")
     
-    print(f"Total agents:    {total}")
+    print(f"Total modes:     {total}")
     print(f"{Colors.GREEN}Passed:          {passed}{Colors.END}")
     if failed > 0:
         print(f"{Colors.RED}Failed:          {failed}{Colors.END}")
     else:
         print(f"Failed:          {failed}")
-    
     if warned > 0:
         print(f"{Colors.YELLOW}With warnings:   {warned}{Colors.END}")
     
-    # Exit code
-    if failed > 0:
+    if structural_error is not None:
+        print(f"\n{Colors.RED}✗ {structural_error}{Colors.END}")
+    
+    if exit_code:
         print(f"\n{Colors.RED}✗ Validation FAILED{Colors.END}")
-        sys.exit(1)
     elif warned > 0:
         print(f"\n{Colors.YELLOW}⚠ Validation PASSED with warnings{Colors.END}")
-        sys.exit(0)
     else:
         print(f"\n{Colors.GREEN}✓ All validations PASSED{Colors.END}")
-        sys.exit(0)
+    sys.exit(exit_code)
+
+def _scan_watched(agents_dir: Path, schema_path: Path) -> Tuple[Dict[Path, Tuple[int, int]], Optional[Tuple[int, int]]]:
+    """Stat every agent file and the schema, returning (agent_stats, schema_stat)."""
+    agent_stats = {}
+    try:
+        with os.scandir(agents_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.yaml') and entry.is_file():
+                    st = entry.stat()
+                    agent_stats[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        pass
+    try:
+        st = schema_path.stat()
+        schema_stat = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        schema_stat = None
+    return agent_stats, schema_stat
+
+def _state_label(result: Optional[Tuple[bool, List[str], List[str]]]) -> str:
+    """Short pass/fail label for a validation result (None = not tracked)."""
+    if result is None:
+        return 'NEW'
+    is_valid, _, warnings = result
+    if not is_valid:
+        return 'FAIL'
+    return 'WARN' if warnings else 'PASS'
+
+def watch(
+    agents_dir: Path,
+    schema_path: Path,
+    project_root: Path,
+    verbose: bool = False,
+    interval: float = 0.05
+) -> None:
+    """
+    Re-validate agents whenever they change, until interrupted.
+    
+    The schema and its compiled validator stay resident and the agent and
+    schema files are polled by mtime and size, so an edit only costs
+    re-validating that one file. A schema or fragment change re-validates
+    every agent. Only pass/fail state transitions are printed.
+    """
+    from jsonschema import SchemaError
+
+    schema = load_schema(schema_path)
+    try:
+        validator = compile_validator(schema)
+        fast_validator = compile_fast_validator(schema)
+    except SchemaError:
+        validator = fast_validator = None
+    results: Dict[Path, Tuple[bool, List[str], List[str]]] = {}
+    known_stats: Dict[Path, Tuple[int, int]] = {}
+    known_schema_stat = None
+    fragments = library_for(agents_dir)
+    known_fragments = fragments.stat_key()
+    first_pass = True
+    
+    def display(path: Path) -> str:
+        try:
+            return str(path.relative_to(project_root))
+        except ValueError:
+            return str(path)
+    
+    print(f"Watching {agents_dir} and {schema_path} (Ctrl+C to stop)\n")
+    
+    try:
+        while True:
+            agent_stats, schema_stat = _scan_watched(agents_dir, schema_path)
+            started = time.perf_counter()
+            
+            if schema_stat != known_schema_stat:
+                if known_schema_stat is not None:
+                    try:
+                        with open(schema_path, 'r', encoding='utf-8') as f:
+                            schema = json.load(f)
+                        validator = compile_validator(schema)
+                        fast_validator = compile_fast_validator(schema)
+                        print(f"{Colors.BLUE}Schema changed, re-validating all agents{Colors.END}")
+                    except (OSError, ValueError, SchemaError) as e:
+                        validator = fast_validator = None
+                        print(f"{Colors.RED}✗ Schema could not be loaded: {e}{Colors.END}")
+                known_schema_stat = schema_stat
+                changed = sorted(agent_stats)
+            elif fragments.refresh() or fragments.stat_key() != known_fragments:
+                print(f"{Colors.BLUE}Fragments changed, re-validating all agents{Colors.END}")
+                changed = sorted(agent_stats)
+            else:
+                changed = sorted(
+                    path for path, stat in agent_stats.items()
+                    if known_stats.get(path) != stat
+                )
+            removed = sorted(set(known_stats) - set(agent_stats))
+            known_stats = agent_stats
+            known_fragments = fragments.stat_key()
+            
+            if not changed and not removed:
+                time.sleep(interval)
+                continue
+            
+            transitions = []
+            for path in removed:
+                transitions.append((path, _state_label(results.pop(path, None)), 'REMOVED', None))
+            for path in changed:
+                previous = results.get(path)
+                if validator is None:
+                    result = (False, [f"  ✗ Schema itself is invalid: {schema_path}"], [])
+                else:
+                    result = validate_agent_file(path, schema, verbose, validator, fast_validator=fast_validator)
+                results[path] = result
+                if first_pass or previous != result:
+                    transitions.append((path, _state_label(previous), _state_label(result), result))
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            
+            stamp = time.strftime('%H:%M:%S')
+            for path, before, after, result in transitions:
+                if first_pass and after in ('PASS', 'WARN'):
+                    continue
+                color = Colors.RED if after == 'FAIL' else Colors.YELLOW if after in ('WARN', 'REMOVED') else Colors.GREEN
+                print(f"[{stamp}] {color}{before} → {after}{Colors.END}  {display(path)}")
+                if result is not None:
+                    for error in result[1]:
+                        print(f"{Colors.RED}{error}{Colors.END}")
+                    for warning in result[2]:
+                        print(f"{Colors.YELLOW}{warning}{Colors.END}")
+            
+            failed = sum(1 for is_valid, _, _ in results.values() if not is_valid)
+            status_color = Colors.RED if failed else Colors.GREEN
+            print(
+                f"[{stamp}] {status_color}{len(results) - failed}/{len(results)} passed{Colors.END}"
+                f" (re-validated {len(changed)} file(s) in {elapsed_ms:.1f} ms)\n"
+            )
+            first_pass = False
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Validate AI Agent YAML definitions against schema'
+    )
+    parser.add_argument(
+        '--verbose', '-v',
+        action='store_true',
+        help='Show detailed validation messages'
+    )
+    parser.add_argument(
+        '--agent', '-a',
+        type=str,
+        help='Validate a specific agent file instead of all agents'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Validate with N worker processes (0 = one per CPU, default: 1)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore and do not update the validation result cache'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='With --agent, stream-validate a merged custom_modes.yaml one mode at a time'
+    )
+    parser.add_argument(
+        '--watch', '-w',
+        action='store_true',
+        help='Keep running and re-validate agents as they change'
+    )
+    parser.add_argument(
+        '--interval',
+        type=float,
+        default=0.05,
+        metavar='SECONDS',
+        help='Polling interval for --watch (default: 0.05)'
+    )
+    parser.add_argument(
+        '--format', '-f',
+        choices=FORMATS,
+        default='text',
+        help='Output format: colored text, or json / ndjson / junit for CI (default: text)'
+    )
+    profiling.add_profiling_arguments(parser)
+    
+    args = parser.parse_args()
+    
+    with profiling.session('validate-agents', args):
+        jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        
+        # Paths
+        project_root = Path(__file__).parent.parent
+        schema_path = project_root / 'schemas' / 'agent-mode-schema.json'
+        agents_dir = project_root / 'agents'
+        cache_path = project_root / '.cache' / 'validate-agents.json'
+        
+        # Machine-readable reporters own stdout; colors only go to terminals
+        reporter = create_reporter(args.format, sys.stdout)
+        text = reporter is None
+        if not text or not sys.stdout.isatty() or os.environ.get('NO_COLOR'):
+            Colors.disable()
+        if args.watch and not text:
+            parser.error('--watch only supports --format text')
+        
+        def display(path: Path) -> str:
+            try:
+                return str(path.relative_to(project_root))
+            except ValueError:
+                return str(path)
+        
+        # Load schema
+        if text:
+            print(f"\n{Colors.BLUE}{'='*70}{Colors.END}")
+            print(f"{Colors.BOLD}AI Agent Orchestration System - Validator{Colors.END}")
+            print(f"{Colors.BLUE}{'='*70}{Colors.END}\n")
+        
+        if args.watch:
+            watch(agents_dir, schema_path, project_root, args.verbose, args.interval)
+            sys.exit(0)
+        
+        if text:
+            print(f"Loading schema from: {schema_path}")
+        with profiling.phase('schema_load'):
+            schema = load_schema(schema_path)
+        if text:
+            print(f"{Colors.GREEN}✓ Schema loaded successfully{Colors.END}\n")
+        
+        if args.stream:
+            if not args.agent:
+                parser.error('--stream requires --agent PATH')
+            validate_stream(Path(args.agent), schema, args.verbose, reporter)
+        
+        # Determine which files to validate
+        if args.agent:
+            agent_files = [Path(args.agent)]
+            if text:
+                print(f"Validating single agent: {args.agent}\n")
+        else:
+            agent_files = sorted(agents_dir.glob('*.yaml'))
+            if text:
+                print(f"Validating {len(agent_files)} agent files from: {agents_dir}\n")
+        
+        # Validate each file
+        results = {
+            'passed': [],
+            'failed': [],
+            'warnings': []
+        }
+        
+        cache = None
+        if not args.no_cache:
+            cache = ValidationCache(
+                cache_path, hash_file(schema_path), args.verbose, library_for(agents_dir).digest(),
+                hash_lint_config(LINT_CONFIG_PATH)
+            )
+        
+        with profiling.phase('registry_refresh'):
+            registry = AgentRegistry(agents_dir, use_snapshot=not args.no_cache)
+            # With a pool, changed files are parsed in the workers, which send them back for the snapshot
+            registry.refresh(agent_files if args.agent else None, parse=jobs <= 1)
+        
+        run_started = time.perf_counter()
+        # NDJSON streams records as files finish, so it does not wait for input order
+        for yaml_file, result, cache_hit, seconds in iter_validation_results(
+            agent_files, schema, args.verbose, jobs, cache, registry, ordered=args.format != 'ndjson'
+        ):
+            is_valid, errors, warnings = result
+            relative_path = display(yaml_file)
+            if not is_valid:
+                results['failed'].append(relative_path)
+            else:
+                results['passed'].append(relative_path)
+                if warnings:
+                    results['warnings'].append((relative_path, warnings))
+            if not text:
+                reporter.file(file_record(relative_path, result, cache_hit, seconds))
+                continue
+            
+            print(f"Validating: {relative_path}")
+            
+            if is_valid:
+                print(f"{Colors.GREEN}  ✓ PASS{Colors.END}")
+                for warning in warnings:
+                    print(f"{Colors.YELLOW}{warning}{Colors.END}")
+            else:
+                print(f"{Colors.RED}  ✗ FAIL{Colors.END}")
+                for error in errors:
+                    print(f"{Colors.RED}{error}{Colors.END}")
+                for warning in warnings:
+                    print(f"{Colors.YELLOW}{warning}{Colors.END}")
+            
+            print()  # Blank line between files
+        
+        with profiling.phase('cache_save'):
+            if cache is not None:
+                cache.save(prune=not args.agent)
+                # Files served from the validation cache never reached a worker
+                registry.parse_pending()
+            registry.save()
+        
+        total = len(agent_files)
+        passed = len(results['passed'])
+        failed = len(results['failed'])
+        warned = len(results['warnings'])
+        
+        if not text:
+            reporter.finish({
+                'total': total,
+                'passed': passed,
+                'failed': failed,
+                'warnings': warned,
+                'cache_hits': cache.hits if cache is not None else None,
+                'cache_misses': cache.misses if cache is not None else None,
+                'jobs': jobs,
+                'seconds': round(time.perf_counter() - run_started, 6),
+                'ok': failed == 0
+            })
+            sys.exit(1 if failed > 0 else 0)
+        
+        # Summary
+        print(f"{Colors.BLUE}{'='*70}{Colors.END}")
+        print(f"{Colors.BOLD}Validation Summary{Colors.END}")
+        print(f"{Colors.BLUE}{'='*70}{Colors.END}\n")
+        
+        print(f"Total agents:    {total}")
+        print(f"{Colors.GREEN}Passed:          {passed}{Colors.END}")
+        if failed > 0:
+            print(f"{Colors.RED}Failed:          {failed}{Colors.END}")
+        else:
+            print(f"Failed:          {failed}")
+        
+        if warned > 0:
+            print(f"{Colors.YELLOW}With warnings:   {warned}{Colors.END}")
+        
+        if cache is not None:
+            lookups = cache.hits + cache.misses
+            hit_rate = (cache.hits / lookups * 100) if lookups else 0.0
+            print(f"Cache:           {cache.hits} hits, {cache.misses} misses ({hit_rate:.1f}% hit rate)")
+        
+        # Exit code
+        if failed > 0:
+            print(f"\n{Colors.RED}✗ Validation FAILED{Colors.END}")
+            sys.exit(1)
+        elif warned > 0:
+            print(f"\n{Colors.YELLOW}⚠ Validation PASSED with warnings{Colors.END}")
+            sys.exit(0)
+        else:
+            print(f"\n{Colors.GREEN}✓ All validations PASSED{Colors.END}")
+            sys.exit(0)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
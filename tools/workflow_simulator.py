@@ -0,0 +1,690 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Workflow Latency Simulator
+
+Discrete-event simulation of SPARC phase workflows over the delegation graph
+built by analyze_agents(), to quantify what the uber-orchestrator's strictly
+sequential delegation costs in end-to-end latency.
+
+Every phase runs as: the root orchestrator dispatches the phase orchestrator,
+which plans, delegates to the agents it references in the graph, synthesizes
+the results and has the state scribe record them. Delegated agents are workers
+or, for validator and quality agents, validators; a validator may reject the
+work, in which case the workers redo it (up to maxAttempts). Task latencies and
+reject rates come from schemas/workflow-latency.json. Each agent is a single
+server, so concurrent requests for the same agent queue.
+
+Policies:
+
+    sequential    one delegated agent at a time, validators after workers
+                  (what agents/uber-orchestrator.yaml mandates)
+    parallel      up to --max-parallel delegated agents at once, validators
+                  after all workers
+    speculative   bounded parallel, and the next phase starts as soon as the
+                  phase is recorded while its validators still run; a
+                  rejection cancels the later phases and reworks the phase
+
+Random draws are keyed by run, phase, agent, step and attempt, so every policy
+sees the same latencies and rejections (common random numbers) and the
+differences between policies are due to the policy alone.
+
+Usage:
+    python tools/workflow_simulator.py
+    python tools/workflow_simulator.py --policies sequential,parallel --max-parallel 3 --runs 500
+    python tools/workflow_simulator.py --phases specification,pseudocode --json > simulation.json
+"""
+
+import sys
+import json
+import math
+import heapq
+import random
+import argparse
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Set
+
+import yaml
+
+from agent_graph import AgentGraph, analyze_agents
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_CONFIG_PATH = PROJECT_ROOT / 'schemas' / 'workflow-latency.json'
+
+POLICIES = ['sequential', 'parallel', 'speculative']
+STEPS = ['dispatch', 'plan', 'synthesize', 'record']
+DISTRIBUTION_FIELDS = {
+    'fixed': ['value'],
+    'uniform': ['min', 'max'],
+    'triangular': ['min', 'mode', 'max'],
+    'exponential': ['mean'],
+    'lognormal': ['median', 'sigma']
+}
+
+def _check_distribution(spec: Dict, where: str) -> None:
+    kind = spec.get('distribution')
+    if kind not in DISTRIBUTION_FIELDS:
+        raise ValueError(f"{where}: unknown distribution {kind!r} (expected one of {', '.join(DISTRIBUTION_FIELDS)})")
+    missing = [field for field in DISTRIBUTION_FIELDS[kind] if field not in spec]
+    if missing:
+        raise ValueError(f"{where}: {kind} distribution needs {', '.join(missing)}")
+
+def load_config(config_path: Path = DEFAULT_CONFIG_PATH) -> Dict:
+    """
+    Load and sanity-check a latency model (JSON, or YAML by extension).
+
+    Raises ValueError for unknown distributions, missing parameters, reject
+    rates outside [0, 1] or phases without an orchestrator.
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        if Path(config_path).suffix in ('.yaml', '.yml'):
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
+
+    for step in STEPS:
+        if step not in config['steps']:
+            raise ValueError(f"steps.{step} is missing")
+        _check_distribution(config['steps'][step], f"steps.{step}")
+    for section in ('categories', 'agents'):
+        for name, entry in config.get(section, {}).items():
+            if 'latency' in entry:
+                _check_distribution(entry['latency'], f"{section}.{name}.latency")
+            rate = entry.get('rejectRate', 0.0)
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(f"{section}.{name}.rejectRate must be between 0 and 1")
+    if 'other' not in config['categories'] or 'latency' not in config['categories']['other']:
+        raise ValueError("categories.other.latency is required as the fallback")
+    for phase in config['phases']:
+        if not phase.get('name') or not phase.get('orchestrator'):
+            raise ValueError(f"Phase {phase!r} needs a name and an orchestrator")
+    if config.get('maxAttempts', 1) < 1:
+        raise ValueError("maxAttempts must be at least 1")
+    return config
+
+def sample_latency(spec: Dict, rng: random.Random) -> float:
+    """Draw one task duration in seconds from a distribution spec."""
+    kind = spec['distribution']
+    if kind == 'fixed':
+        value = spec['value']
+    elif kind == 'uniform':
+        value = rng.uniform(spec['min'], spec['max'])
+    elif kind == 'triangular':
+        value = rng.triangular(spec['min'], spec['max'], spec['mode'])
+    elif kind == 'exponential':
+        value = rng.expovariate(1.0 / spec['mean'])
+    else:
+        value = rng.lognormvariate(math.log(spec['median']), spec['sigma'])
+    return max(0.0, float(value))
+
+def _category_of(graph: AgentGraph) -> Dict[str, str]:
+    return {slug: category for category, slugs in graph.categories.items() for slug in slugs}
+
+class PhasePlan:
+    """The agents one phase orchestrator delegates to, split by role."""
+
+    def __init__(self, name: str, orchestrator: str, workers: List[str], validators: List[str]):
+        self.name = name
+        self.orchestrator = orchestrator
+        self.workers = workers
+        self.validators = validators
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'orchestrator': self.orchestrator,
+            'workers': self.workers,
+            'validators': self.validators
+        }
+
+class WorkflowModel:
+    """Phases derived from the graph plus the latency model for every agent."""
+
+    def __init__(self, graph: AgentGraph, config: Dict, phase_names: Optional[List[str]] = None):
+        self.config = config
+        self.root = config['root']
+        self.scribe = config['scribe']
+        self.max_attempts = config.get('maxAttempts', 1)
+        self.category_of = _category_of(graph)
+
+        phases = config['phases']
+        if phase_names:
+            by_name = {phase['name']: phase for phase in phases}
+            unknown = [name for name in phase_names if name not in by_name]
+            if unknown:
+                raise ValueError(f"Unknown phase(s): {', '.join(unknown)}")
+            phases = [by_name[name] for name in phase_names]
+
+        self.phases: List[PhasePlan] = []
+        for phase in phases:
+            orchestrator = phase['orchestrator']
+            if orchestrator not in graph.node_ids:
+                raise ValueError(f"Phase '{phase['name']}': unknown orchestrator '{orchestrator}'")
+            if 'agents' in phase:
+                delegates = list(phase['agents'])
+            else:
+                # Sub-orchestrators, the root and the scribe are not delegated work
+                delegates = sorted(
+                    graph.slugs[target] for target in graph.successors[graph.node_ids[orchestrator]]
+                    if self.category_of.get(graph.slugs[target]) != 'orchestrator'
+                    and graph.slugs[target] not in (self.root, self.scribe)
+                )
+            workers = [slug for slug in delegates if self.category_of.get(slug) not in ('validator', 'quality')]
+            validators = [slug for slug in delegates if self.category_of.get(slug) in ('validator', 'quality')]
+            self.phases.append(PhasePlan(phase['name'], orchestrator, workers, validators))
+
+    def _entry(self, slug: str, field: str):
+        agent = self.config.get('agents', {}).get(slug, {})
+        if field in agent:
+            return agent[field]
+        categories = self.config['categories']
+        category = categories.get(self.category_of.get(slug, 'other'), categories['other'])
+        return category.get(field, categories['other'].get(field))
+
+    def latency_spec(self, slug: str, step: str) -> Dict:
+        """Orchestration steps use the step table; delegated work the agent's own latency."""
+        if step in self.config['steps']:
+            return self.config['steps'][step]
+        return self._entry(slug, 'latency')
+
+    def reject_rate(self, slug: str) -> float:
+        return self._entry(slug, 'rejectRate') or 0.0
+
+class Task:
+    """One unit of agent work in a simulation run."""
+
+    __slots__ = ('task_id', 'slug', 'phase', 'step', 'attempt', 'duration', 'pool',
+                 'on_done', 'ready', 'start', 'end', 'cause', 'state')
+
+    def __init__(self, task_id: int, slug: str, phase: int, step: str, attempt: int, duration: float,
+                 pool: Optional['FanOutPool'], on_done: Callable[['Task'], None]):
+        self.task_id = task_id
+        self.slug = slug
+        self.phase = phase
+        self.step = step
+        self.attempt = attempt
+        self.duration = duration
+        self.pool = pool
+        self.on_done = on_done
+        self.ready = 0.0
+        self.start: Optional[float] = None
+        self.end: Optional[float] = None
+        self.cause: Optional['Task'] = None  # task whose completion let this one start
+        self.state = 'new'  # new -> waiting -> running -> done | cancelled
+
+class FanOutPool:
+    """Limit on how many delegated agents one phase orchestrator has in flight."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.waiting: Deque[Task] = deque()
+
+class PhaseRun:
+    """Mutable progress of one phase within a run."""
+
+    def __init__(self):
+        self.generation = 0  # bumped on rework or cancellation to invalidate old callbacks
+        self.attempt = 1
+        self.restarts = 0
+        self.pending = 0
+        self.rejected = False
+        self.recorded = False
+        self.validated = False
+        self.started = False
+        self.live: Set[Task] = set()
+        self.pool: Optional[FanOutPool] = None
+
+class Simulation:
+    """A single run of one policy; call run() to get the makespan."""
+
+    def __init__(self, model: WorkflowModel, policy: str, max_parallel: int = 3, seed: int = 42, run: int = 0):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}' (expected one of {', '.join(POLICIES)})")
+        self.model = model
+        self.policy = policy
+        self.fan_out = 1 if policy == 'sequential' else max(1, max_parallel)
+        self.seed = seed
+        self.run_index = run
+        self.now = 0.0
+        self.events: List = []  # heap of (time, task_id, task)
+        self.tasks: List[Task] = []
+        self.running: Dict[str, Task] = {}
+        self.queues: Dict[str, Deque[Task]] = {}
+        self.phase_runs = [PhaseRun() for _ in model.phases]
+        self.makespan: Optional[float] = None
+        self.last_task: Optional[Task] = None
+        self.reworks = 0
+        self.cancelled = 0
+
+    # -- Random draws (common random numbers across policies) -------------------
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random(':'.join(str(part) for part in (self.seed, self.run_index) + key))
+
+    def _duration(self, phase: int, slug: str, step: str, attempt: int) -> float:
+        restarts = self.phase_runs[phase].restarts
+        rng = self._rng(self.model.phases[phase].name, slug, step, attempt, restarts)
+        return sample_latency(self.model.latency_spec(slug, step), rng)
+
+    def _rejects(self, phase: int, slug: str, attempt: int) -> bool:
+        if attempt >= self.model.max_attempts:
+            return False
+        restarts = self.phase_runs[phase].restarts
+        rng = self._rng(self.model.phases[phase].name, slug, 'reject', attempt, restarts)
+        return rng.random() < self.model.reject_rate(slug)
+
+    # -- Event engine ---------------------------------------------------------------
+
+    def submit(self, phase: int, slug: str, step: str, on_done: Callable[[Task], None],
+               cause: Optional[Task], pooled: bool = False) -> Task:
+        """Create a task that is ready now and start it once its agent (and pool slot) is free."""
+        phase_run = self.phase_runs[phase]
+        task = Task(
+            len(self.tasks), slug, phase, step, phase_run.attempt,
+            self._duration(phase, slug, step, phase_run.attempt),
+            phase_run.pool if pooled else None, on_done
+        )
+        task.ready = self.now
+        task.cause = cause
+        task.state = 'waiting'
+        self.tasks.append(task)
+        phase_run.live.add(task)
+
+        pool = task.pool
+        if pool is not None and pool.active >= pool.limit:
+            pool.waiting.append(task)
+            return task
+        if pool is not None:
+            pool.active += 1
+        self._request_agent(task)
+        return task
+
+    def _request_agent(self, task: Task) -> None:
+        if task.slug in self.running:
+            self.queues.setdefault(task.slug, deque()).append(task)
+        else:
+            self._start(task)
+
+    def _start(self, task: Task) -> None:
+        task.start = self.now
+        task.state = 'running'
+        self.running[task.slug] = task
+        heapq.heappush(self.events, (self.now + task.duration, task.task_id, task))
+
+    def _release(self, task: Task) -> None:
+        """Free the task's agent and pool slot and start whoever waits for them."""
+        if self.running.get(task.slug) is task:
+            del self.running[task.slug]
+            queue = self.queues.get(task.slug)
+            if queue:
+                following = queue.popleft()
+                following.cause = task
+                self._start(following)
+        pool = task.pool
+        if pool is not None and task.start is not None:
+            pool.active -= 1
+            if pool.waiting:
+                following = pool.waiting.popleft()
+                pool.active += 1
+                following.cause = task
+                self._request_agent(following)
+
+    def cancel(self, task: Task) -> None:
+        """Abandon a queued or running task; time already spent counts as wasted."""
+        if task.state == 'running':
+            task.end = self.now
+            task.state = 'cancelled'
+            self._release(task)
+        elif task.state == 'waiting':
+            task.state = 'cancelled'
+            if task.pool is not None and task in task.pool.waiting:
+                task.pool.waiting.remove(task)
+            elif task.slug in self.queues and task in self.queues[task.slug]:
+                self.queues[task.slug].remove(task)
+                if task.pool is not None:
+                    task.pool.active -= 1
+                    if task.pool.waiting:
+                        following = task.pool.waiting.popleft()
+                        task.pool.active += 1
+                        self._request_agent(following)
+        self.phase_runs[task.phase].live.discard(task)
+        self.cancelled += 1
+
+    def run(self) -> float:
+        """Simulate the whole workflow and return its makespan in seconds."""
+        if not self.model.phases:
+            self.makespan = 0.0
+            return 0.0
+        self._start_phase(0, None)
+        while self.events:
+            time, _, task = heapq.heappop(self.events)
+            if task.state != 'running':
+                continue
+            self.now = time
+            task.end = time
+            task.state = 'done'
+            self.phase_runs[task.phase].live.discard(task)
+            self._release(task)
+            task.on_done(task)
+        if self.makespan is None:
+            raise RuntimeError('Simulation stalled before every phase completed')
+        return self.makespan
+
+    # -- Phase workflow ------------------------------------------------------------
+
+    def _guard(self, phase: int, callback: Callable[[Task], None]) -> Callable[[Task], None]:
+        """Drop completions that belong to a cancelled or reworked generation of the phase."""
+        generation = self.phase_runs[phase].generation
+
+        def on_done(task: Task) -> None:
+            if self.phase_runs[phase].generation == generation:
+                callback(task)
+        return on_done
+
+    def _start_phase(self, phase: int, cause: Optional[Task]) -> None:
+        phase_run = self.phase_runs[phase]
+        phase_run.started = True
+        phase_run.pool = FanOutPool(self.fan_out)
+        plan = self.model.phases[phase]
+        self.submit(phase, self.model.root, 'dispatch', self._guard(
+            phase, lambda task: self.submit(phase, plan.orchestrator, 'plan', self._guard(
+                phase, lambda task: self._start_work(phase, task)
+            ), task)
+        ), cause)
+
+    def _fan_out(self, phase: int, slugs: List[str], cause: Optional[Task],
+                 on_all_done: Callable[[Task], None], step: str) -> None:
+        phase_run = self.phase_runs[phase]
+        if not slugs:
+            on_all_done(cause)
+            return
+        phase_run.pending = len(slugs)
+
+        def on_done(task: Task) -> None:
+            if step == 'validate' and self._rejects(phase, task.slug, task.attempt):
+                phase_run.rejected = True
+                if self.policy == 'speculative':
+                    self._rework(phase, task)
+                    return
+            phase_run.pending -= 1
+            if phase_run.pending == 0:
+                on_all_done(task)
+
+        guarded = self._guard(phase, on_done)
+        for slug in slugs:
+            self.submit(phase, slug, step, guarded, cause, pooled=True)
+
+    def _start_work(self, phase: int, cause: Optional[Task]) -> None:
+        self.phase_runs[phase].rejected = False
+        self._fan_out(phase, self.model.phases[phase].workers, cause, self._guard(
+            phase, lambda task: self._work_done(phase, task)
+        ), 'work')
+
+    def _work_done(self, phase: int, cause: Optional[Task]) -> None:
+        plan = self.model.phases[phase]
+        if self.policy == 'speculative':
+            # Validation runs alongside synthesis and the next phase
+            self._fan_out(phase, plan.validators, cause, self._guard(
+                phase, lambda task: self._validated(phase, task)
+            ), 'validate')
+            self._synthesize(phase, cause)
+            return
+        self._fan_out(phase, plan.validators, cause, self._guard(
+            phase, lambda task: self._validators_done(phase, task)
+        ), 'validate')
+
+    def _validators_done(self, phase: int, cause: Optional[Task]) -> None:
+        if self.phase_runs[phase].rejected:
+            self._rework(phase, cause)
+            return
+        self.phase_runs[phase].validated = True
+        self._synthesize(phase, cause)
+
+    def _synthesize(self, phase: int, cause: Optional[Task]) -> None:
+        plan = self.model.phases[phase]
+        self.submit(phase, plan.orchestrator, 'synthesize', self._guard(
+            phase, lambda task: self.submit(phase, self.model.scribe, 'record', self._guard(
+                phase, lambda task: self._recorded(phase, task)
+            ), task)
+        ), cause)
+
+    def _recorded(self, phase: int, task: Task) -> None:
+        self.phase_runs[phase].recorded = True
+        if phase + 1 < len(self.model.phases) and not self.phase_runs[phase + 1].started:
+            self._start_phase(phase + 1, task)
+        self._check_complete(task)
+
+    def _validated(self, phase: int, task: Optional[Task]) -> None:
+        self.phase_runs[phase].validated = True
+        self._check_complete(task)
+
+    def _check_complete(self, task: Optional[Task]) -> None:
+        if all(phase_run.recorded and phase_run.validated for phase_run in self.phase_runs):
+            self.makespan = self.now
+            self.last_task = task
+
+    def _rework(self, phase: int, cause: Task) -> None:
+        """A validator rejected the phase: cancel everything built on it and redo the work."""
+        self.reworks += 1
+        for later in range(phase + 1, len(self.phase_runs)):
+            self._reset_phase(later, restart=True)
+        phase_run = self.phase_runs[phase]
+        for task in list(phase_run.live):
+            self.cancel(task)
+        phase_run.generation += 1
+        phase_run.attempt += 1
+        phase_run.recorded = False
+        phase_run.validated = False
+        phase_run.pool = FanOutPool(self.fan_out)
+        self._start_work(phase, cause)
+
+    def _reset_phase(self, phase: int, restart: bool) -> None:
+        phase_run = self.phase_runs[phase]
+        if not phase_run.started:
+            return
+        for task in list(phase_run.live):
+            self.cancel(task)
+        restarts = phase_run.restarts + (1 if restart else 0)
+        self.phase_runs[phase] = PhaseRun()
+        self.phase_runs[phase].generation = phase_run.generation + 1
+        self.phase_runs[phase].restarts = restarts
+
+    # -- Results ----------------------------------------------------------------
+
+    def critical_path(self) -> List[Task]:
+        """The chain of tasks that determined the makespan, first task first."""
+        path = []
+        task = self.last_task
+        while task is not None:
+            path.append(task)
+            task = task.cause
+        return list(reversed(path))
+
+    def utilization(self) -> Dict[str, Dict]:
+        """Busy time per agent, split into useful and wasted (cancelled) work."""
+        agents: Dict[str, Dict] = {}
+        for task in self.tasks:
+            if task.start is None or task.end is None:
+                continue
+            entry = agents.setdefault(task.slug, {'tasks': 0, 'busy_seconds': 0.0, 'wasted_seconds': 0.0})
+            busy = task.end - task.start
+            entry['busy_seconds'] += busy
+            if task.state == 'cancelled':
+                entry['wasted_seconds'] += busy
+            else:
+                entry['tasks'] += 1
+        for entry in agents.values():
+            entry['utilization'] = entry['busy_seconds'] / self.makespan if self.makespan else 0.0
+        return agents
+
+def _task_dict(task: Task, phases: List[PhasePlan]) -> Dict:
+    return {
+        'agent': task.slug,
+        'phase': phases[task.phase].name,
+        'step': task.step,
+        'attempt': task.attempt,
+        'start': round(task.start, 3),
+        'end': round(task.end, 3),
+        'queued_seconds': round(task.start - task.ready, 3),
+        'state': task.state
+    }
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def simulate_policy(model: WorkflowModel, policy: str, runs: int = 200, max_parallel: int = 3, seed: int = 42) -> Dict:
+    """
+    Run one policy runs times and summarize the makespan distribution, mean
+    per-agent utilization and the critical path of the median run.
+    """
+    simulations = []
+    for run in range(runs):
+        simulation = Simulation(model, policy, max_parallel, seed, run)
+        simulation.run()
+        simulations.append(simulation)
+
+    makespans = sorted(simulation.makespan for simulation in simulations)
+    median_run = sorted(simulations, key=lambda simulation: (simulation.makespan, simulation.run_index))[(runs - 1) // 2]
+
+    totals: Dict[str, Dict] = {}
+    for simulation in simulations:
+        for slug, entry in simulation.utilization().items():
+            total = totals.setdefault(slug, {'tasks': 0, 'busy_seconds': 0.0, 'wasted_seconds': 0.0, 'utilization': 0.0})
+            for field in total:
+                total[field] += entry[field]
+    utilization = {
+        slug: {
+            'tasks': total['tasks'] / runs,
+            'busy_seconds': total['busy_seconds'] / runs,
+            'wasted_seconds': total['wasted_seconds'] / runs,
+            'utilization': total['utilization'] / runs
+        }
+        for slug, total in sorted(totals.items(), key=lambda entry: (-entry[1]['utilization'], entry[0]))
+    }
+
+    path = median_run.critical_path()
+    path_share: Dict[str, float] = {}
+    for task in path:
+        path_share[task.slug] = path_share.get(task.slug, 0.0) + (task.end - task.start)
+    return {
+        'policy': policy,
+        'fan_out': median_run.fan_out,
+        'runs': runs,
+        'makespan': {
+            'mean': sum(makespans) / runs,
+            'p50': _percentile(makespans, 0.5),
+            'p95': _percentile(makespans, 0.95),
+            'min': makespans[0],
+            'max': makespans[-1]
+        },
+        'reworks_mean': sum(simulation.reworks for simulation in simulations) / runs,
+        'wasted_seconds_mean': sum(entry['wasted_seconds'] for entry in utilization.values()),
+        'critical_path': {
+            'run': median_run.run_index,
+            'makespan': median_run.makespan,
+            'tasks': [_task_dict(task, model.phases) for task in path],
+            'by_agent': dict(sorted(path_share.items(), key=lambda entry: (-entry[1], entry[0])))
+        },
+        'utilization': utilization
+    }
+
+def simulate(model: WorkflowModel, policies: List[str], runs: int = 200, max_parallel: int = 3, seed: int = 42) -> Dict:
+    """Simulate every policy on the same random draws."""
+    if runs < 1:
+        raise ValueError('runs must be at least 1')
+    return {
+        'phases': [phase.to_dict() for phase in model.phases],
+        'runs': runs,
+        'max_parallel': max_parallel,
+        'seed': seed,
+        'policies': {policy: simulate_policy(model, policy, runs, max_parallel, seed) for policy in policies}
+    }
+
+def print_report(results: Dict, top: int = 10, out=sys.stdout) -> None:
+    """Human-readable comparison of the simulated policies."""
+    policies = results['policies']
+    print(f"Workflow simulation: {len(results['phases'])} phases, {results['runs']} runs, "
+          f"fan-out limit {results['max_parallel']} (times in seconds)\n", file=out)
+    for phase in results['phases']:
+        print(f"  {phase['name']:<28} {len(phase['workers'])} workers, {len(phase['validators'])} validators", file=out)
+
+    baseline = policies.get('sequential')
+    print(f"\n{'Policy':<13} {'Mean':>9} {'p50':>9} {'p95':>9} {'Reworks':>8} {'Wasted':>9} {'Speedup':>8}", file=out)
+    for name, result in policies.items():
+        makespan = result['makespan']
+        speedup = f"{baseline['makespan']['mean'] / makespan['mean']:7.2f}x" if baseline else f"{'-':>8}"
+        print(f"{name:<13} {makespan['mean']:9.0f} {makespan['p50']:9.0f} {makespan['p95']:9.0f} "
+              f"{result['reworks_mean']:8.2f} {result['wasted_seconds_mean']:9.0f} {speedup}", file=out)
+
+    for name, result in policies.items():
+        path = result['critical_path']
+        print(f"\nCritical path ({name}, median run {path['makespan']:.0f} s):", file=out)
+        for task in path['tasks']:
+            queued = f"  queued {task['queued_seconds']:.0f}" if task['queued_seconds'] else ''
+            attempt = f"  attempt {task['attempt']}" if task['attempt'] > 1 else ''
+            cancelled = '  (cancelled)' if task['state'] == 'cancelled' else ''
+            print(f"  {task['start']:8.0f} {task['end']:8.0f}  {task['phase']:<26} {task['step']:<10} "
+                  f"{task['agent']}{attempt}{queued}{cancelled}", file=out)
+        print(f"\n  {'Agent':<44} {'Util':>6} {'Tasks':>6} {'Busy':>8} {'Wasted':>8}", file=out)
+        for slug, entry in list(result['utilization'].items())[:top]:
+            print(f"  {slug:<44} {entry['utilization'] * 100:5.1f}% {entry['tasks']:6.2f} "
+                  f"{entry['busy_seconds']:8.0f} {entry['wasted_seconds']:8.0f}", file=out)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Simulate SPARC phase workflow latency under different delegation policies'
+    )
+    parser.add_argument(
+        '--config',
+        type=str,
+        help='Latency model (default: schemas/workflow-latency.json)'
+    )
+    parser.add_argument(
+        '--agents-dir',
+        type=str,
+        default='agents',
+        help='Directory containing agent YAML files (default: agents)'
+    )
+    parser.add_argument(
+        '--policies',
+        type=lambda value: value.split(','),
+        default=POLICIES,
+        help=f"Comma-separated subset of: {','.join(POLICIES)} (default: all)"
+    )
+    parser.add_argument(
+        '--phases',
+        type=lambda value: value.split(','),
+        help='Comma-separated phase names to simulate, in order (default: all configured phases)'
+    )
+    parser.add_argument('--max-parallel', type=int, default=3, help='Fan-out limit per phase orchestrator (default: 3)')
+    parser.add_argument('--runs', type=int, default=200, help='Monte Carlo runs per policy (default: 200)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--top', type=int, default=10, help='Agents listed per utilization table (default: 10)')
+    parser.add_argument('--json', action='store_true', help='Print the full results as JSON')
+    args = parser.parse_args()
+
+    unknown = [policy for policy in args.policies if policy not in POLICIES]
+    if unknown:
+        parser.error(f"unknown policy: {', '.join(unknown)}")
+
+    config_path = Path(args.config) if args.config else DEFAULT_CONFIG_PATH
+    agents_dir = Path(args.agents_dir)
+    if not agents_dir.is_absolute():
+        agents_dir = PROJECT_ROOT / agents_dir
+    try:
+        config = load_config(config_path)
+        model = WorkflowModel(analyze_agents(agents_dir, verbose=False), config, args.phases)
+        results = simulate(model, args.policies, args.runs, args.max_parallel, args.seed)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"✗ {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results, args.top)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+AI Agent Orchestration System - Streaming YAML Reader
+
+Walks the YAML event stream of a large document and builds the items of one
+top-level sequence (such as a merged file's customModes) one at a time, so
+memory stays bounded to a single item no matter how large the file is.
+
+Events come from the libyaml C parser when PyYAML was built with it. Scalars
+are resolved and constructed with the SafeLoader rules, so each item is equal
+to what yaml.safe_load() would produce for it.
+
+Usage:
+    from yaml_stream import iter_sequence_items
+
+    for index, line, mode in iter_sequence_items(Path('custom_modes.yaml'), 'customModes'):
+        print(index, line, mode['slug'])
+"""
+
+import yaml
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+try:
+    from yaml import CSafeLoader as EventLoader
+except ImportError:
+    from yaml import SafeLoader as EventLoader
+
+MERGE_TAG = 'tag:yaml.org,2002:merge'
+
+class StreamError(ValueError):
+    """The document does not have the expected top-level shape."""
+
+class _ItemBuilder:
+    """Builds Python objects from YAML events using SafeLoader tag rules."""
+
+    def __init__(self):
+        # Only used for implicit tag resolution and scalar constructors
+        self._loader = yaml.SafeLoader('')
+        self.anchors: Dict[str, Any] = {}
+
+    def scalar(self, event: yaml.ScalarEvent) -> Any:
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = 'tag:yaml.org,2002:str' if tag == '!' else self._loader.resolve(
+                yaml.ScalarNode, event.value, event.implicit
+            )
+        node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style)
+        constructor = self._loader.yaml_constructors.get(tag, self._loader.yaml_constructors[None])
+        # Call the constructor directly: construct_object() would memoize every node
+        return constructor(self._loader, node)
+
+    def build(self, first: yaml.Event, events: Iterator[yaml.Event]) -> Any:
+        """Build the node that starts with event `first`, consuming its events."""
+        if isinstance(first, yaml.AliasEvent):
+            if first.anchor not in self.anchors:
+                raise StreamError(f"Unknown alias *{first.anchor} at line {first.start_mark.line + 1}")
+            return self.anchors[first.anchor]
+
+        if isinstance(first, yaml.ScalarEvent):
+            value = self.scalar(first)
+        elif isinstance(first, yaml.SequenceStartEvent):
+            value = []
+            if first.anchor:
+                self.anchors[first.anchor] = value
+            for event in events:
+                if isinstance(event, yaml.SequenceEndEvent):
+                    break
+                value.append(self.build(event, events))
+            return value
+        elif isinstance(first, yaml.MappingStartEvent):
+            value = {}
+            if first.anchor:
+                self.anchors[first.anchor] = value
+            merged: List[Dict] = []
+            for event in events:
+                if isinstance(event, yaml.MappingEndEvent):
+                    break
+                is_merge = (
+                    isinstance(event, yaml.ScalarEvent)
+                    and event.value == '<<'
+                    and (event.tag == MERGE_TAG or (event.tag is None and event.implicit[0]))
+                )
+                key = None if is_merge else self.build(event, events)
+                item = self.build(next(events), events)
+                if is_merge:
+                    # In a sequence merge the first map listed wins, so it goes last
+                    merged.extend(reversed(item) if isinstance(item, list) else [item])
+                else:
+                    value[key] = item
+            if merged:
+                # As with SafeLoader: merged keys come first, later merges win
+                # over earlier ones and explicit keys win over all of them
+                explicit = dict(value)
+                value.clear()
+                for source in merged:
+                    value.update(source)
+                value.update(explicit)
+            return value
+        else:
+            raise StreamError(f"Unexpected YAML event {type(first).__name__}")
+
+        if first.anchor:
+            self.anchors[first.anchor] = value
+        return value
+
+def iter_sequence_items(path: Path, key: str) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Yield (index, line, item) for each item of the top-level `key` sequence.
+
+    Raises StreamError if the root is not a mapping, `key` is missing or not a
+    sequence, or the file holds more than one document, and ValueError with
+    the parser message for invalid YAML.
+    """
+    builder = _ItemBuilder()
+    documents = 0
+    key_found = False
+    with open(path, 'rb') as f:
+        events = iter(yaml.parse(f, Loader=EventLoader))
+        try:
+            for event in events:
+                if isinstance(event, yaml.DocumentStartEvent):
+                    documents += 1
+                    if documents > 1:
+                        raise StreamError("expected a single document in the stream")
+                    continue
+                if isinstance(event, (yaml.StreamStartEvent, yaml.DocumentEndEvent, yaml.StreamEndEvent)):
+                    continue
+                if not isinstance(event, yaml.MappingStartEvent):
+                    raise StreamError("document root is not a mapping")
+
+                for key_event in events:
+                    if isinstance(key_event, yaml.MappingEndEvent):
+                        break
+                    name = builder.build(key_event, events)
+                    value_event = next(events)
+                    if name != key:
+                        # Built and dropped so anchors defined here stay resolvable
+                        builder.build(value_event, events)
+                        continue
+                    if not isinstance(value_event, yaml.SequenceStartEvent):
+                        raise StreamError(f"'{key}' is not a sequence")
+                    key_found = True
+                    index = 0
+                    for item_event in events:
+                        if isinstance(item_event, yaml.SequenceEndEvent):
+                            break
+                        line = item_event.start_mark.line + 1
+                        yield index, line, builder.build(item_event, events)
+                        index += 1
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid YAML: {e}")
+
+    if documents == 0:
+        raise StreamError("document root is not a mapping")
+    if not key_found:
+        raise StreamError(f"'{key}' is a required property")